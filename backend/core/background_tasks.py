@@ -12,9 +12,15 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-from backend.core.constants import OUTPUT_DIR
-from backend.core.helpers import calculate_dataframe_health, health_score_with_row_deletion_penalty
+from backend.core.constants import CHECKPOINT_DIR, OUTPUT_DIR
+from backend.core.helpers import (
+    calculate_dataframe_health,
+    dataset_read_options,
+    health_score_with_row_deletion_penalty,
+)
 from backend.database import CleaningLog, Dataset, QualityReport, SessionLocal
+from backend.modules.checkpoint_cache import CHECKPOINT_MAX_MB, PipelineCheckpoints, dataset_namespace, source_key
+from backend.modules.column_stats import ColumnStats
 from backend.modules.file_reader import read_file, get_basic_profile
 from backend.modules.pipeline import run_pipeline
 from backend.modules.recommendation import generate_recommendations
@@ -29,7 +35,8 @@ def _run_analysis_async(dataset_id: int, user_id: int) -> None:
         if not dataset:
             return
         file_path = dataset.file_path
-        df, _ = read_file(file_path)
+        # Analiz salt okunur olduğu için tipler bellek dostu hale getirilir
+        df, _ = read_file(file_path, optimize=True, **dataset_read_options(dataset))
         profile = get_basic_profile(df)
         recommendations = generate_recommendations(df)
 
@@ -69,6 +76,7 @@ def _apply_selections_to_dataset_async(
             if not dataset:
                 return
             file_path = dataset.file_path
+            read_options = dataset_read_options(dataset)
             filename = dataset.filename
             original_filename = dataset.original_filename or dataset.filename
         except Exception:
@@ -80,8 +88,13 @@ def _apply_selections_to_dataset_async(
         report_html_path = None
         report_pdf_path = None
         try:
-            df, _ = read_file(file_path)
-            result = run_pipeline(df, selections)
+            df, _ = read_file(file_path, **read_options)
+            checkpoints = None
+            if CHECKPOINT_MAX_MB > 0:
+                checkpoints = PipelineCheckpoints(
+                    CHECKPOINT_DIR, source_key(file_path, read_options), namespace=dataset_namespace(dataset_id)
+                )
+            result = run_pipeline(df, selections, checkpoints=checkpoints)
 
             if result["error_count"] > 0:
                 err_details = [
@@ -105,11 +118,12 @@ def _apply_selections_to_dataset_async(
             outlier_ops = result.get("outlier_count", 0)
             format_ops = result.get("format_errors", 0)
 
-            before_health_res = calculate_dataframe_health(df)
+            before_stats = ColumnStats(df)
+            before_health_res = calculate_dataframe_health(df, stats=before_stats)
             before_health = before_health_res[0]
 
             after_health_res = calculate_dataframe_health(
-                result["cleaned_df"], outlier_reference_df=df
+                result["cleaned_df"], outlier_reference_df=df, reference_stats=before_stats
             )
             after_base_health = after_health_res[0]
             after_health, row_delete_pct, row_delete_penalty = health_score_with_row_deletion_penalty(
@@ -246,13 +260,14 @@ def _apply_template_async(dataset_id: int, user_id: int, raw_selections: list) -
         if not dataset:
             return
         file_path = dataset.file_path
+        read_options = dataset_read_options(dataset)
     except Exception:
         return
     finally:
         db.close()
 
     try:
-        df, _ = read_file(file_path)
+        df, _ = read_file(file_path, **read_options)
         cols = set(df.columns)
         matched = [
             s for s in raw_selections
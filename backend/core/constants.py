@@ -5,6 +5,16 @@ import os
 
 UPLOAD_DIR = os.environ.get("UPLOAD_DIR", "uploads")
 OUTPUT_DIR = os.environ.get("OUTPUT_DIR", "outputs")
+CHECKPOINT_DIR = os.path.join(OUTPUT_DIR, "checkpoints")
+
+# Yükleme sınırları (MB). MAX_UPLOAD_MB dağıtım başına ayarlanabilir üst sınırdır;
+# IN_MEMORY_READ_MB üzerindeki dosyalar upload sırasında parça parça taranır
+# (MAX_UPLOAD_MB'den küçük olmalıdır). Analiz, temizleme ve çalışma alanı
+# görevleri tabloyu belleğe aldığından, bellekteki boyutu MAX_IN_MEMORY_MB'yi
+# aşan dosyalar upload sırasında reddedilir.
+MAX_UPLOAD_MB = int(os.environ.get("MAX_UPLOAD_MB", "20"))
+IN_MEMORY_READ_MB = int(os.environ.get("IN_MEMORY_READ_MB", "10"))
+MAX_IN_MEMORY_MB = int(os.environ.get("MAX_IN_MEMORY_MB", "1024"))
 
 # Health Score ağırlıkları (main.py'den taşındı)
 HEALTH_MISSING_WEIGHT = 1.00
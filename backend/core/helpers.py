@@ -7,17 +7,18 @@ Paylaşılan yardımcı fonksiyonlar.
 """
 from __future__ import annotations
 
-import difflib
 import io
+import json
 import math
 import os
-import warnings
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
 from backend.database import Dataset, CleaningTemplate, Project, User
+from backend.modules.column_stats import ColumnStats
+from backend.modules.profiler import column_stats
 from backend.core.constants import (
     OUTPUT_DIR,
     HEALTH_MISSING_WEIGHT,
@@ -55,6 +56,17 @@ def cleaned_disk_path(dataset: Dataset) -> str:
     return os.path.join(OUTPUT_DIR, f"cleaned_{dataset.filename}")
 
 
+def dataset_read_options(dataset: Dataset) -> dict:
+    """Upload sırasında kaydedilen okuma ayarlarını read_file argümanlarına çevirir."""
+    if not dataset.read_options:
+        return {}
+    try:
+        options = json.loads(dataset.read_options)
+    except (TypeError, ValueError):
+        return {}
+    return options if isinstance(options, dict) else {}
+
+
 def download_filename(dataset: Dataset) -> str:
     base = dataset.original_filename or dataset.filename
     stem = Path(base).stem
@@ -91,113 +103,79 @@ def dataframe_preview(df: pd.DataFrame, limit: int = 12) -> list[dict]:
 
 # ── Health Score ──────────────────────────────────────────────────────────────
 
-_DATE_PATTERNS = [
-    r"\d{4}-\d{2}-\d{2}",
-    r"\d{2}/\d{2}/\d{4}",
-    r"\d{2}\.\d{2}\.\d{4}",
-    r"\d{4}/\d{2}/\d{2}",
-]
-
-
-def _count_iqr_outliers(df: pd.DataFrame, reference_df: pd.DataFrame | None = None) -> int:
-    reference = reference_df if reference_df is not None else df
-    numeric_cols = df.select_dtypes(include="number").columns
+def _count_iqr_outliers(
+    stats: ColumnStats,
+    reference_stats: ColumnStats | None = None,
+) -> int:
+    reference = reference_stats if reference_stats is not None else stats
     total = 0
-    for column in numeric_cols:
-        if column not in reference.columns:
+    for column in stats.numeric_columns():
+        if column not in reference.df.columns:
             continue
-        reference_values = pd.to_numeric(reference[column], errors="coerce").dropna()
-        current_values = pd.to_numeric(df[column], errors="coerce").dropna()
+        reference_values = reference.numeric_values(column)
+        current_values = stats.numeric_values(column)
         if reference_values.empty or current_values.empty:
             continue
-        q1 = reference_values.quantile(0.25)
-        q3 = reference_values.quantile(0.75)
-        iqr = q3 - q1
-        lower = q1 - 1.5 * iqr
-        upper = q3 + 1.5 * iqr
+        lower, upper = reference.iqr_bounds(column)
         total += int(((current_values < lower) | (current_values > upper)).sum())
     return total
 
 
+def _count_format_issues(stats: ColumnStats) -> int:
+    """analyze_format ile aynı kontrollerden en az birine takılan hücre sayısı."""
+    format_count = 0
+    for col in stats.df.columns:
+        if len(stats.non_null(col)) == 0 or not stats.is_text(col):
+            continue
+        col_data = stats.text_values(col)
+        has_issue = pd.Series(False, index=col_data.index)
+
+        profile = stats.type_profile(col)
+        if profile["is_numeric_like"]:
+            has_issue |= profile["numeric_mask"]
+        if profile["is_date_like"]:
+            has_issue |= profile["date_mask"]
+
+        has_issue |= stats.whitespace_mask(col)
+
+        if stats.nunique(col) < 20 and stats.has_case_variants(col):
+            has_issue |= stats.case_mask(col)
+
+        if not stats.sample_is_numeric_or_date(col) and stats.similar_pairs(col):
+            has_issue |= col_data.isin(stats.fuzzy_replace_keys(col))
+
+        format_count += int(has_issue.sum())
+    return format_count
+
+
 def calculate_dataframe_health(
     df: pd.DataFrame,
     outlier_reference_df: pd.DataFrame | None = None,
+    stats: ColumnStats | None = None,
+    reference_stats: ColumnStats | None = None,
 ) -> tuple[float, int, int, int]:
+    """
+    Health score ve (eksik, aykırı, format) sayıları.
+    stats / reference_stats verilirse aynı DataFrame için daha önce hesaplanan
+    istatistikler yeniden kullanılır.
+    """
     if df.empty:
         return 0.0, 0, 0, 0
+    if stats is None:
+        stats = ColumnStats(df)
+    if reference_stats is None and outlier_reference_df is not None:
+        reference_stats = ColumnStats(outlier_reference_df)
 
     total_cells = int(df.size)
-    missing_count = int(df.isnull().sum().sum())
+    missing_count = int(stats.missing_counts().sum())
 
     try:
-        outlier_count = _count_iqr_outliers(df, outlier_reference_df)
+        outlier_count = _count_iqr_outliers(stats, reference_stats)
     except Exception:
         outlier_count = 0
 
     try:
-        format_count = 0
-        for col in df.columns:
-            col_data = df[col].dropna()
-            if len(col_data) == 0:
-                continue
-            if df[col].dtype == object:
-                has_issue = pd.Series(False, index=df.index)
-
-                is_num_conv = pd.to_numeric(col_data, errors="coerce").notna()
-                if is_num_conv.sum() / len(col_data) > 0.8:
-                    has_issue |= is_num_conv
-
-                is_date_match = pd.Series(False, index=col_data.index)
-                for pat in _DATE_PATTERNS:
-                    is_date_match |= col_data.astype(str).str.match(pat)
-                if is_date_match.sum() / len(col_data) > 0.5:
-                    has_issue |= is_date_match
-
-                is_whitespace = col_data.astype(str).str.strip() != col_data.astype(str)
-                has_issue |= is_whitespace
-
-                if col_data.nunique() < 20:
-                    lower_vals = col_data.astype(str).str.lower().unique()
-                    actual_vals = col_data.astype(str).unique()
-                    if len(lower_vals) < len(actual_vals):
-                        is_case_inc = col_data.apply(
-                            lambda x: x.lower() != x if isinstance(x, str) else False
-                        )
-                        has_issue |= is_case_inc
-
-                sample_data = col_data.head(100)
-                is_numeric_or_date = False
-                if len(sample_data) > 0:
-                    num_r = pd.to_numeric(sample_data, errors="coerce").notna().sum() / len(sample_data)
-                    d_cnt = sum(
-                        sample_data.astype(str).str.match(p).sum() for p in _DATE_PATTERNS
-                    )
-                    d_r = d_cnt / len(sample_data)
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore")
-                        dt_r = pd.to_datetime(sample_data, errors="coerce", dayfirst=True).notna().sum() / len(sample_data)
-                    if num_r > 0.8 or d_r > 0.5 or dt_r > 0.5:
-                        is_numeric_or_date = True
-
-                if not is_numeric_or_date:
-                    actual_vals = col_data.dropna().unique()
-                    if 2 < len(actual_vals) < 100:
-                        similar_pairs = []
-                        for i in range(len(actual_vals)):
-                            for j in range(i + 1, len(actual_vals)):
-                                val1, val2 = str(actual_vals[i]), str(actual_vals[j])
-                                ratio = difflib.SequenceMatcher(None, val1.lower(), val2.lower()).ratio()
-                                if 0.85 <= ratio < 1.0:
-                                    similar_pairs.append((val1, val2))
-                        if similar_pairs:
-                            vc = col_data.value_counts()
-                            replace_keys = {
-                                (v2 if vc.get(v1, 0) >= vc.get(v2, 0) else v1)
-                                for v1, v2 in similar_pairs
-                            }
-                            has_issue |= col_data.isin(replace_keys)
-
-                format_count += int(has_issue.sum())
+        format_count = _count_format_issues(stats)
     except Exception:
         format_count = 0
 
@@ -227,35 +205,37 @@ def health_score_with_row_deletion_penalty(
 # ── DataFrame profilleme ──────────────────────────────────────────────────────
 
 def profile_dataframe(df: pd.DataFrame) -> dict:
+    stats = column_stats(df)
     columns = []
-    for column in df.columns:
+    for column, col_stats in stats.items():
         series = df[column]
-        missing_count = int(series.isna().sum())
+        missing_count = col_stats["missing_count"]
         info = {
             "name": str(column),
-            "dtype": str(series.dtype),
-            "kind": "numeric" if pd.api.types.is_numeric_dtype(series) else "categorical",
+            "dtype": col_stats["dtype"],
+            "kind": "numeric" if col_stats["is_numeric"] else "categorical",
             "missing_count": missing_count,
             "missing_pct": round((missing_count / len(df)) * 100, 2) if len(df) else 0.0,
-            "unique_count": int(series.nunique(dropna=True)),
+            "unique_count": col_stats["unique_count"],
         }
         if info["kind"] == "numeric":
-            numeric = pd.to_numeric(series, errors="coerce").dropna()
-            if not numeric.empty:
+            values = col_stats["values"]
+            if col_stats["count"]:
                 info["stats"] = {
-                    "mean": json_scalar(round(float(numeric.mean()), 4)),
-                    "median": json_scalar(round(float(numeric.median()), 4)),
-                    "std": json_scalar(round(float(numeric.std()), 4)) if len(numeric) > 1 else 0.0,
-                    "min": json_scalar(float(numeric.min())),
-                    "max": json_scalar(float(numeric.max())),
-                    "q1": json_scalar(float(numeric.quantile(0.25))),
-                    "q3": json_scalar(float(numeric.quantile(0.75))),
+                    "mean": json_scalar(round(col_stats["mean"], 4)),
+                    "median": json_scalar(round(col_stats["median"], 4)),
+                    "std": json_scalar(round(col_stats["std"], 4)) if col_stats["count"] > 1 else 0.0,
+                    "min": json_scalar(col_stats["min"]),
+                    "max": json_scalar(col_stats["max"]),
+                    "q1": json_scalar(col_stats["q1"]),
+                    "q3": json_scalar(col_stats["q3"]),
                 }
-                if numeric.nunique() == 1:
-                    histogram = [{"label": str(json_scalar(numeric.iloc[0])), "count": int(len(numeric))}]
+                if values[0] == values[-1]:
+                    first_value = series.dropna().iloc[0]
+                    histogram = [{"label": str(json_scalar(first_value)), "count": int(len(values))}]
                 else:
-                    bin_count = min(10, max(4, int(math.sqrt(len(numeric)))))
-                    counts, edges = np.histogram(numeric.to_numpy(), bins=bin_count)
+                    bin_count = min(10, max(4, int(math.sqrt(len(values)))))
+                    counts, edges = np.histogram(values, bins=bin_count)
                     histogram = [
                         {"label": f"{edges[i]:.3g} - {edges[i + 1]:.3g}", "count": int(c)}
                         for i, c in enumerate(counts)
@@ -301,8 +281,9 @@ def read_cleaned_csv(path: str) -> pd.DataFrame:
 
 
 def build_comparison(before: pd.DataFrame, after: pd.DataFrame) -> dict:
-    before_health = calculate_dataframe_health(before)
-    after_health = calculate_dataframe_health(after, outlier_reference_df=before)
+    before_stats = ColumnStats(before)
+    before_health = calculate_dataframe_health(before, stats=before_stats)
+    after_health = calculate_dataframe_health(after, outlier_reference_df=before, reference_stats=before_stats)
     after_score, row_delete_pct, row_delete_penalty = health_score_with_row_deletion_penalty(
         after_health[0], len(before), len(after)
     )
@@ -39,6 +39,7 @@ class Dataset(Base):
     file_path         = Column(String)
     status            = Column(String, default="ready", nullable=False)
     upload_time       = Column(DateTime, default=datetime.utcnow)
+    read_options      = Column(Text, nullable=True)  # JSON: tespit edilen okuma ayarları (ör. TXT diyalekti)
 
 class CleaningLog(Base):
     __tablename__ = "cleaning_logs"
@@ -119,8 +120,9 @@ def run_light_migrations():
             to_add_orig_fn = "original_filename" not in cols
             to_add_proj_id = "project_id" not in cols
             to_add_status = "status" not in cols
+            to_add_read_opts = "read_options" not in cols
 
-            if to_add_user_id or to_add_orig_fn or to_add_proj_id or to_add_status:
+            if to_add_user_id or to_add_orig_fn or to_add_proj_id or to_add_status or to_add_read_opts:
                 with engine.begin() as conn:
                     if to_add_user_id:
                         if is_sqlite:
@@ -134,6 +136,8 @@ def run_light_migrations():
                         conn.execute(text("ALTER TABLE datasets ADD COLUMN project_id INTEGER"))
                     if to_add_status:
                         conn.execute(text("ALTER TABLE datasets ADD COLUMN status VARCHAR DEFAULT 'ready'"))
+                    if to_add_read_opts:
+                        conn.execute(text("ALTER TABLE datasets ADD COLUMN read_options TEXT"))
     except Exception as e:
         logger.warning("[Migration] datasets sütun güncellemesi başarısız: %s", e)
 
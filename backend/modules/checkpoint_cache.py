@@ -0,0 +1,184 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+logger = logging.getLogger(__name__)
+
+# Pipeline ara sonuçları için önbellek bütçesi (0 = kapalı) ve iki kayıt
+# arasında geçmesi gereken en az hesaplama süresi (saniye)
+CHECKPOINT_MAX_MB = int(os.environ.get("CHECKPOINT_MAX_MB", "2048"))
+CHECKPOINT_MIN_SECONDS = float(os.environ.get("CHECKPOINT_MIN_SECONDS", "1.0"))
+# Temizleme modüllerinin davranışı değişirse artırılır; eski kayıtlar kullanılmaz
+CHECKPOINT_VERSION = 1
+CHECKPOINT_SUFFIX = ".ckpt.arrow"
+_META_KEY = b"prepwise_checkpoint"
+
+_content_hashes = {}
+_content_hashes_lock = threading.Lock()
+
+
+def file_content_hash(file_path: str) -> str:
+    """Dosya içeriğinin SHA-256 özeti; (yol, boyut, mtime) başına bir kez hesaplanır."""
+    st = os.stat(file_path)
+    signature = (os.path.abspath(file_path), st.st_size, st.st_mtime_ns)
+    with _content_hashes_lock:
+        if signature in _content_hashes:
+            return _content_hashes[signature]
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    with _content_hashes_lock:
+        _content_hashes[signature] = digest.hexdigest()
+    return digest.hexdigest()
+
+
+def source_key(file_path: str, read_options: dict | None = None) -> str:
+    """Pipeline girdisini tanımlayan anahtar: dosya içeriği + okuma ayarları."""
+    options = json.dumps(read_options or {}, sort_keys=True, default=str)
+    return f"{file_content_hash(file_path)}:{options}"
+
+
+def dataset_namespace(dataset_id: int) -> str:
+    """Bir veri setinin checkpoint dosya adı öneki."""
+    return f"dataset{dataset_id}"
+
+
+def remove_checkpoints(directory: str, namespace: str) -> int:
+    """namespace'e ait tüm kayıtları siler; silinen dosya sayısını döner."""
+    removed = 0
+    pattern = os.path.join(glob.escape(directory), f"{glob.escape(namespace)}-*{CHECKPOINT_SUFFIX}")
+    for path in glob.glob(pattern):
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+class PipelineCheckpoints:
+    """
+    (kaynak anahtarı, seçim öneki) ile anahtarlanmış pipeline ara sonuçları.
+
+    Her kayıt, seçimlerin ilk k adımı sırayla uygulandıktan sonraki
+    DataFrame'i, o adımların loglarını ve sayaçlarını tek bir LZ4 sıkıştırmalı
+    Arrow IPC dosyasında tutar. Dizin toplam boyutu max_bytes'ı aşınca en uzun
+    süredir kullanılmayan kayıtlar silinir (kullanım zamanı mtime'dır).
+    Arrow'a kayıpsız çevrilemeyen tablolar (karışık tipli object sütunları,
+    metin olmayan sütun adları) kaydedilmez.
+    namespace verilirse dosya adları onunla başlar; remove_checkpoints ile
+    (ör. veri seti silinince) yalnızca o sahibin kayıtları silinebilir.
+    Bütçe, dizindeki tüm kayıtlar için ortaktır.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        source: str,
+        max_bytes: int = CHECKPOINT_MAX_MB * 1024 * 1024,
+        min_seconds: float = CHECKPOINT_MIN_SECONDS,
+        namespace: str = "",
+    ):
+        self.directory = directory
+        self.source = source
+        self.max_bytes = max_bytes
+        self.min_seconds = min_seconds
+        self.namespace = namespace
+
+    def _paths(self, selections: list[dict]) -> list[str]:
+        """Her önek uzunluğu k (1..n) için kayıt yolu; zincirleme özetle O(n)."""
+        chain = hashlib.sha256(f"{CHECKPOINT_VERSION}:{self.source}".encode("utf-8"))
+        paths = []
+        for selection in selections:
+            chain = chain.copy()
+            chain.update(json.dumps(selection, sort_keys=True, default=str).encode("utf-8"))
+            name = chain.hexdigest()[:40]
+            if self.namespace:
+                name = f"{self.namespace}-{name}"
+            paths.append(os.path.join(self.directory, name + CHECKPOINT_SUFFIX))
+        return paths
+
+    def load_latest(self, selections: list[dict], excluded=()):
+        """
+        En uzun kayıtlı öneki yükler: (k, DataFrame, loglar, sayaçlar);
+        hiçbiri yoksa None. excluded içindeki önek uzunluklarında kayıt
+        kullanılmaz (ör. birlikte yürütülmesi gereken adımları bölen sınırlar).
+        """
+        paths = self._paths(selections)
+        for prefix in range(len(paths), 0, -1):
+            path = paths[prefix - 1]
+            if prefix in excluded or not os.path.exists(path):
+                continue
+            try:
+                table = feather.read_table(path, memory_map=True)
+                meta = json.loads(table.schema.metadata[_META_KEY])
+                df = table.to_pandas()
+                os.utime(path, None)
+            except Exception as e:
+                logger.warning("Checkpoint okunamadı (%s): %s", os.path.basename(path), e)
+                continue
+            # Arrow metin sütunlarındaki null'lar None olarak gelir; NaN'a çevrilir
+            for col in df.columns:
+                if df[col].dtype == object and df[col].isna().any():
+                    df[col] = df[col].where(df[col].notna(), np.nan)
+            return prefix, df, meta["logs"], meta["totals"]
+        return None
+
+    def save(self, selections: list[dict], prefix: int, df: pd.DataFrame, logs: list, totals: dict) -> bool:
+        """selections[:prefix] uygulandıktan sonraki durumu kaydeder; başarılıysa True."""
+        if self.max_bytes <= 0 or prefix == 0:
+            return False
+        path = self._paths(selections[:prefix])[-1]
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if not all(isinstance(col, str) for col in df.columns):
+                return False
+            table = pa.Table.from_pandas(df, preserve_index=None)
+            for col, field in zip(df.columns, table.schema):
+                if df[col].dtype == object and not (
+                    pa.types.is_string(field.type) or pa.types.is_large_string(field.type) or pa.types.is_null(field.type)
+                ):
+                    return False
+            metadata = dict(table.schema.metadata or {})
+            metadata[_META_KEY] = json.dumps({"logs": logs, "totals": totals}, default=str).encode("utf-8")
+            table = table.replace_schema_metadata(metadata)
+            os.makedirs(self.directory, exist_ok=True)
+            feather.write_feather(table, tmp_path, compression="lz4")
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.info("Checkpoint yazılamadı (önek=%d): %s", prefix, e)
+            if os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except Exception:
+                    pass
+            return False
+        self._evict()
+        return True
+
+    def _evict(self) -> None:
+        entries = []
+        for path in glob.glob(os.path.join(glob.escape(self.directory), "*" + CHECKPOINT_SUFFIX)):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,206 @@
+import os
+import threading
+
+import pandas as pd
+
+from backend.modules.file_reader import is_text_column
+from backend.modules.fuzzy_match import similar_pairs
+from backend.modules.type_inference import infer_type_profile
+
+# Bulanık eşleşme (fuzzy) kontrolünün çalıştığı benzersiz değer aralığı
+FUZZY_MIN_UNIQUE = 2
+FUZZY_MAX_UNIQUE = int(os.environ.get("FUZZY_MAX_UNIQUE", "50000"))
+FUZZY_RATIO = 0.85
+# Bu kadar benzersiz değerden itibaren neredeyse benzersiz (benzersiz/dolu oranı
+# FUZZY_MAX_UNIQUE_RATIO'yu aşan) ve kimlik benzeri (ör. CUST-000123) sütunlar
+# atlanır: bunlarda benzer değerler yazım hatası değil, farklı kayıtlardır
+FUZZY_ID_CHECK_MIN_UNIQUE = 100
+FUZZY_MAX_UNIQUE_RATIO = float(os.environ.get("FUZZY_MAX_UNIQUE_RATIO", "0.5"))
+# Kimlik benzeri: değerlerin çoğu rakam içerir ve rakamlar atılınca çok az
+# farklı kalıp kalır
+FUZZY_ID_DIGIT_SHARE = 0.8
+FUZZY_ID_MAX_SKELETON_RATIO = 0.1
+# Doğrulanan aday ve bulunan çift sayısı sınırları; aşılınca arama durur
+FUZZY_MAX_CANDIDATES = int(os.environ.get("FUZZY_MAX_CANDIDATES", "200000"))
+FUZZY_MAX_PAIRS = int(os.environ.get("FUZZY_MAX_PAIRS", "1000"))
+
+
+class ColumnStats:
+    """
+    Tek bir DataFrame için analiz boyunca paylaşılan, tembel (lazy) ve
+    önbellekli sütun istatistikleri.
+
+    Analizörler (eksik değer, aykırı değer, format, özellik) ve health score
+    hesaplayıcısı aynı nesneyi alır; her istatistik bir analiz çalışmasında en
+    fazla bir kez hesaplanır. Analizörler paralel çalıştığı için hesaplamalar
+    anahtar bazında kilitlenir. Nesne DataFrame'in değişmeyeceğini varsayar.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._cache = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _memo(self, key, compute):
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        with self._locks_guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._cache:
+                self._cache[key] = compute()
+            return self._cache[key]
+
+    # ── Tablo düzeyi ──
+
+    def missing_counts(self) -> pd.Series:
+        return self._memo("missing_counts", lambda: self.df.isna().sum())
+
+    def duplicate_count(self) -> int:
+        return self._memo("duplicate_count", lambda: int(self.df.duplicated().sum()))
+
+    def numeric_columns(self) -> list:
+        return self._memo(
+            "numeric_columns",
+            lambda: self.df.select_dtypes(include="number").columns.tolist(),
+        )
+
+    def complete_numeric_rows(self) -> pd.DataFrame:
+        """Tüm sayısal sütunları dolu olan satırlar (çok değişkenli modeller için)."""
+        return self._memo(
+            "complete_numeric_rows",
+            lambda: self.df[self.numeric_columns()].dropna(),
+        )
+
+    # ── Sütun tipi ──
+
+    def is_numeric(self, col) -> bool:
+        return self._memo(("is_numeric", col), lambda: pd.api.types.is_numeric_dtype(self.df[col]))
+
+    def is_datetime(self, col) -> bool:
+        return self._memo(("is_datetime", col), lambda: pd.api.types.is_datetime64_any_dtype(self.df[col]))
+
+    def is_text(self, col) -> bool:
+        return self._memo(("is_text", col), lambda: is_text_column(self.df[col]))
+
+    # ── Eksik değerler ──
+
+    def missing_count(self, col) -> int:
+        return int(self.missing_counts()[col])
+
+    def non_null(self, col) -> pd.Series:
+        return self._memo(("non_null", col), lambda: self.df[col].dropna())
+
+    def text_values(self, col) -> pd.Series:
+        """Eksiksiz değerler; category sütunları metin kontrolleri için object'e çevrilir."""
+        def compute():
+            values = self.non_null(col)
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype(object)
+            return values
+        return self._memo(("text_values", col), compute)
+
+    def str_values(self, col) -> pd.Series:
+        return self._memo(("str_values", col), lambda: self.text_values(col).astype(str))
+
+    def nunique(self, col) -> int:
+        return self._memo(("nunique", col), lambda: int(self.non_null(col).nunique()))
+
+    def unique_values(self, col):
+        return self._memo(("unique_values", col), lambda: self.text_values(col).unique())
+
+    def value_counts(self, col) -> pd.Series:
+        return self._memo(("value_counts", col), lambda: self.text_values(col).value_counts())
+
+    # ── Sayısal ──
+
+    def coerced_numeric(self, col) -> pd.Series:
+        """pd.to_numeric(errors='coerce') sonucu; eksiksiz satırlar üzerinde."""
+        return self._memo(
+            ("coerced_numeric", col),
+            lambda: pd.to_numeric(self.text_values(col), errors="coerce"),
+        )
+
+    def numeric_values(self, col) -> pd.Series:
+        return self._memo(("numeric_values", col), lambda: self.coerced_numeric(col).dropna())
+
+    def quartiles(self, col) -> tuple:
+        def compute():
+            values = self.numeric_values(col)
+            return values.quantile(0.25), values.quantile(0.75)
+        return self._memo(("quartiles", col), compute)
+
+    def iqr_bounds(self, col) -> tuple:
+        q1, q3 = self.quartiles(col)
+        iqr = q3 - q1
+        return q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+    # ── Metin ──
+
+    def type_profile(self, col) -> dict:
+        """Sayı/tarih görünümü profili (bkz. type_inference.infer_type_profile)."""
+        return self._memo(("type_profile", col), lambda: infer_type_profile(self.text_values(col)))
+
+    def whitespace_mask(self, col) -> pd.Series:
+        def compute():
+            values = self.str_values(col)
+            return values.str.strip() != values
+        return self._memo(("whitespace_mask", col), compute)
+
+    def has_case_variants(self, col) -> bool:
+        """Aynı değerin farklı büyük/küçük harf yazımları var mı?"""
+        def compute():
+            values = self.str_values(col)
+            return len(values.str.lower().unique()) < len(values.unique())
+        return self._memo(("has_case_variants", col), compute)
+
+    def case_mask(self, col) -> pd.Series:
+        return self._memo(
+            ("case_mask", col),
+            lambda: self.text_values(col).apply(lambda x: x.lower() != x if isinstance(x, str) else False),
+        )
+
+    def sample_is_numeric_or_date(self, col) -> bool:
+        """İlk 100 değer ağırlıklı olarak sayı ya da tarih mi? (fuzzy kontrolünü atlamak için)"""
+        return self.type_profile(col)["sample_is_numeric_or_date"]
+
+    def is_identifier_like(self, col) -> bool:
+        """Sütun neredeyse benzersiz ya da kimlik/kod kalıbında mı? (fuzzy kontrolünü atlamak için)"""
+        def compute():
+            n_unique = len(self.unique_values(col))
+            if n_unique < FUZZY_ID_CHECK_MIN_UNIQUE:
+                return False
+            if n_unique / len(self.text_values(col)) > FUZZY_MAX_UNIQUE_RATIO:
+                return True
+            texts = pd.Series(self.unique_values(col), dtype=object).astype(str)
+            if texts.str.contains(r"\d").mean() <= FUZZY_ID_DIGIT_SHARE:
+                return False
+            skeletons = texts.str.replace(r"\d+", "#", regex=True).nunique()
+            return skeletons <= FUZZY_ID_MAX_SKELETON_RATIO * n_unique
+        return self._memo(("is_identifier_like", col), compute)
+
+    def similar_pairs(self, col) -> list:
+        """Yazım hatası olabilecek (val1, val2, oran) benzer değer çiftleri."""
+        def compute():
+            actual_vals = self.unique_values(col)
+            if not (FUZZY_MIN_UNIQUE < len(actual_vals) < FUZZY_MAX_UNIQUE):
+                return []
+            if self.is_identifier_like(col):
+                return []
+            return similar_pairs(
+                actual_vals, FUZZY_RATIO, max_candidates=FUZZY_MAX_CANDIDATES, max_pairs=FUZZY_MAX_PAIRS
+            )
+        return self._memo(("similar_pairs", col), compute)
+
+    def fuzzy_replace_keys(self, col) -> set:
+        """Benzer çiftlerde daha seyrek geçen (birleştirilecek) değerler."""
+        def compute():
+            value_counts = self.value_counts(col)
+            return {
+                (val2 if value_counts.get(val1, 0) >= value_counts.get(val2, 0) else val1)
+                for val1, val2, _ in self.similar_pairs(col)
+            }
+        return self._memo(("fuzzy_replace_keys", col), compute)
@@ -1,22 +1,26 @@
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler, MinMaxScaler, LabelEncoder
+from backend.modules.column_stats import ColumnStats
+from backend.modules.ownership import writable_copy
 
-def analyze_features(df: pd.DataFrame) -> dict:
+def analyze_features(df: pd.DataFrame, stats: ColumnStats | None = None) -> dict:
     """
     Sütunların veri yapısına bakarak otomatik özellik çıkarımı veya veri dönüşümü önerir.
     """
+    if stats is None:
+        stats = ColumnStats(df)
     result = {}
 
     for col in df.columns:
-        col_data = df[col].dropna()
+        col_data = stats.non_null(col)
         if len(col_data) == 0:
             continue
 
         recommendations = []
-        is_numeric = pd.api.types.is_numeric_dtype(df[col])
-        is_datetime = pd.api.types.is_datetime64_any_dtype(df[col])
-        is_object = df[col].dtype == object
+        is_numeric = stats.is_numeric(col)
+        is_datetime = stats.is_datetime(col)
+        is_object = stats.is_text(col)
 
         # ── 1. Tarih Özellikleri Çıkarma ──
         if is_datetime:
@@ -29,7 +33,7 @@ def analyze_features(df: pd.DataFrame) -> dict:
 
         # ── 2. Kategorik Dönüşümler (Encoding) ──
         if is_object:
-            unique_count = col_data.nunique()
+            unique_count = stats.nunique(col)
             if 1 < unique_count <= 15:
                 # One-hot encoding için uygun
                 recommendations.append({
@@ -92,7 +96,7 @@ def apply_feature_engineering(df: pd.DataFrame, column: str, method: str) -> tup
     """
     Seçilen özellik mühendisliği yöntemini uygular.
     """
-    df = df.copy()
+    df = writable_copy(df, [column])
 
     if method == "skip":
         detail = f"{column} sütununa özellik mühendisliği uygulanmadı (atlandı)."
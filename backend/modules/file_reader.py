@@ -1,13 +1,77 @@
 import pandas as pd
+import numpy as np
+import codecs
+import csv
+import glob
+import hashlib
+import importlib.util
+import json
+import logging
+import multiprocessing
 import os
+import re
+import warnings
+import zipfile
+from xml.etree import ElementTree
+import pyarrow as pa
+import pyarrow.feather as feather
+from pandas.errors import ParserWarning
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
 
 SUPPORTED_FORMATS = [".csv", ".txt", ".xlsx"]
 
+# read_file_chunks / scan_file varsayılan parça boyutu (satır)
+DEFAULT_CHUNKSIZE = 100_000
+
+# optimize_dtypes: benzersiz/dolu oranı bu değerin altındaki metin sütunları category olur
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Sütunlu önbellek (Arrow IPC) — ham dosyanın yanına bir kez yazılır,
+# sonraki tüm okumalar bu kopyayı memory-map ile açar.
+COLUMNAR_CACHE_SUFFIX = ".arrow"
+COLUMNAR_CACHE_VERSION = 1
+_CACHE_META_KEY = b"prepwise_source"
+
+# Encoding tespiti için okunacak bayt sayısı ve denenecek encoding sırası
+ENCODING_SAMPLE_BYTES = 64 * 1024
+_ENCODING_CHAIN = ["utf-8", "cp1254", "latin-1"]
+_BAD_LINE_RE = re.compile(r"Skipping line (\d+)")
 
-def read_file(file_path: str) -> tuple[pd.DataFrame, dict]:
+# TXT diyalekt tespiti
+DIALECT_SAMPLE_BYTES = 16 * 1024
+_TXT_SEPARATORS = ["\t", ";", ",", "|"]
+_COMMA_DECIMAL_RE = re.compile(r"^-?(\d{1,3}(\.\d{3})+|\d+),\d+$")
+_DOT_DECIMAL_RE = re.compile(r"^-?\d+\.\d+$")
+_DOT_THOUSANDS_RE = re.compile(r"^-?\d{1,3}(\.\d{3})+(,\d+)?$")
+_SINGLE_QUOTED_RE = re.compile(r"(?:^|[\t;,|])'[^'\n]*'(?=[\t;,|]|$)", re.MULTILINE)
+
+# XLSX okuma: calamine (Rust) kuruluysa o, değilse openpyxl read-only kullanılır.
+# Okuma ayrı bir süreçte yapılır; XLSX_READ_TIMEOUT saniyede bitmezse süreç
+# sonlandırılır. 0 verilirse koruma kapatılır ve aynı süreçte okunur.
+XLSX_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else "openpyxl"
+XLSX_READ_TIMEOUT = float(os.environ.get("XLSX_READ_TIMEOUT", "120"))
+_XLSX_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+def read_file(
+    file_path: str,
+    use_cache: bool = True,
+    dialect: dict | None = None,
+    sheet_name: str | None = None,
+    optimize: bool = False,
+) -> tuple[pd.DataFrame, dict]:
     """
     Dosyayı okur, DataFrame ve meta bilgi döner.
     Desteklenen formatlar: CSV, TXT, XLSX
+
+    use_cache=True iken ham dosyanın güncel bir sütunlu kopyası varsa
+    o okunur; yoksa ham dosya ayrıştırılır ve kopya yazılır.
+    dialect: TXT için daha önce tespit edilmiş diyalekt (meta["dialect"]);
+    verilirse tespit adımı atlanır.
+    sheet_name: XLSX için okunacak sayfa; verilmezse ilk sayfa okunur.
+    optimize: True ise optimize_dtypes uygulanır ve kazanç meta["memory"]'ye yazılır.
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Dosya bulunamadı: {file_path}")
@@ -17,13 +81,25 @@ def read_file(file_path: str) -> tuple[pd.DataFrame, dict]:
     if ext not in SUPPORTED_FORMATS:
         raise ValueError(f"Desteklenmeyen format: {ext}. Desteklenenler: {SUPPORTED_FORMATS}")
 
+    variant = _sheet_variant(sheet_name) if ext == ".xlsx" else None
+    df = _load_columnar_cache(file_path, variant) if use_cache else None
+    from_cache = df is not None
+
     # Formatına göre oku
-    if ext == ".csv":
-        df = _read_csv(file_path)
-    elif ext == ".txt":
-        df = _read_txt(file_path)
-    elif ext == ".xlsx":
-        df = _read_xlsx(file_path)
+    if df is None:
+        cache_written = False
+        if ext == ".csv":
+            df = _read_csv(file_path)
+        elif ext == ".txt":
+            df, dialect = _read_txt(file_path, dialect)
+        elif ext == ".xlsx":
+            df, cache_written = _read_xlsx(file_path, sheet_name, write_cache=use_cache)
+        if use_cache and not cache_written:
+            write_columnar_cache(df, file_path, variant)
+
+    memory_report = None
+    if optimize:
+        df, memory_report = optimize_dtypes(df)
 
     # Meta bilgileri topla
     meta = {
@@ -34,24 +110,378 @@ def read_file(file_path: str) -> tuple[pd.DataFrame, dict]:
         "columns": list(df.columns),
         "dtypes": {col: str(df[col].dtype) for col in df.columns},
         "file_path": file_path,
+        "from_cache": from_cache,
     }
+    if ext == ".txt" and dialect is not None:
+        meta["dialect"] = dialect
+    if ext == ".xlsx":
+        meta["sheets"] = list_sheets(file_path)
+        meta["sheet_name"] = sheet_name if sheet_name is not None else (meta["sheets"] or [None])[0]
+    if memory_report is not None:
+        meta["memory"] = memory_report
 
     return df, meta
 
 
+# ── Bellek dostu tip optimizasyonu ───────────────────────────────────────────
+
+def is_text_column(series: pd.Series) -> bool:
+    """
+    Sütun metin içerikli mi? object sütunlarına ek olarak optimize_dtypes'ın
+    ürettiği category sütunlarını da metin sayar.
+    """
+    if series.dtype == object:
+        return True
+    return isinstance(series.dtype, pd.CategoricalDtype) and series.cat.categories.dtype == object
+
+
+def optimize_dtypes(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+    """
+    Kayıpsız tip küçültme uygular:
+    - Düşük kardinaliteli metin sütunları → category
+    - Tamsayı sütunları → en küçük yeterli tamsayı tipi
+    - Ondalık sütunlar → float32 (yalnızca değerler birebir korunuyorsa)
+    (DataFrame, bellek raporu) döner.
+    """
+    before_bytes = int(df.memory_usage(deep=True).sum())
+    converted = {}
+    out = df.copy(deep=False)
+
+    for col in df.columns:
+        series = df[col]
+        new = None
+        if series.dtype == object:
+            non_null = series.dropna()
+            if (
+                len(non_null) > 0
+                and pd.api.types.infer_dtype(non_null, skipna=True) == "string"
+                and non_null.nunique() / len(non_null) <= CATEGORY_MAX_UNIQUE_RATIO
+            ):
+                new = series.astype("category")
+        elif pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            new = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series) and series.dtype != np.float32:
+            candidate = series.astype(np.float32)
+            if np.array_equal(candidate.to_numpy(np.float64), series.to_numpy(np.float64), equal_nan=True):
+                new = candidate
+
+        if new is not None and new.dtype != series.dtype:
+            out[col] = new
+            converted[str(col)] = f"{series.dtype}→{new.dtype}"
+
+    after_bytes = int(out.memory_usage(deep=True).sum())
+    report = {
+        "before_bytes": before_bytes,
+        "after_bytes": after_bytes,
+        "saved_bytes": before_bytes - after_bytes,
+        "converted": converted,
+    }
+    return out, report
+
+
+# ── Parçalı (out-of-core) okuma ──────────────────────────────────────────────
+
+def read_file_chunks(
+    file_path: str,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    dialect: dict | None = None,
+    sheet_name: str | None = None,
+    dtype: dict | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Dosyayı en fazla chunksize satırlık DataFrame parçaları halinde okur.
+    read_file ile aynı formatları destekler; tüm dosya belleğe alınmaz.
+    Bozuk satır tespit edilirse read_file ile aynı ValueError fırlatılır.
+    dtype: CSV/TXT için read_csv'ye iletilen sütun tipleri (XLSX'te yok sayılır).
+    XLSX sayfası read_file gibi zaman aşımı korumalı okunup sütunlu önbelleğe
+    yazılır; parçalar önbellekten dilimlenir.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Dosya bulunamadı: {file_path}")
+
+    ext = os.path.splitext(file_path)[1].lower()
+
+    if ext not in SUPPORTED_FORMATS:
+        raise ValueError(f"Desteklenmeyen format: {ext}. Desteklenenler: {SUPPORTED_FORMATS}")
+
+    if ext == ".xlsx":
+        yield from _iter_xlsx_chunks(file_path, chunksize, sheet_name)
+        return
+
+    if ext == ".csv":
+        options = {"encoding": sniff_encoding(file_path)}
+    else:
+        if dialect is None:
+            dialect = sniff_dialect(file_path)
+        options = {
+            "sep": dialect.get("sep", ","),
+            "quotechar": dialect.get("quotechar", '"'),
+            "decimal": dialect.get("decimal", "."),
+            "thousands": dialect.get("thousands"),
+            "encoding": dialect.get("encoding", "utf-8"),
+        }
+
+    reader = pd.read_csv(file_path, chunksize=chunksize, on_bad_lines="warn", engine="c", dtype=dtype, **options)
+    with reader:
+        while True:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always", ParserWarning)
+                try:
+                    chunk = next(reader)
+                except StopIteration:
+                    return
+                except UnicodeDecodeError:
+                    raise ValueError("Dosya encoding'i okunamadı.")
+            bad_lines = _bad_line_numbers(caught)
+            if bad_lines:
+                raise ValueError(
+                    f"Dosyada {len(bad_lines)} adet geçersiz/bozuk satır tespit edildi. "
+                    f"Lütfen CSV formatını ve sütun ayraçlarını kontrol edin. "
+                    f"Hatalı satırlar: {', '.join(str(n) for n in bad_lines[:10])}"
+                )
+            yield chunk
+
+
+def _iter_xlsx_chunks(file_path: str, chunksize: int, sheet_name: str | None) -> Iterator[pd.DataFrame]:
+    # Sayfa, read_file ile aynı zaman aşımı korumalı okuyucuyla bir kez ayrıştırılıp
+    # sütunlu önbelleğe yazılır; parçalar önbelleğin memory-map edilmiş kopyasından
+    # dilimlenir. Önbellek yazılamazsa (karışık tipli sütunlar) okunan tablo dilimlenir.
+    variant = _sheet_variant(sheet_name)
+    table = _open_columnar_cache(file_path, variant)
+    df = None
+    if table is None:
+        cached, df = _parse_xlsx_guarded(file_path, sheet_name, write_cache=True)
+        if cached:
+            table = _open_columnar_cache(file_path, variant)
+            if table is None:
+                df = _parse_xlsx_sheet(file_path, sheet_name)
+    step = max(1, chunksize)
+    if table is not None:
+        for start in range(0, table.num_rows, step):
+            yield _table_to_frame(table.slice(start, step))
+        return
+    for start in range(0, len(df), step):
+        yield df.iloc[start:start + step].reset_index(drop=True)
+
+
+def merge_dtypes(left: str, right: str) -> str:
+    """İki parçanın dtype'ını, tüm dosya tek seferde okunsaydı oluşacak tipe birleştirir."""
+    if left == right:
+        return left
+    try:
+        left_dt, right_dt = np.dtype(left), np.dtype(right)
+    except TypeError:
+        return "object"
+    if left_dt.kind in "iuf" and right_dt.kind in "iuf":
+        return str(np.result_type(left_dt, right_dt))
+    return "object"
+
+
+def scan_file(
+    file_path: str,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    dialect: dict | None = None,
+    sheet_name: str | None = None,
+) -> dict:
+    """
+    Dosyayı parça parça okuyarak read_file ile aynı meta bilgisini üretir.
+    Satır sayısı ve sütun tipleri artımlı hesaplanır; bellek kullanımı
+    dosya boyutundan bağımsızdır. meta["memory_bytes"], tablo tek seferde
+    okunsaydı bellekte kaplayacağı yaklaşık boyuttur (parçaların toplamı).
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".txt" and dialect is None:
+        dialect = sniff_dialect(file_path)
+
+    row_count = 0
+    memory_bytes = 0
+    columns: list = []
+    dtypes: dict = {}
+    for chunk in read_file_chunks(file_path, chunksize, dialect=dialect, sheet_name=sheet_name):
+        if not columns:
+            columns = list(chunk.columns)
+        row_count += len(chunk)
+        memory_bytes += int(chunk.memory_usage(index=False, deep=True).sum())
+        for col in chunk.columns:
+            chunk_dtype = str(chunk[col].dtype)
+            # Tamamen boş parça sütunu (float NaN) tipi belirlemez
+            if chunk[col].isna().all() and col in dtypes:
+                continue
+            dtypes[col] = merge_dtypes(dtypes[col], chunk_dtype) if col in dtypes else chunk_dtype
+
+    meta = {
+        "filename": os.path.basename(file_path),
+        "format": ext.replace(".", "").upper(),
+        "row_count": row_count,
+        "col_count": len(columns),
+        "columns": columns,
+        "dtypes": {col: dtypes.get(col, "object") for col in columns},
+        "file_path": file_path,
+        "from_cache": False,
+        "memory_bytes": memory_bytes,
+    }
+    if ext == ".txt":
+        meta["dialect"] = dialect
+    if ext == ".xlsx":
+        meta["sheets"] = list_sheets(file_path)
+        meta["sheet_name"] = sheet_name if sheet_name is not None else (meta["sheets"] or [None])[0]
+    return meta
+
+
+# ── Sütunlu önbellek ─────────────────────────────────────────────────────────
+
+def columnar_cache_path(file_path: str, variant: str | None = None) -> str:
+    """Önbellek yolu; variant (ör. XLSX sayfası) verilirse ayrı bir dosya kullanılır."""
+    if variant is None:
+        return file_path + COLUMNAR_CACHE_SUFFIX
+    digest = hashlib.sha1(variant.encode("utf-8")).hexdigest()[:12]
+    return f"{file_path}.{digest}{COLUMNAR_CACHE_SUFFIX}"
+
+
+def _sheet_variant(sheet_name: str | None) -> str | None:
+    return None if sheet_name is None else f"sheet:{sheet_name}"
+
+
+def _source_signature(file_path: str) -> dict:
+    st = os.stat(file_path)
+    return {
+        "version": COLUMNAR_CACHE_VERSION,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+    }
+
+
+def write_columnar_cache(df: pd.DataFrame, file_path: str, variant: str | None = None) -> bool:
+    """
+    DataFrame'i ham dosyanın yanına sıkıştırılmamış Arrow IPC olarak yazar.
+    Kaynak dosyanın boyutu ve değişiklik zamanı şema metadata'sına işlenir.
+    Karışık tipli sütunlar gibi Arrow'a çevrilemeyen tablolarda önbellek
+    atlanır ve False döner; okuma her zaman ham dosyaya düşebilir.
+    """
+    cache_path = columnar_cache_path(file_path, variant)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=None)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_CACHE_META_KEY] = json.dumps(_source_signature(file_path)).encode("utf-8")
+        table = table.replace_schema_metadata(metadata)
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, cache_path)
+        return True
+    except Exception as e:
+        logger.info("Sütunlu önbellek yazılamadı (%s): %s", os.path.basename(file_path), e)
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except Exception:
+                pass
+        return False
+
+
+def _open_columnar_cache(file_path: str, variant: str | None = None) -> pa.Table | None:
+    """Güncel önbelleği memory-map ile Arrow tablosu olarak açar; yoksa/eskiyse None döner."""
+    cache_path = columnar_cache_path(file_path, variant)
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        table = feather.read_table(cache_path, memory_map=True)
+        stored = json.loads((table.schema.metadata or {}).get(_CACHE_META_KEY, b"{}"))
+    except Exception as e:
+        logger.warning("Sütunlu önbellek okunamadı, ham dosyaya dönülüyor (%s): %s", cache_path, e)
+        return None
+    if stored != _source_signature(file_path):
+        return None
+    return table
+
+
+def _table_to_frame(table: pa.Table) -> pd.DataFrame:
+    df = table.to_pandas()
+    # Arrow metin sütunlarındaki null'lar None olarak gelir; ham okumayla
+    # aynı sonucu vermek için NaN'a çevrilir.
+    for col in df.columns:
+        if df[col].dtype == object and df[col].isna().any():
+            df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+
+def _load_columnar_cache(file_path: str, variant: str | None = None) -> pd.DataFrame | None:
+    """Güncel önbellek varsa memory-map ile açar; yoksa/eskiyse None döner."""
+    table = _open_columnar_cache(file_path, variant)
+    if table is None:
+        return None
+    try:
+        return _table_to_frame(table)
+    except Exception as e:
+        logger.warning("Sütunlu önbellek okunamadı, ham dosyaya dönülüyor (%s): %s", file_path, e)
+        return None
+
+
+def remove_columnar_cache(file_path: str | None) -> None:
+    """Ham dosyaya ait tüm sütunlu önbellekleri (sayfa kopyaları dahil) sessizce siler."""
+    if not file_path:
+        return
+    for cache_path in glob.glob(glob.escape(file_path) + "*" + COLUMNAR_CACHE_SUFFIX):
+        try:
+            os.remove(cache_path)
+        except Exception:
+            pass
+
+
+# ── Format okuyucular ────────────────────────────────────────────────────────
+
+def sniff_encoding(file_path: str, sample_bytes: int = ENCODING_SAMPLE_BYTES) -> str:
+    """
+    Dosyanın ilk baytlarından encoding tahmini yapar (utf-8 → cp1254 → latin-1).
+    Örnek dosyanın sonuna ulaşmıyorsa yarım kalan çok baytlı karakter hata sayılmaz.
+    """
+    with open(file_path, "rb") as f:
+        sample = f.read(sample_bytes)
+        at_eof = not f.read(1)
+    for encoding in _ENCODING_CHAIN:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=at_eof)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return _ENCODING_CHAIN[-1]
+
+
+def _bad_line_numbers(caught: list) -> list[int]:
+    """C parser'ın 'Skipping line N: ...' uyarılarından satır numaralarını çıkarır."""
+    numbers = []
+    for w in caught:
+        if issubclass(w.category, ParserWarning):
+            numbers.extend(int(n) for n in _BAD_LINE_RE.findall(str(w.message)))
+    return numbers
+
+
 def _read_csv(file_path: str) -> pd.DataFrame:
-    # Önce UTF-8, hata verirse cp1254, sonra latin-1 dene
-    for encoding in ["utf-8", "cp1254", "latin-1"]:
+    # Encoding örnekten tespit edilir ve dosya C motoruyla tek seferde okunur.
+    # Örnekte görünmeyen bir bayt hatası çıkarsa zincirdeki sonraki encoding denenir.
+    sniffed = sniff_encoding(file_path)
+    for encoding in _ENCODING_CHAIN[_ENCODING_CHAIN.index(sniffed):]:
         try:
-            bad_lines = []
-            def catch_bad_line(line):
-                bad_lines.append(line)
-                return None
-            df = pd.read_csv(file_path, encoding=encoding, on_bad_lines=catch_bad_line, engine='python')
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always", ParserWarning)
+                df = pd.read_csv(
+                    file_path,
+                    encoding=encoding,
+                    on_bad_lines="warn",
+                    engine="c",
+                    low_memory=False,
+                )
+            bad_lines = _bad_line_numbers(caught)
+            for w in caught:
+                if not issubclass(w.category, ParserWarning):
+                    warnings.warn_explicit(w.message, w.category, w.filename, w.lineno)
             if bad_lines:
+                shown = ", ".join(str(n) for n in bad_lines[:10])
+                if len(bad_lines) > 10:
+                    shown += ", ..."
                 raise ValueError(
                     f"Dosyada {len(bad_lines)} adet geçersiz/bozuk satır tespit edildi. "
-                    f"Lütfen CSV formatını ve sütun ayraçlarını kontrol edin."
+                    f"Lütfen CSV formatını ve sütun ayraçlarını kontrol edin. "
+                    f"Hatalı satırlar: {shown}"
                 )
             return df
         except UnicodeDecodeError:
@@ -59,45 +489,170 @@ def _read_csv(file_path: str) -> pd.DataFrame:
     raise ValueError("Dosya encoding'i okunamadı.")
 
 
-def _read_txt(file_path: str) -> pd.DataFrame:
-    # TXT dosyasında ayırıcıyı otomatik tespit et
-    for sep in ["\t", ";", ",", "|"]:
+def sniff_dialect(file_path: str, sample_bytes: int = DIALECT_SAMPLE_BYTES) -> dict:
+    """
+    TXT dosyasının ilk birkaç KB'ından ayırıcı, tırnak karakteri, ondalık
+    işareti ve encoding'i tespit eder. Tam dosya ayrıştırılmaz.
+    """
+    encoding = sniff_encoding(file_path)
+    with open(file_path, "rb") as f:
+        raw = f.read(sample_bytes)
+        at_eof = not f.read(1)
+    sample = codecs.getincrementaldecoder(encoding)(errors="replace").decode(raw, final=at_eof)
+    lines = sample.splitlines()
+    if not at_eof and len(lines) > 1:
+        lines = lines[:-1]  # Örneğin sonundaki yarım satır
+    lines = [line for line in lines if line.strip()]
+
+    quotechar = _sniff_quotechar(sample)
+    sep = None
+    for candidate in _TXT_SEPARATORS:
+        counts = [len(row) for row in csv.reader(lines, delimiter=candidate, quotechar=quotechar)]
+        # pandas ile aynı kabul kuralı: başlıktan fazla alan içeren satır olmamalı
+        if counts and counts[0] > 1 and max(counts) <= counts[0]:
+            sep = candidate
+            break
+
+    dialect = {"sep": sep or ",", "quotechar": quotechar, "decimal": ".", "thousands": None, "encoding": encoding}
+    if sep and sep != ",":
+        fields = [
+            field.strip()
+            for row in csv.reader(lines[1:], delimiter=sep, quotechar=quotechar)
+            for field in row
+        ]
+        comma_decimal = sum(1 for v in fields if _COMMA_DECIMAL_RE.match(v))
+        dot_decimal = sum(1 for v in fields if _DOT_DECIMAL_RE.match(v))
+        if comma_decimal > dot_decimal:
+            dialect["decimal"] = ","
+            if any(_DOT_THOUSANDS_RE.match(v) for v in fields):
+                dialect["thousands"] = "."
+    return dialect
+
+
+def _sniff_quotechar(sample: str) -> str:
+    double = sample.count('"')
+    single = len(_SINGLE_QUOTED_RE.findall(sample))
+    return "'" if single > 0 and double == 0 else '"'
+
+
+def _read_txt(file_path: str, dialect: dict | None = None) -> tuple[pd.DataFrame, dict]:
+    # Diyalekt verilmemişse örnekten tespit edilir; dosya tek seferde okunur.
+    if dialect is None:
+        dialect = sniff_dialect(file_path)
+    df = pd.read_csv(
+        file_path,
+        sep=dialect.get("sep", ","),
+        quotechar=dialect.get("quotechar", '"'),
+        decimal=dialect.get("decimal", "."),
+        thousands=dialect.get("thousands"),
+        encoding=dialect.get("encoding", "utf-8"),
+        engine="c",
+        low_memory=False,
+    )
+    return df, dialect
+
+
+def list_sheets(file_path: str) -> list[str]:
+    """
+    XLSX sayfa adlarını yalnızca xl/workbook.xml dosyasından okur;
+    hücre verisi yüklenmez.
+    """
+    try:
+        with zipfile.ZipFile(file_path) as zf:
+            root = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+        return [sheet.get("name") for sheet in root.iter(f"{_XLSX_NS}sheet")]
+    except Exception as e:
+        logger.warning("XLSX sayfa listesi okunamadı (%s): %s", os.path.basename(file_path), e)
+        return []
+
+
+def _parse_xlsx_sheet(file_path: str, sheet_name: str | None) -> pd.DataFrame:
+    return pd.read_excel(
+        file_path,
+        sheet_name=0 if sheet_name is None else sheet_name,
+        engine=XLSX_ENGINE,
+    )
+
+
+def _xlsx_worker(file_path: str, sheet_name: str | None, write_cache: bool):
+    """Alt süreçte çalışır: sayfayı okur, mümkünse doğrudan sütunlu önbelleğe yazar."""
+    df = _parse_xlsx_sheet(file_path, sheet_name)
+    if write_cache and write_columnar_cache(df, file_path, _sheet_variant(sheet_name)):
+        return True, None
+    return False, df
+
+
+def _parse_xlsx_guarded(file_path: str, sheet_name: str | None, write_cache: bool):
+    """
+    _xlsx_worker'ı zaman aşımı korumalı bir alt süreçte çalıştırır;
+    (önbellek_yazıldı_mı, DataFrame | None) döner. XLSX_READ_TIMEOUT <= 0 ise
+    aynı süreçte çalışır.
+    """
+    if XLSX_READ_TIMEOUT <= 0:
+        return _xlsx_worker(file_path, sheet_name, write_cache)
+
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    # Pool bağlam yöneticisi çıkışta terminate() çağırır; takılan süreç öldürülür.
+    with ctx.Pool(processes=1) as pool:
+        pending = pool.apply_async(_xlsx_worker, (file_path, sheet_name, write_cache))
         try:
-            df = pd.read_csv(file_path, sep=sep, encoding="utf-8")
-            if len(df.columns) > 1:  # Birden fazla sütun varsa doğru ayırıcı
-                return df
-        except Exception:
-            continue
-    # Hiçbiri olmazsa tek sütun olarak oku
-    return pd.read_csv(file_path, encoding="utf-8")
+            return pending.get(timeout=XLSX_READ_TIMEOUT)
+        except multiprocessing.TimeoutError:
+            raise ValueError(
+                f"XLSX dosyası {XLSX_READ_TIMEOUT:g} saniye içinde okunamadı. "
+                f"Dosya çok büyük veya bozuk olabilir."
+            )
 
 
-def _read_xlsx(file_path: str) -> pd.DataFrame:
-    return pd.read_excel(file_path, engine="openpyxl")
+def _read_xlsx(
+    file_path: str,
+    sheet_name: str | None = None,
+    write_cache: bool = False,
+) -> tuple[pd.DataFrame, bool]:
+    """
+    Seçilen sayfayı zaman aşımı korumalı bir alt süreçte okur.
+    (DataFrame, önbellek_yazıldı_mı) döner.
+    """
+    if XLSX_READ_TIMEOUT <= 0:
+        df = _parse_xlsx_sheet(file_path, sheet_name)
+        return df, False
+
+    cached, df = _parse_xlsx_guarded(file_path, sheet_name, write_cache)
+    if cached:
+        df = _load_columnar_cache(file_path, _sheet_variant(sheet_name))
+        if df is None:
+            return _parse_xlsx_sheet(file_path, sheet_name), False
+    return df, cached
 
 
 def get_basic_profile(df: pd.DataFrame) -> dict:
     """
     Veri seti hakkında temel istatistiksel profil çıkarır.
+    İstatistikler profiler.column_stats ile tek seferde hesaplanır.
     """
+    from backend.modules.profiler import column_stats
+
+    stats = column_stats(df)
+    row_count = len(df)
     profile = {}
 
-    for col in df.columns:
+    for col, info in stats.items():
         col_info = {
-            "dtype": str(df[col].dtype),
-            "missing_count": int(df[col].isnull().sum()),
-            "missing_pct": round(df[col].isnull().mean() * 100, 2),
-            "unique_count": int(df[col].nunique()),
+            "dtype": info["dtype"],
+            "missing_count": info["missing_count"],
+            "missing_pct": round(info["missing_count"] / row_count * 100, 2) if row_count else float("nan"),
+            "unique_count": info["unique_count"],
         }
 
         # Sayısal sütunlar için ek istatistik
-        if pd.api.types.is_numeric_dtype(df[col]):
+        if info["is_numeric"]:
             col_info.update({
-                "mean": round(float(df[col].mean()), 4) if not df[col].isnull().all() else None,
-                "median": round(float(df[col].median()), 4) if not df[col].isnull().all() else None,
-                "std": round(float(df[col].std()), 4) if not df[col].isnull().all() else None,
-                "min": float(df[col].min()) if not df[col].isnull().all() else None,
-                "max": float(df[col].max()) if not df[col].isnull().all() else None,
+                "mean": round(info["mean"], 4) if info["count"] else None,
+                "median": round(info["median"], 4) if info["count"] else None,
+                "std": round(info["std"], 4) if info["count"] else None,
+                "min": info["min"],
+                "max": info["max"],
             })
 
         profile[col] = col_info
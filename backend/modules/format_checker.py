@@ -1,9 +1,13 @@
 import pandas as pd
 import numpy as np
 import re
+from backend.modules.column_stats import ColumnStats
+from backend.modules.ownership import writable_copy
+from backend.modules.string_transform import STRING_METHODS, apply_string_steps
+from backend.modules.type_inference import parse_dates
 
 
-def analyze_format(df: pd.DataFrame) -> dict:
+def analyze_format(df: pd.DataFrame, stats: ColumnStats | None = None) -> dict:
     """
     Sütunlardaki format hatalarını tespit eder:
     - Sayısal görünümlü metin sütunları
@@ -11,22 +15,27 @@ def analyze_format(df: pd.DataFrame) -> dict:
     - Karışık tip içeren sütunlar
     - Boşluk/özel karakter sorunları
     """
+    if stats is None:
+        stats = ColumnStats(df)
     result = {}
 
     for col in df.columns:
         issues = []
         recommendations = []
 
-        col_data = df[col].dropna()
-        if len(col_data) == 0:
+        if len(stats.non_null(col)) == 0:
             continue
 
         dtype = str(df[col].dtype)
+        # category sütunları (optimize_dtypes) metin kontrollerine object olarak girer
+        is_text = stats.is_text(col)
+        col_data = stats.text_values(col)
 
         # ── Kontrol 1: object tipinde ama aslında sayısal mı? ──
-        if df[col].dtype == object:
-            numeric_convertible = pd.to_numeric(col_data, errors='coerce').notna().sum()
-            numeric_ratio = numeric_convertible / len(col_data)
+        if is_text:
+            profile = stats.type_profile(col)
+            numeric_convertible = profile["numeric_count"]
+            numeric_ratio = profile["numeric_ratio"]
 
             if numeric_ratio > 0.8:
                 issues.append({
@@ -42,18 +51,10 @@ def analyze_format(df: pd.DataFrame) -> dict:
                 })
 
         # ── Kontrol 2: Tarih formatı tespiti ──
-        if df[col].dtype == object:
-            date_patterns = [
-                r'\d{4}-\d{2}-\d{2}',          # 2024-01-15
-                r'\d{2}/\d{2}/\d{4}',           # 15/01/2024
-                r'\d{2}\.\d{2}\.\d{4}',         # 15.01.2024
-                r'\d{4}/\d{2}/\d{2}',           # 2024/01/15
-            ]
-            date_match_count = 0
-            for pattern in date_patterns:
-                date_match_count += col_data.astype(str).str.match(pattern).sum()
-
-            date_ratio = float(date_match_count) / len(col_data)
+        if is_text:
+            profile = stats.type_profile(col)
+            date_match_count = profile["date_count"]
+            date_ratio = profile["date_ratio"]
             if date_ratio > 0.5:
                 issues.append({
                     "type": "date_as_string",
@@ -68,9 +69,8 @@ def analyze_format(df: pd.DataFrame) -> dict:
                 })
 
         # ── Kontrol 3: Baştaki/sondaki boşluklar ──
-        if df[col].dtype == object:
-            has_whitespace = col_data.astype(str).str.strip() != col_data.astype(str)
-            whitespace_count = int(has_whitespace.sum())
+        if is_text:
+            whitespace_count = int(stats.whitespace_mask(col).sum())
             if whitespace_count > 0:
                 issues.append({
                     "type": "whitespace",
@@ -85,11 +85,9 @@ def analyze_format(df: pd.DataFrame) -> dict:
                 })
 
         # ── Kontrol 4: Büyük/küçük harf tutarsızlığı ──
-        if df[col].dtype == object and col_data.nunique() < 20:
-            lower_vals = col_data.str.lower().unique()
-            actual_vals = col_data.unique()
-            if len(lower_vals) < len(actual_vals):
-                affected = int(col_data.apply(lambda x: x.lower() != x if isinstance(x, str) else False).sum())
+        if is_text and stats.nunique(col) < 20:
+            if stats.has_case_variants(col):
+                affected = int(stats.case_mask(col).sum())
                 issues.append({
                     "type": "case_inconsistency",
                     "desc": "Aynı değerin farklı büyük/küçük harf versiyonları var (örn: 'Erkek' ve 'erkek').",
@@ -103,65 +101,23 @@ def analyze_format(df: pd.DataFrame) -> dict:
                 })
 
         # ── Kontrol 5: Semantik / Yazım Yanlışı Benzerliği (Fuzzy Matching) ──
-        if df[col].dtype == object:
-            # Skip fuzzy check if sample rows are highly numeric-like or date-like
-            sample_data = col_data.head(100)
-            is_numeric_or_date = False
-            if len(sample_data) > 0:
-                numeric_convertible = pd.to_numeric(sample_data, errors='coerce').notna().sum()
-                numeric_ratio = numeric_convertible / len(sample_data)
-
-                date_patterns = [
-                    r'\d{4}-\d{2}-\d{2}',          # 2024-01-15
-                    r'\d{2}/\d{2}/\d{4}',           # 15/01/2024
-                    r'\d{2}\.\d{2}\.\d{4}',         # 15.01.2024
-                    r'\d{4}/\d{2}/\d{2}',           # 2024/01/15
-                ]
-                date_match_count = 0
-                for pattern in date_patterns:
-                    date_match_count += sample_data.astype(str).str.match(pattern).sum()
-                date_ratio = float(date_match_count) / len(sample_data)
-
-                datetime_convertible = pd.to_datetime(sample_data, errors='coerce', dayfirst=True).notna().sum()
-                datetime_ratio = datetime_convertible / len(sample_data)
-
-                if numeric_ratio > 0.8 or date_ratio > 0.5 or datetime_ratio > 0.5:
-                    is_numeric_or_date = True
-
-            if not is_numeric_or_date:
-                actual_vals = col_data.dropna().unique()
-                if 2 < len(actual_vals) < 100:
-                    import difflib
-                    similar_pairs = []
-                    for i in range(len(actual_vals)):
-                        for j in range(i + 1, len(actual_vals)):
-                            val1 = str(actual_vals[i])
-                            val2 = str(actual_vals[j])
-                            ratio = difflib.SequenceMatcher(None, val1.lower(), val2.lower()).ratio()
-                            if 0.85 <= ratio < 1.0:
-                                similar_pairs.append((val1, val2, ratio))
-
-                    if similar_pairs:
-                        value_counts = col_data.value_counts()
-                        replace_keys = set()
-                        for val1, val2, ratio in similar_pairs:
-                            if value_counts.get(val1, 0) >= value_counts.get(val2, 0):
-                                replace_keys.add(val2)
-                            else:
-                                replace_keys.add(val1)
-                        affected = int(col_data.isin(replace_keys).sum())
+        # Örnek satırlar ağırlıklı olarak sayı/tarih ise fuzzy kontrolü atlanır
+        if is_text and not stats.sample_is_numeric_or_date(col):
+            similar_pairs = stats.similar_pairs(col)
+            if similar_pairs:
+                affected = int(col_data.isin(stats.fuzzy_replace_keys(col)).sum())
 
-                        issues.append({
-                            "type": "fuzzy_duplicates",
-                            "desc": f"Sütunda birbirine çok benzeyen (yazım hatalı) {len(similar_pairs)} eşleşme bulundu (Örnek: '{similar_pairs[0][0]}' ve '{similar_pairs[0][1]}').",
-                            "affected_cells": affected
-                        })
-                        recommendations.append({
-                            "id": "semantic_merge",
-                            "name": "Benzer Kelimeleri Birleştir (NLP/Fuzzy)",
-                            "desc": "Yazım hataları nedeniyle farklıymış gibi duran benzer kelimeleri tek bir standart kategori (en sık geçen) altında birleştirir.",
-                            "tags": ["Yapay Zeka", "Temiz"]
-                        })
+                issues.append({
+                    "type": "fuzzy_duplicates",
+                    "desc": f"Sütunda birbirine çok benzeyen (yazım hatalı) {len(similar_pairs)} eşleşme bulundu (Örnek: '{similar_pairs[0][0]}' ve '{similar_pairs[0][1]}').",
+                    "affected_cells": affected
+                })
+                recommendations.append({
+                    "id": "semantic_merge",
+                    "name": "Benzer Kelimeleri Birleştir (NLP/Fuzzy)",
+                    "desc": "Yazım hataları nedeniyle farklıymış gibi duran benzer kelimeleri tek bir standart kategori (en sık geçen) altında birleştirir.",
+                    "tags": ["Yapay Zeka", "Temiz"]
+                })
 
         if issues:
             result[col] = {
@@ -177,7 +133,13 @@ def apply_format(df: pd.DataFrame, column: str, method: str) -> tuple[pd.DataFra
     """
     Seçilen format düzeltmesini uygular.
     """
-    df = df.copy()
+    if method in STRING_METHODS:
+        # Boşluk/harf/benzerlik düzeltmeleri benzersiz değerler üzerinde çalışır
+        df, [(detail, changed_count)] = apply_string_steps(df, column, [method])
+        return df, detail, changed_count
+
+    # Bu yöntemler sütunu yalnızca yeniden atar; sütun kopyası gerekmez
+    df = writable_copy(df)
     changed_count = 0
 
     if method == "to_numeric":
@@ -191,79 +153,21 @@ def apply_format(df: pd.DataFrame, column: str, method: str) -> tuple[pd.DataFra
     elif method == "to_datetime":
         if pd.api.types.is_datetime64_any_dtype(df[column]):
             changed_count = 0
+            detail = f"{column} sütunu tarih tipine dönüştürüldü."
         else:
             changed_count = int(df[column].notna().sum())
-        df[column] = pd.to_datetime(df[column], errors='coerce', dayfirst=True)
-        detail = f"{column} sütunu tarih tipine dönüştürüldü."
-
-    elif method == "strip_whitespace":
-        has_whitespace = df[column].apply(lambda x: x.strip() != x if isinstance(x, str) else False)
-        changed_count = int(has_whitespace.sum())
-        df[column] = df[column].apply(lambda x: x.strip() if isinstance(x, str) else x)
-        detail = f"{column} sütunundaki baş/son boşluklar temizlendi."
-
-    elif method == "normalize_case":
-        changed_count = int(df[column].apply(lambda x: x.lower() != x if isinstance(x, str) else False).sum())
-        df[column] = df[column].str.lower()
-        detail = f"{column} sütunu küçük harfe dönüştürüldü."
-
-    elif method == "semantic_merge":
-        # Check if the column is numeric-like or date-like to avoid merging
-        col_data = df[column].dropna()
-        is_numeric_or_date = False
-        if len(col_data) > 0:
-            sample_data = col_data.head(100)
-            numeric_convertible = pd.to_numeric(sample_data, errors='coerce').notna().sum()
-            numeric_ratio = numeric_convertible / len(sample_data)
-
-            date_patterns = [
-                r'\d{4}-\d{2}-\d{2}',
-                r'\d{2}/\d{2}/\d{4}',
-                r'\d{2}\.\d{2}\.\d{4}',
-                r'\d{4}/\d{2}/\d{2}',
-            ]
-            date_match_count = 0
-            for pattern in date_patterns:
-                date_match_count += sample_data.astype(str).str.match(pattern).sum()
-            date_ratio = float(date_match_count) / len(sample_data)
-
-            datetime_convertible = pd.to_datetime(sample_data, errors='coerce', dayfirst=True).notna().sum()
-            datetime_ratio = datetime_convertible / len(sample_data)
-
-            if numeric_ratio > 0.8 or date_ratio > 0.5 or datetime_ratio > 0.5:
-                is_numeric_or_date = True
-
-        if is_numeric_or_date:
-            changed_count = 0
-            detail = f"{column} sütunu tarih veya sayısal veri içerdiği için benzerlik birleştirmesi atlandı."
-        else:
-            # En sık geçen kelimeye (mode) veya ilkine birleştirme yapacağız
-            actual_vals = df[column].dropna().unique()
-            import difflib
-
-            value_counts = df[column].value_counts()
-            replace_map = {}
-
-            for i in range(len(actual_vals)):
-                for j in range(i + 1, len(actual_vals)):
-                    val1 = str(actual_vals[i])
-                    val2 = str(actual_vals[j])
-                    ratio = difflib.SequenceMatcher(None, val1.lower(), val2.lower()).ratio()
-                    if 0.85 <= ratio < 1.0:
-                        # Keep the one that is more frequent
-                        if value_counts.get(val1, 0) >= value_counts.get(val2, 0):
-                            replace_map[val2] = val1
-                        else:
-                            replace_map[val1] = val2
-
-            mapped_count = len(replace_map)
-            if mapped_count > 0:
-                changed_count = int(df[column].isin(replace_map.keys()).sum())
-                df[column] = df[column].replace(replace_map)
-                detail = f"{column} sütununda birbirine benzeyen (yazım hatalı) kelimeler {mapped_count} kez ana kategoriyle birleştirildi."
-            else:
-                changed_count = 0
-                detail = f"{column} sütununda birleştirilecek kelime bulunamadı."
+            df[column], report = parse_dates(df[column])
+            parts = [f"{fmt}: {count}" for fmt, count in report["formats"].items()]
+            if report["inferred"]:
+                parts.append(f"diğer: {report['inferred']}")
+            detail = f"{column} sütunu tarih tipine dönüştürüldü"
+            if parts:
+                detail += f" ({', '.join(parts)})"
+            detail += "."
+            if report["timezone"]:
+                detail += " Değerler saat dilimi bilgisi içerdiği için saat dilimleri korundu."
+            if report["coerced"]:
+                detail += f" {report['coerced']} hücre tarihe çevrilemediği için NaT yapıldı."
 
     else:
         raise ValueError(f"Bilinmeyen yöntem: {method}")
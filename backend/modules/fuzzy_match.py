@@ -0,0 +1,166 @@
+import difflib
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+try:
+    from rapidfuzz.distance import Indel
+except ImportError:  # rapidfuzz opsiyonel; yoksa yalnızca difflib ile doğrulanır
+    Indel = None
+
+DEFAULT_RATIO = 0.85
+# Aday çiftlerin seyrek matris çarpımıyla üretildiği satır bloğu
+FUZZY_BLOCK_ROWS = 512
+
+
+def _min_matches(len_a, len_b, ratio: float):
+    # difflib oranı 2*M/(la+lb); oran >= ratio için gereken en az eşleşen karakter
+    return np.ceil(ratio * (len_a + len_b) / 2 - 1e-9).astype(np.int64)
+
+
+def _lengths_compatible(len_a, len_b, ratio: float):
+    return _min_matches(len_a, len_b, ratio) <= np.minimum(len_a, len_b)
+
+
+def _min_shared_bigrams(len_a, len_b, ratio: float):
+    """
+    Oranı >= ratio olan iki dizginin en az kaç ortak bigram (çoklu küme) paylaştığı.
+
+    difflib'in eşleşen blokları sıralı ve birleştirilmiştir; iki blok arasında
+    en az bir eşleşmeyen karakter vardır. Eşleşmeyen karakter sayısı
+    E = la + lb - 2M olduğuna göre uzun dizginin bigramlarından en fazla 2E
+    tanesi blok dışında kalır: ortak bigram >= max(la, lb) - 1 - 2E.
+    """
+    unmatched = len_a + len_b - 2 * _min_matches(len_a, len_b, ratio)
+    return np.maximum(len_a, len_b) - 1 - 2 * unmatched
+
+
+def _bigram_tokens(text: str) -> list:
+    # Tekrarlanan bigramlar sıra numarasıyla ayrılır: küme kesişimi = çoklu küme kesişimi
+    seen = Counter()
+    tokens = []
+    for pos in range(len(text) - 1):
+        gram = text[pos:pos + 2]
+        tokens.append((gram, seen[gram]))
+        seen[gram] += 1
+    return tokens
+
+
+def _incidence(rows: list, n_columns: int) -> sparse.csr_matrix:
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(row) for row in rows])
+    indices = np.fromiter((col for row in rows for col in row), dtype=np.int32, count=indptr[-1])
+    data = np.ones(len(indices), dtype=np.int32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(rows), n_columns))
+
+
+def similar_pairs(values, ratio: float = DEFAULT_RATIO, max_candidates: int = 0, max_pairs: int = 0) -> list:
+    """
+    difflib.SequenceMatcher(None, a.lower(), b.lower()).ratio() değeri
+    [ratio, 1.0) aralığında olan tüm (değer_i, değer_j, oran) çiftlerini i < j
+    sırasıyla döner; sonuçlar eski çift döngüyle birebir aynıdır.
+
+    max_candidates / max_pairs (0 = sınırsız) verilirse, doğrulanan aday ya da
+    bulunan çift sayısı sınıra ulaştığında arama durur ve o ana kadar bulunan
+    çiftler döner.
+
+    Tüm çiftler yerine yalnızca yeterince ortak bigram paylaşan çiftler
+    karşılaştırılır:
+    1. Dizgiler uzunluğa göre sıralanır ve bigram ters indeksi (seyrek
+       satır x bigram matrisi) kurulur. Her satır bloğu, yalnızca uzunluğu uyumlu
+       olabilecek daha kısa dizgilerle çarpılır; çarpım her çiftin ortak bigram
+       sayısını verir.
+    2. Uzunluk sınırını ve ortak bigram alt sınırını geçemeyen çiftler vektörel
+       olarak elenir. Kalanlar (kuruluysa) rapidfuzz Indel benzerliğiyle (LCS
+       tabanlı, difflib oranından her zaman büyük veya eşit) ve son olarak
+       difflib ile doğrulanır.
+    """
+    texts = [str(value) for value in values]
+    lowered = [text.lower() for text in texts]
+    n_values = len(lowered)
+    if n_values < 2:
+        return []
+    lengths = np.array([len(text) for text in lowered], dtype=np.int64)
+
+    order = np.argsort(lengths, kind="stable")
+    sorted_lengths = lengths[order]
+    vocabulary = {}
+    rows = [
+        [vocabulary.setdefault(token, len(vocabulary)) for token in _bigram_tokens(lowered[i])]
+        for i in order
+    ]
+    grams = _incidence(rows, len(vocabulary))
+
+    # Ortak bigram alt sınırı <= 0 olabilen (çok kısa) dizgiler hiç bigram
+    # paylaşmadan da benzer olabilir; bunlar herkesle aday sayılır
+    distinct_lengths = np.unique(lengths)
+    unbounded_lengths = [
+        length for length in distinct_lengths.tolist()
+        if (_min_shared_bigrams(length, distinct_lengths, ratio)[
+            _lengths_compatible(length, distinct_lengths, ratio)] <= 0).any()
+    ]
+    unbounded_pos = np.flatnonzero(np.isin(sorted_lengths, unbounded_lengths))
+
+    pairs = []
+    candidates = 0
+    for start in range(0, n_values, FUZZY_BLOCK_ROWS):
+        stop = min(start + FUZZY_BLOCK_ROWS, n_values)
+        shortest_partner = np.floor(sorted_lengths[start] * ratio / (2 - ratio))
+        lo = int(np.searchsorted(sorted_lengths, shortest_partner, side="left"))
+        shared = (grams[start:stop] @ grams[lo:stop].T).tocoo()
+        left = shared.col.astype(np.int64) + lo
+        right = shared.row.astype(np.int64) + start
+        overlap = shared.data.astype(np.int64)
+        # Her çift, sıralamada sonra gelen satırın bloğunda bir kez üretilir
+        if len(unbounded_pos):
+            block = np.arange(start, stop)
+            in_block = unbounded_pos[(unbounded_pos >= start) & (unbounded_pos < stop)]
+            extra_left = np.concatenate([np.repeat(unbounded_pos, len(block))]
+                                        + [np.arange(row) for row in in_block.tolist()])
+            extra_right = np.concatenate([np.tile(block, len(unbounded_pos))]
+                                         + [np.full(row, row) for row in in_block.tolist()])
+            extra = np.setdiff1d(extra_left * n_values + extra_right, left * n_values + right)
+            left = np.concatenate([left, extra // n_values])
+            right = np.concatenate([right, extra % n_values])
+            overlap = np.concatenate([overlap, np.zeros(len(extra), dtype=np.int64)])
+
+        keep = left < right
+        left, right, overlap = left[keep], right[keep], overlap[keep]
+        # Aday çift başına gereken ortak bigram sayısı; uyumsuz uzunluklar
+        # hiçbir örtüşmeyle geçemez (bellek en uzun değere değil aday sayısına bağlı)
+        len_left, len_right = sorted_lengths[left], sorted_lengths[right]
+        required = np.where(
+            _lengths_compatible(len_left, len_right, ratio),
+            _min_shared_bigrams(len_left, len_right, ratio),
+            np.iinfo(np.int64).max,
+        )
+        keep = np.flatnonzero(overlap >= required)
+        if max_candidates > 0:
+            keep = keep[:max_candidates - candidates]
+        candidates += len(keep)
+
+        for a, b in zip(order[left[keep]].tolist(), order[right[keep]].tolist()):
+            i, j = min(a, b), max(a, b)
+            score = _confirm(lowered[i], lowered[j], ratio)
+            if score is not None:
+                pairs.append((i, j, score))
+                if 0 < max_pairs <= len(pairs):
+                    break
+        if 0 < max_pairs <= len(pairs) or 0 < max_candidates <= candidates:
+            break
+
+    pairs.sort()
+    return [(texts[i], texts[j], score) for i, j, score in pairs]
+
+
+def _confirm(a: str, b: str, ratio: float):
+    """Aday çifti doğrular; benzerse difflib oranını, değilse None döner."""
+    if a == b:
+        return None
+    if Indel is not None and Indel.normalized_similarity(a, b) < ratio - 1e-9:
+        return None
+    score = difflib.SequenceMatcher(None, a, b).ratio()
+    if ratio <= score < 1.0:
+        return score
+    return None
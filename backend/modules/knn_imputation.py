@@ -0,0 +1,98 @@
+import os
+
+import numpy as np
+from sklearn.impute import KNNImputer
+from sklearn.neighbors import NearestNeighbors
+
+KNN_NEIGHBORS = 5
+# Komşu havuzuna alınacak en fazla tam satır; aşılırsa havuz sabit tohumla
+# örneklenir (yaklaşık mod, 0 = sınırsız)
+KNN_APPROX_DONORS = int(os.environ.get("KNN_APPROX_DONORS", "200000"))
+# Komşuları tek seferde sorgulanan eksik satır sayısı (bellek sınırı)
+KNN_CHUNK_ROWS = int(os.environ.get("KNN_CHUNK_ROWS", "10000"))
+KNN_N_JOBS = int(os.environ.get("KNN_N_JOBS", "-1"))
+# Bu boyuta kadar KD ağacı, üstünde Ball ağacı kurulur
+KNN_KD_TREE_MAX_DIMS = 16
+# Desen başına ağaç kurulacak en fazla eksiklik deseni; aşılırsa eksik satırlar
+# tam satırlara uydurulmuş KNNImputer ile doldurulur (0 = her zaman KNNImputer)
+KNN_MAX_PATTERNS = int(os.environ.get("KNN_MAX_PATTERNS", "64"))
+
+
+def knn_impute(values: np.ndarray, targets: list, n_neighbors: int = KNN_NEIGHBORS) -> tuple[np.ndarray, dict]:
+    """
+    values matrisinin targets sütunlarındaki NaN'ları k en yakın komşunun
+    ortalamasıyla doldurur; (doldurulmuş matris, ayar bilgisi) döner.
+
+    Uzaklıklar standartlaştırılmış (z-skoru) öznitelikler üzerinde, satırın
+    dolu olduğu sütunlarda ölçülür. Komşu adayları hiç eksiği olmayan satırlardır:
+    aynı eksiklik desenindeki satırlar için adayların o sütunlara izdüşümü bir
+    KD/Ball ağacına dizinlenir ve eksik satırlar KNN_CHUNK_ROWS'luk parçalarla
+    sorgulanır. Sonuç, standartlaştırılmış veride tam satırlarla kurulmuş
+    KNNImputer'ın (nan_euclidean) sonucuyla aynıdır. Desen sayısı
+    KNN_MAX_PATTERNS'ı aşarsa ağaç kurmak yerine bu KNNImputer aynı parçalarla
+    doğrudan kullanılır. Tam satır sayısı k'dan azsa KNNImputer doğrudan tüm
+    veride çalıştırılır. Hiçbir sütunu dolu olmayan satırlar sütun
+    ortalamasıyla doldurulur.
+    """
+    X = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(X)
+    means = np.nanmean(X, axis=0)
+    scales = np.nanstd(X, axis=0)
+    scales[~(scales > 0)] = 1.0
+    Z = (X - means) / scales
+
+    filled = X.copy()
+    targets = list(targets)
+    donors = np.flatnonzero(~missing.any(axis=1))
+    info = {"mode": "tree", "donors": len(donors), "patterns": 0, "engine": "tree"}
+
+    if len(donors) < n_neighbors:
+        imputed = KNNImputer(n_neighbors=n_neighbors).fit_transform(Z) * scales + means
+        filled[:, targets] = np.where(missing[:, targets], imputed[:, targets], X[:, targets])
+        info["mode"] = "exact"
+        info["engine"] = "knn_imputer"
+        return filled, info
+    if 0 < KNN_APPROX_DONORS < len(donors):
+        donors = np.sort(np.random.default_rng(42).choice(donors, KNN_APPROX_DONORS, replace=False))
+        info["mode"] = "approx"
+        info["donors"] = len(donors)
+
+    rows = np.flatnonzero(missing[:, targets].any(axis=1))
+    if len(rows) == 0:
+        return filled, info
+    patterns, inverse = np.unique(~missing[rows], axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    info["patterns"] = len(patterns)
+    step = max(1, KNN_CHUNK_ROWS)
+
+    if len(patterns) > KNN_MAX_PATTERNS:
+        # Desen başına ağaç kurma maliyeti sorgu kazancını aşar; tam satırlara
+        # uydurulan KNNImputer aynı komşuları kaba kuvvetle bulur
+        info["engine"] = "knn_imputer"
+        imputer = KNNImputer(n_neighbors=n_neighbors).fit(Z[donors])
+        for start in range(0, len(rows), step):
+            chunk = rows[start:start + step]
+            cells = np.ix_(chunk, targets)
+            imputed = imputer.transform(Z[chunk])[:, targets] * scales[targets] + means[targets]
+            filled[cells] = np.where(missing[cells], imputed, X[cells])
+        empty = rows[missing[rows].all(axis=1)]
+        filled[np.ix_(empty, targets)] = means[targets]
+        return filled, info
+
+    for number, pattern in enumerate(patterns):
+        pattern_rows = rows[inverse == number]
+        observed = np.flatnonzero(pattern)
+        fill_cols = [t for t in targets if not pattern[t]]
+        if len(observed) == 0:
+            filled[np.ix_(pattern_rows, fill_cols)] = means[fill_cols]
+            continue
+        algorithm = "kd_tree" if len(observed) <= KNN_KD_TREE_MAX_DIMS else "ball_tree"
+        index = NearestNeighbors(n_neighbors=n_neighbors, algorithm=algorithm, n_jobs=KNN_N_JOBS)
+        index.fit(Z[np.ix_(donors, observed)])
+        donor_values = X[np.ix_(donors, fill_cols)]
+        for start in range(0, len(pattern_rows), step):
+            chunk = pattern_rows[start:start + step]
+            neighbors = index.kneighbors(Z[np.ix_(chunk, observed)], return_distance=False)
+            filled[np.ix_(chunk, fill_cols)] = donor_values[neighbors].mean(axis=1)
+
+    return filled, info
@@ -1,25 +1,50 @@
+import os
+import warnings
+
 import pandas as pd
 import numpy as np
-from sklearn.impute import KNNImputer, SimpleImputer
+from sklearn.impute import SimpleImputer
 from sklearn.experimental import enable_iterative_imputer
 from sklearn.impute import IterativeImputer
 from sklearn.ensemble import ExtraTreesRegressor
+from sklearn.exceptions import ConvergenceWarning
+from backend.modules.column_stats import ColumnStats
+from backend.modules.knn_imputation import KNN_CHUNK_ROWS, KNN_MAX_PATTERNS, KNN_N_JOBS, KNN_NEIGHBORS, knn_impute
+from backend.modules.ownership import writable_copy
+
+# Diğer sayısal sütunlardan öğrenen model tabanlı doldurma yöntemleri
+MODEL_METHODS = ("mice", "knn")
+
+# MICE ayarları. MICE_NEAREST_FEATURES: her sütunun modeline girecek en fazla
+# öznitelik sayısı (sklearn n_nearest_features; hedefle mutlak korelasyonuna
+# göre ağırlıklı seçilir). Varsayılan 0 = tüm sayısal sütunlar; açılırsa geniş
+# tablolarda sonuçlar değişir. MICE_TOL: turlar arası en büyük değişim bu oranın
+# altına inince durulur (varsayılan sklearn'ünki; birden çok eksik sütunda
+# ExtraTrees tahminleri turdan tura oynadığından çoğunlukla MICE_MAX_ITER
+# sınırlar). MICE_N_JOBS: ağaçların paralel kurulduğu iş sayısı (sonucu değiştirmez).
+MICE_ESTIMATORS = 10
+MICE_NEAREST_FEATURES = int(os.environ.get("MICE_NEAREST_FEATURES", "0"))
+MICE_MAX_ITER = int(os.environ.get("MICE_MAX_ITER", "10"))
+MICE_TOL = float(os.environ.get("MICE_TOL", "1e-3"))
+MICE_N_JOBS = int(os.environ.get("MICE_N_JOBS", "-1"))
 
 
-def analyze_missing(df: pd.DataFrame) -> dict:
+def analyze_missing(df: pd.DataFrame, stats: ColumnStats | None = None) -> dict:
     """
     Her sütun için eksik değer analizi yapar ve
     sütun tipine göre hangi yöntemlerin uygun olduğunu önerir.
     """
+    if stats is None:
+        stats = ColumnStats(df)
     result = {}
 
     for col in df.columns:
-        missing_count = int(df[col].isnull().sum())
+        missing_count = stats.missing_count(col)
         if missing_count == 0:
             continue  # Eksik değer yoksa atla
 
-        missing_pct = round(df[col].isnull().mean() * 100, 2)
-        is_numeric = pd.api.types.is_numeric_dtype(df[col])
+        missing_pct = round(missing_count / len(df) * 100, 2)
+        is_numeric = stats.is_numeric(col)
 
         # Sütun tipine göre öneri listesi oluştur
         if is_numeric:
@@ -91,50 +116,15 @@ def apply_missing(df: pd.DataFrame, column: str, method: str) -> tuple[pd.DataFr
     """
     Seçilen yöntemi uygular, güncellenmiş DataFrame ve açıklama döner.
     """
-    df = df.copy()
-
-    if method == "mice":
-        # Yalnızca sayısal sütunları seç, MICE modeli sayısal matris bekler
-        all_numeric = df.select_dtypes(include=[np.number]).columns.tolist()
-        if column not in all_numeric:
-            raise ValueError(f"MICE sadece sayısal sütunlara uygulanabilir. ({column})")
-        if df[column].isnull().all():
-            raise ValueError(f"'{column}' sütunu tamamen boş olduğu için MICE ile tahmin edilemez. Lütfen basit bir doldurma yöntemi seçin.")
-
-        # Sadece tamamen boş olmayan sayısal sütunları dahil et (sklearn'ün sütun silmesini engellemek için)
-        numeric_cols = [c for c in all_numeric if not df[c].isnull().all()]
-
-        missing_mask = df[column].isnull()
-
-        # MICE (Iterative Imputer) ile diğer tüm sayısal değişkenleri kullanarak bu sütunu tahmin et
-        imputer = IterativeImputer(estimator=ExtraTreesRegressor(n_estimators=10, random_state=42), random_state=42, max_iter=10)
-        imputed_data = imputer.fit_transform(df[numeric_cols])
-        col_idx = numeric_cols.index(column)
-        predictions = pd.Series(imputed_data[:, col_idx], index=df.index)
-        df.loc[missing_mask, column] = predictions.loc[missing_mask]
+    if method in MODEL_METHODS:
+        df, [(status, detail)] = apply_model_imputation(df, [column], method)
+        if status == "error":
+            raise ValueError(detail)
+        return df, detail
 
-        detail = (
-            f"{column} sütunundaki {int(missing_mask.sum())} eksik değer MICE "
-            f"(ExtraTrees) modeliyle tahmin edildi."
-        )
-
-    elif method == "knn":
-        all_numeric = df.select_dtypes(include=[np.number]).columns.tolist()
-        if column not in all_numeric:
-            raise ValueError(f"KNN sadece sayısal sütunlara uygulanabilir. ({column})")
-        if df[column].isnull().all():
-            raise ValueError(f"'{column}' sütunu tamamen boş olduğu için KNN ile tahmin edilemez. Lütfen basit bir doldurma yöntemi seçin.")
-
-        # Sadece tamamen boş olmayan sayısal sütunları dahil et
-        numeric_cols = [c for c in all_numeric if not df[c].isnull().all()]
-
-        imputer = KNNImputer(n_neighbors=5)
-        imputed_data = imputer.fit_transform(df[numeric_cols])
-        col_idx = numeric_cols.index(column)
-        df[column] = imputed_data[:, col_idx]
-        detail = f"{column} sütunu KNN Imputer (k=5) ile dolduruldu."
+    df = writable_copy(df, [column])
 
-    elif method == "mean":
+    if method == "mean":
         imputer = SimpleImputer(strategy="mean")
         df[[column]] = imputer.fit_transform(df[[column]])
         detail = f"{column} sütunu ortalama ({round(df[column].mean(), 2)}) ile dolduruldu."
@@ -163,3 +153,104 @@ def apply_missing(df: pd.DataFrame, column: str, method: str) -> tuple[pd.DataFr
         raise ValueError(f"Bilinmeyen yöntem: {method}")
 
     return df, detail
+
+
+def apply_model_imputation(df: pd.DataFrame, columns: list, method: str) -> tuple[pd.DataFrame, list]:
+    """
+    Model tabanlı doldurmayı (MICE/KNN) birden çok sütuna tek bir model
+    uyumuyla uygular.
+
+    Model, tamamen boş olmayan tüm sayısal sütunlar üzerinde bir kez kurulur;
+    istenen her sütun aynı çıktıdan doldurulur. Sayısal olmayan veya tamamen
+    boş sütunlar hata olarak raporlanır, diğerleri etkilenmez. Sonuç, sütunları
+    tek tek doldurmaktan farklıdır: sonraki sütunun modeli öncekinin doldurulmuş
+    değerlerini değil, ortak modelin kendi tahminlerini görür.
+
+    (DataFrame, [(durum, detay), ...]) döner; liste columns sırasındadır ve
+    durum "ok" ya da "error"dur.
+    """
+    df = writable_copy(df, columns)
+    name = "MICE" if method == "mice" else "KNN"
+    all_numeric = df.select_dtypes(include=[np.number]).columns.tolist()
+
+    outcomes = {}
+    for column in columns:
+        if column not in all_numeric:
+            outcomes[column] = ("error", f"{name} sadece sayısal sütunlara uygulanabilir. ({column})")
+        elif df[column].isnull().all():
+            outcomes[column] = ("error", f"'{column}' sütunu tamamen boş olduğu için {name} ile tahmin edilemez. Lütfen basit bir doldurma yöntemi seçin.")
+    targets = [column for column in columns if column not in outcomes]
+    if not targets:
+        return df, [outcomes[column] for column in columns]
+
+    # Sadece tamamen boş olmayan sayısal sütunları dahil et (sklearn'ün sütun silmesini engellemek için)
+    numeric_cols = [c for c in all_numeric if not df[c].isnull().all()]
+    missing_masks = {column: df[column].isnull() for column in targets}
+
+    if method == "mice":
+        # MICE (Iterative Imputer) ile diğer sayısal değişkenleri kullanarak sütunları
+        # tahmin et; MICE_NEAREST_FEATURES açıksa her model en ilişkili sütunları görür
+        nearest = MICE_NEAREST_FEATURES if 0 < MICE_NEAREST_FEATURES < len(numeric_cols) - 1 else None
+        imputer = IterativeImputer(
+            estimator=ExtraTreesRegressor(n_estimators=MICE_ESTIMATORS, random_state=42, n_jobs=MICE_N_JOBS),
+            random_state=42,
+            max_iter=MICE_MAX_ITER,
+            tol=MICE_TOL,
+            n_nearest_features=nearest,
+        )
+        # sklearn, tol ölçütü hiçbir turda sağlanmazsa ConvergenceWarning verir;
+        # son turda sağlanan yakınsama da böylece doğru etiketlenir
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ConvergenceWarning)
+            imputed_data = imputer.fit_transform(df[numeric_cols])
+        converged = not any(issubclass(w.category, ConvergenceWarning) for w in caught)
+    else:
+        # Standartlaştırılmış özniteliklerde, tam satırlar üzerine kurulan ağaçla KNN
+        imputed_data, knn_info = knn_impute(
+            df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan),
+            [numeric_cols.index(column) for column in targets],
+        )
+
+    if method == "mice":
+        if nearest:
+            features = f"sütun başına {nearest}/{len(numeric_cols)} öznitelik"
+        else:
+            features = f"öznitelik sınırlaması kapalı (tüm {len(numeric_cols)} sayısal sütun)"
+        stopped = "yakınsadı" if converged else "yakınsamadı"
+        settings = (
+            f" [Ayarlar: {MICE_ESTIMATORS} ağaç, {features}, "
+            f"{imputer.n_iter_}/{MICE_MAX_ITER} tur ({stopped}, tol={MICE_TOL:g}), n_jobs={MICE_N_JOBS}]"
+        )
+    else:
+        pool = {
+            "tree": "KD/Ball ağacı",
+            "approx": "yaklaşık, örneklenmiş KD/Ball ağacı",
+            "exact": "tam satır yetersiz, KNNImputer",
+        }[knn_info["mode"]]
+        if knn_info["mode"] != "exact" and knn_info["engine"] == "knn_imputer":
+            pool = pool.replace("KD/Ball ağacı", f"KNNImputer, desen sayısı {KNN_MAX_PATTERNS} sınırını aştı")
+        patterns = f", {knn_info['patterns']} eksiklik deseni" if knn_info["mode"] != "exact" else ""
+        settings = (
+            f" [Ayarlar: standartlaştırılmış öznitelikler, {knn_info['donors']} tam satırlık komşu havuzu "
+            f"({pool}){patterns}, parça={KNN_CHUNK_ROWS} satır, n_jobs={KNN_N_JOBS}]"
+        )
+
+    shared = ""
+    if len(targets) > 1:
+        shared = f" (Ortak model: {', '.join(targets)} sütunları tek uyumla dolduruldu.)"
+    for column in targets:
+        col_idx = numeric_cols.index(column)
+        missing_mask = missing_masks[column]
+        if method == "mice":
+            predictions = pd.Series(imputed_data[:, col_idx], index=df.index)
+            df.loc[missing_mask, column] = predictions.loc[missing_mask]
+            detail = (
+                f"{column} sütunundaki {int(missing_mask.sum())} eksik değer MICE "
+                f"(ExtraTrees) modeliyle tahmin edildi."
+            )
+        else:
+            df[column] = imputed_data[:, col_idx]
+            detail = f"{column} sütunundaki {int(missing_mask.sum())} eksik değer KNN (k={KNN_NEIGHBORS}) ile dolduruldu."
+        outcomes[column] = ("ok", detail + settings + shared)
+
+    return df, [outcomes[column] for column in columns]
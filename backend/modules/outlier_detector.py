@@ -1,69 +1,281 @@
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import IsolationForest
-from sklearn.neighbors import LocalOutlierFactor
-from sklearn.cluster import DBSCAN
+from sklearn.neighbors import KDTree
 from sklearn.preprocessing import StandardScaler
 import logging
+import os
+from backend.modules.column_stats import ColumnStats
+from backend.modules.ownership import writable_copy
 
 logger = logging.getLogger(__name__)
 
+# IsolationForest örnekleme modu: bu satır sayısının üzerindeki tablolarda model
+# satır konumuna göre tabakalı bir örneklem üzerinde eğitilir (her ağaç zaten en
+# fazla 256 satır çeker; varsayılan 256 x 100 ağaç). Skorlama tüm tabloda sabit
+# boyutlu parçalarla yapılır.
+ISO_SAMPLE_ROWS = int(os.environ.get("ISO_SAMPLE_ROWS", str(256 * 100)))
+ISO_SCORE_BATCH = int(os.environ.get("ISO_SCORE_BATCH", "65536"))
+ISO_N_JOBS = int(os.environ.get("ISO_N_JOBS", "-1"))
+ISO_RANDOM_STATE = 42
 
-def analyze_outliers(df: pd.DataFrame) -> dict:
+# Bağlamsal (DBSCAN) aykırı değer tespiti: komşuluk sorguları bu bellek bütçesine
+# sığacak satır parçalarıyla yapılır.
+DBSCAN_EPS = 2.5
+DBSCAN_MEMORY_MB = int(os.environ.get("DBSCAN_MEMORY_MB", "256"))
+# Bu satır sayısının üzerinde çekirdekler örneklem üzerinden belirlenir
+DBSCAN_EXACT_ROWS = int(os.environ.get("DBSCAN_EXACT_ROWS", "50000"))
+
+# LOF: komşu indeksi bir kez kurulur, sorgular satır parçalarıyla yapılır. Bu satır
+# sayısının üzerinde komşular tabakalı bir referans örneklemde aranır.
+LOF_EXACT_ROWS = int(os.environ.get("LOF_EXACT_ROWS", "200000"))
+LOF_CHUNK_ROWS = int(os.environ.get("LOF_CHUNK_ROWS", "65536"))
+LOF_THRESHOLD = -1.5
+# sklearn NearestNeighbors varsayılanı; eşit mesafeli komşuların sırası aynı kalsın
+_LOF_LEAF_SIZE = 30
+
+
+def _stratified_positions(n_rows: int, sample_size: int, seed: int) -> np.ndarray:
+    """
+    Satırları eşit genişlikte sample_size dilime böler ve her dilimden rastgele
+    bir satır seçer; sıralı (ör. tarihe göre) dosyalarda tüm bölgeler temsil edilir.
+    """
+    rng = np.random.default_rng(seed)
+    edges = np.linspace(0, n_rows, sample_size + 1)
+    starts = np.floor(edges[:-1]).astype(np.int64)
+    widths = np.floor(edges[1:]).astype(np.int64) - starts
+    return starts + np.floor(rng.random(sample_size) * np.maximum(widths, 1)).astype(np.int64)
+
+
+def _dbscan_chunk_rows(n_features: int, k: int) -> int:
+    # Parça başına sorgu satırı + k komşunun mesafe/indeks dizileri için kaba maliyet
+    row_bytes = 8 * n_features + 16 * k + 64
+    return max(1, DBSCAN_MEMORY_MB * 1024 * 1024 // row_bytes)
+
+
+def _dbscan_core_mask(scaled: np.ndarray, eps: float, min_samples: int) -> np.ndarray:
+    """
+    Bir nokta, kendisi dahil min_samples'ıncı en yakın komşusu eps içindeyse
+    çekirdektir. Yoğun ızgara hücreleri sorgusuz, kalanlar KDTree'de parça
+    parça k-NN sorgusu ile belirlenir; komşu listeleri saklanmaz.
+    """
+    n_rows = len(scaled)
+    if min_samples > n_rows:
+        return np.zeros(n_rows, dtype=bool)
+
+    # Kenarı eps/√d olan ızgara hücresindeki tüm noktalar birbirine eps içindedir:
+    # en az min_samples nokta içeren hücrelerin hepsi çekirdektir.
+    cell_side = eps / np.sqrt(scaled.shape[1])
+    _, cell_ids, cell_counts = np.unique(
+        np.floor(scaled / cell_side).astype(np.int64), axis=0, return_inverse=True, return_counts=True
+    )
+    is_core = cell_counts[cell_ids.ravel()] >= min_samples
+
+    tree = KDTree(scaled)
+    pending = np.flatnonzero(~is_core)
+    chunk = _dbscan_chunk_rows(scaled.shape[1], min_samples)
+    for start in range(0, len(pending), chunk):
+        rows = pending[start:start + chunk]
+        distances, _ = tree.query(scaled[rows], k=min_samples)
+        is_core[rows] = distances[:, -1] <= eps
+    return is_core
+
+
+def _near_core_mask(cores: np.ndarray, points: np.ndarray, eps: float) -> np.ndarray:
+    """Her nokta için en yakın çekirdeğin eps içinde olup olmadığı."""
+    near = np.zeros(len(points), dtype=bool)
+    if len(cores) == 0:
+        return near
+    core_tree = KDTree(cores)
+    chunk = _dbscan_chunk_rows(points.shape[1], 1)
+    for start in range(0, len(points), chunk):
+        nearest, _ = core_tree.query(points[start:start + chunk], k=1)
+        near[start:start + chunk] = nearest[:, 0] <= eps
+    return near
+
+
+def dbscan_noise_mask(scaled: np.ndarray, eps: float, min_samples: int) -> np.ndarray:
+    """
+    sklearn DBSCAN'in gürültü (-1) etiketiyle birebir aynı maskeyi sınırlı bellekle üretir.
+
+    DBSCAN'de bir nokta ancak ne çekirdek ne de bir çekirdeğin eps komşusu ise
+    gürültüdür; küme etiketlerine ve O(n²)'ye varan komşu listelerine gerek yoktur.
+    """
+    if len(scaled) == 0:
+        return np.zeros(0, dtype=bool)
+    is_core = _dbscan_core_mask(scaled, eps, min_samples)
+    noise = ~is_core
+    noise[noise] = ~_near_core_mask(scaled[is_core], scaled[noise], eps)
+    return noise
+
+
+def contextual_outliers(df_num: pd.DataFrame) -> np.ndarray:
+    """
+    Standartlaştırılmış sayısal satırlarda DBSCAN gürültüsü olan satırların maskesi.
+
+    DBSCAN_EXACT_ROWS satıra kadar sonuç sklearn DBSCAN ile aynıdır. Daha büyük
+    tablolarda çekirdekler satır konumuna göre tabakalı bir örneklemde (aynı
+    min_samples = n // 100 kuralıyla) belirlenir ve tüm satırlar en yakın
+    örneklem çekirdeğine göre etiketlenir.
+    """
+    scaled = StandardScaler().fit_transform(df_num)
+    n_rows = len(scaled)
+    if n_rows <= DBSCAN_EXACT_ROWS:
+        # Yüksek boyutlu veride epsilon değerini veri boyutuna göre ayarla
+        return dbscan_noise_mask(scaled, DBSCAN_EPS, max(3, n_rows // 100))
+
+    sample = scaled[_stratified_positions(n_rows, DBSCAN_EXACT_ROWS, ISO_RANDOM_STATE)]
+    sample_cores = sample[_dbscan_core_mask(sample, DBSCAN_EPS, max(3, len(sample) // 100))]
+    logger.info(
+        "DBSCAN örneklem modunda çalıştı (satır=%d, örneklem=%d, çekirdek=%d)",
+        n_rows, len(sample), len(sample_cores),
+    )
+    return ~_near_core_mask(sample_cores, scaled, DBSCAN_EPS)
+
+
+def _neighbors_excluding_self(tree: KDTree, values: np.ndarray, self_positions: np.ndarray, k: int) -> tuple:
+    """
+    Her satırın ağaçtaki k en yakın komşusu; satırın kendisi (ağaçtaki konumu
+    self_positions, ağaçta yoksa -1) sonuçtan çıkarılır. Tekrarlı değerlerde
+    kendisi ilk k+1 içinde çıkmazsa en yakın sonuç atılır (sklearn ile aynı).
+    """
+    n_rows = len(values)
+    distances = np.empty((n_rows, k))
+    indices = np.empty((n_rows, k), dtype=np.int64)
+    for start in range(0, n_rows, LOF_CHUNK_ROWS):
+        stop = min(start + LOF_CHUNK_ROWS, n_rows)
+        dist, ind = tree.query(values[start:stop], k=k + 1)
+        keep = ind != self_positions[start:stop, None]
+        not_found = keep.all(axis=1)
+        in_tree = self_positions[start:stop] >= 0
+        keep[not_found & in_tree, 0] = False
+        keep[not_found & ~in_tree, k] = False
+        indices[start:stop] = ind[keep].reshape(-1, k)
+        distances[start:stop] = dist[keep].reshape(-1, k)
+    return distances, indices
+
+
+def _reachability_density(distances: np.ndarray, indices: np.ndarray, k_distance: np.ndarray) -> np.ndarray:
+    reach_dist = np.maximum(distances, k_distance[indices])
+    # 1e-10: tekrar sayısı n_neighbors'u aşınca NaN oluşmasın (sklearn ile aynı)
+    return 1.0 / (reach_dist.mean(axis=1) + 1e-10)
+
+
+def local_outlier_factor(df_num: pd.DataFrame, n_neighbors: int) -> np.ndarray:
+    """
+    sklearn LocalOutlierFactor.negative_outlier_factor_ ile aynı skorlar.
+
+    Komşu indeksi (KDTree) bir kez kurulur ve LOF_CHUNK_ROWS'luk parçalarla
+    sorgulanır; yalnızca n x k komşu tablosu bellekte tutulur. LOF_EXACT_ROWS
+    üzerindeki tablolarda referans küme tabakalı bir örneklemdir: örneklem
+    sklearn'deki gibi eğitilir, tüm satırlar örnekleme göre (novelty) skorlanır.
+    """
+    values = df_num.to_numpy(dtype=np.float64)
+    n_rows = len(values)
+    if n_rows > LOF_EXACT_ROWS:
+        reference_positions = _stratified_positions(n_rows, LOF_EXACT_ROWS, ISO_RANDOM_STATE)
+    else:
+        reference_positions = np.arange(n_rows)
+    reference = values[reference_positions]
+    k = max(1, min(n_neighbors, len(reference) - 1))
+
+    tree = KDTree(reference, leaf_size=_LOF_LEAF_SIZE)
+    ref_distances, ref_indices = _neighbors_excluding_self(
+        tree, reference, np.arange(len(reference)), k
+    )
+    k_distance = ref_distances[:, k - 1]
+    reference_lrd = _reachability_density(ref_distances, ref_indices, k_distance)
+
+    if n_rows == len(reference):
+        distances, indices, lrd = ref_distances, ref_indices, reference_lrd
+    else:
+        self_positions = np.full(n_rows, -1, dtype=np.int64)
+        self_positions[reference_positions] = np.arange(len(reference))
+        distances, indices = _neighbors_excluding_self(tree, values, self_positions, k)
+        lrd = _reachability_density(distances, indices, k_distance)
+
+    return -(reference_lrd[indices] / lrd[:, None]).mean(axis=1)
+
+
+def isolation_forest_outliers(df_num: pd.DataFrame) -> tuple[np.ndarray, dict]:
+    """
+    IsolationForest ile aykırı satır maskesi (decision_function < 0) üretir.
+    Büyük tablolarda model örneklem üzerinde eğitilir, skorlar parça parça
+    hesaplanır. Dönen sözlük eğitimde kullanılan örneklem boyutunu ve seed'i içerir.
+    """
+    n_rows = len(df_num)
+    values = df_num.to_numpy()
+    if n_rows > ISO_SAMPLE_ROWS:
+        fit_values = values[_stratified_positions(n_rows, ISO_SAMPLE_ROWS, ISO_RANDOM_STATE)]
+    else:
+        fit_values = values
+
+    iso = IsolationForest(contamination="auto", random_state=ISO_RANDOM_STATE, n_jobs=ISO_N_JOBS)
+    iso.fit(fit_values)
+
+    mask = np.empty(n_rows, dtype=bool)
+    for start in range(0, n_rows, ISO_SCORE_BATCH):
+        stop = start + ISO_SCORE_BATCH
+        mask[start:stop] = iso.decision_function(values[start:stop]) < 0
+
+    info = {"sample_size": int(len(fit_values)), "seed": ISO_RANDOM_STATE}
+    return mask, info
+
+
+def analyze_outliers(df: pd.DataFrame, stats: ColumnStats | None = None) -> dict:
     """
     Sayısal sütunlar için IsolationForest ve LOF ile aykırı değer tespiti yapar.
     """
+    if stats is None:
+        stats = ColumnStats(df)
     result = {}
 
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    numeric_cols = stats.numeric_columns()
 
     if len(numeric_cols) == 0:
         return result
 
     # ── IsolationForest (tüm sayısal sütunlara birlikte bakar) ──
     # decision_function < 0 gerçek anomali eşiği, zorla %5 değil
-    df_numeric = df[numeric_cols].dropna()
+    df_numeric = stats.complete_numeric_rows()
+    # Her dedektör df_numeric satırlarıyla hizalı bir boolean maske üretir
+    no_outliers = np.zeros(len(df_numeric), dtype=bool)
 
     if len(df_numeric) > 10:
-        iso = IsolationForest(contamination="auto", random_state=42)
-        iso.fit(df_numeric)
-        iso_scores = iso.decision_function(df_numeric)
-        iso_outlier_indices = df_numeric.index[iso_scores < 0].tolist()
+        iso_mask, iso_sample = isolation_forest_outliers(df_numeric)
     else:
-        iso_outlier_indices = []
+        iso_mask, iso_sample = no_outliers, None
 
     # ── LOF (tüm sayısal sütunlara birlikte bakar) ──
     # negative_outlier_factor_ < -1.5 gerçek anomali eşiği
     if len(df_numeric) > 10:
-        lof = LocalOutlierFactor(n_neighbors=min(5, len(df_numeric) - 1))
-        lof.fit_predict(df_numeric)
-        lof_scores = lof.negative_outlier_factor_
-        lof_outlier_indices = df_numeric.index[lof_scores < -1.5].tolist()
+        lof_mask = local_outlier_factor(df_numeric, n_neighbors=min(5, len(df_numeric) - 1)) < LOF_THRESHOLD
     else:
-        lof_outlier_indices = []
+        lof_mask = no_outliers
 
     # ── DBSCAN (Bağlamsal Yoğunluk Kümeleme - Çok Değişkenli) ──
     if len(df_numeric) > 10:
         try:
-            scaled_data = StandardScaler().fit_transform(df_numeric)
-            # Yüksek boyutlu veride epsilon değerini veri boyutuna göre ayarla
-            dbscan = DBSCAN(eps=2.5, min_samples=max(3, len(df_numeric) // 100))
-            db_labels = dbscan.fit_predict(scaled_data)
-            dbscan_outlier_indices = df_numeric.index[db_labels == -1].tolist()
+            dbscan_mask = contextual_outliers(df_numeric)
         except Exception as e:
             logger.warning("DBSCAN analizi başarısız (dataset boyutu=%d): %s", len(df_numeric), e)
-            dbscan_outlier_indices = []
+            dbscan_mask = no_outliers
     else:
-        dbscan_outlier_indices = []
+        dbscan_mask = no_outliers
 
+    # Sütun başına sayımlar: (dedektör maskesi × dolu hücre matrisi) sütun toplamı
+    notna = df_numeric.notna().to_numpy()
+    detector_counts = {
+        name: pd.Series((mask[:, None] & notna).sum(axis=0), index=numeric_cols)
+        for name, mask in (("iso", iso_mask), ("lof", lof_mask), ("dbscan", dbscan_mask))
+    }
 
     # Her sayısal sütun için sonuçları topla
     for col in numeric_cols:
-        col_data = df[col].dropna()
+        col_data = stats.numeric_values(col)
 
         # IQR yöntemi (tek sütun bazında ek kontrol)
-        Q1 = col_data.quantile(0.25)
-        Q3 = col_data.quantile(0.75)
+        Q1, Q3 = stats.quartiles(col)
         IQR = Q3 - Q1
         iqr_outliers = col_data[(col_data < Q1 - 1.5 * IQR) | (col_data > Q3 + 1.5 * IQR)]
 
@@ -114,9 +326,10 @@ def analyze_outliers(df: pd.DataFrame) -> dict:
 
         result[col] = {
             "iqr_outlier_count": int(len(iqr_outliers)),
-            "iso_outlier_count": int(sum(1 for i in iso_outlier_indices if i in df.index and pd.notna(df.loc[i, col]))),
-            "lof_outlier_count": int(sum(1 for i in lof_outlier_indices if i in df.index and pd.notna(df.loc[i, col]))),
-            "dbscan_outlier_count": int(sum(1 for i in dbscan_outlier_indices if i in df.index and pd.notna(df.loc[i, col]))),
+            "iso_outlier_count": int(detector_counts["iso"][col]),
+            "lof_outlier_count": int(detector_counts["lof"][col]),
+            "dbscan_outlier_count": int(detector_counts["dbscan"][col]),
+            "iso_sample": iso_sample,
             "iqr_bounds": {"lower": round(Q1 - 1.5 * IQR, 2), "upper": round(Q3 + 1.5 * IQR, 2)},
             "recommendations": recommendations,
         }
@@ -128,7 +341,7 @@ def apply_outlier(df: pd.DataFrame, column: str, method: str) -> tuple[pd.DataFr
     """
     Seçilen aykırı değer yöntemini uygular.
     """
-    df = df.copy()
+    df = writable_copy(df, [column])
 
     Q1 = df[column].quantile(0.25)
     Q3 = df[column].quantile(0.75)
@@ -164,12 +377,7 @@ def apply_outlier(df: pd.DataFrame, column: str, method: str) -> tuple[pd.DataFr
     elif method == "dbscan_drop":
         df_num = df.select_dtypes(include=[np.number]).dropna()
         if len(df_num) > 10:
-            from sklearn.preprocessing import StandardScaler
-            from sklearn.cluster import DBSCAN
-            scaled = StandardScaler().fit_transform(df_num)
-            db = DBSCAN(eps=2.5, min_samples=max(3, len(df_num) // 100))
-            db_labels = db.fit_predict(scaled)
-            outlier_idx = df_num.index[db_labels == -1]
+            outlier_idx = df_num.index[contextual_outliers(df_num)]
             before = len(df)
             df = df.drop(index=outlier_idx, errors='ignore')
             dropped = before - len(df)
@@ -182,11 +390,8 @@ def apply_outlier(df: pd.DataFrame, column: str, method: str) -> tuple[pd.DataFr
     elif method == "iso_forest_drop":
         df_num = df.select_dtypes(include=[np.number]).dropna()
         if len(df_num) > 10:
-            from sklearn.ensemble import IsolationForest
-            iso = IsolationForest(contamination="auto", random_state=42)
-            iso.fit(df_num)
-            iso_scores = iso.decision_function(df_num)
-            outlier_idx = df_num.index[iso_scores < 0]
+            iso_mask, _ = isolation_forest_outliers(df_num)
+            outlier_idx = df_num.index[iso_mask]
             before = len(df)
             df = df.drop(index=outlier_idx, errors='ignore')
             dropped = before - len(df)
@@ -0,0 +1,17 @@
+import pandas as pd
+
+
+def writable_copy(df: pd.DataFrame, columns=()) -> pd.DataFrame:
+    """
+    Sütun düzeyinde sahiplikle kopya.
+
+    Dönen DataFrame verisini girdiyle paylaşır (sığ kopya); yalnızca columns
+    listesindeki sütunlar kopyalanır ve yerinde (ör. df.loc[mask, col] = ...)
+    değiştirilebilir. Diğer sütunlar yalnızca tamamen yeniden atanabilir
+    (df[col] = yeni_seri); bu, pandas'ta paylaşılan veriye dokunmaz.
+    Böylece bir adım yalnızca değiştirdiği sütunların belleğini ayırır.
+    """
+    out = df.copy(deep=False)
+    for col in columns:
+        out[col] = df[col].copy()
+    return out
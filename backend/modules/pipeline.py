@@ -1,14 +1,31 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from backend.modules.missing_value import apply_missing
+from backend.modules.missing_value import apply_missing, apply_model_imputation
 from backend.modules.outlier_detector import apply_outlier
 from backend.modules.format_checker import apply_format
+from backend.modules.string_transform import STRING_METHODS, apply_string_steps
 from backend.modules.feature_engineering import apply_feature_engineering
+from backend.modules.planner import plan_pipeline
+
+# Adım başına tepe bellek ölçümü (Linux /proc, ek yük yok); 0 ile kapatılır.
+# Tepe sayacı süreç geneli olduğundan yalnızca süreçte tek başına çalışan
+# adımlar ölçülür (bkz. _start_step_trace)
+PIPELINE_TRACE_MEMORY = os.environ.get("PIPELINE_TRACE_MEMORY", "1") == "1"
+# Farklı sütunların adım gruplarını eşzamanlı çalıştıran iş parçacığı sayısı
+# (1 = sırayla) ve eşzamanlı yürütmenin devreye girdiği en az satır sayısı
+PIPELINE_WORKERS = int(os.environ.get("PIPELINE_WORKERS", str(min(4, os.cpu_count() or 1))))
+PIPELINE_PARALLEL_MIN_ROWS = int(os.environ.get("PIPELINE_PARALLEL_MIN_ROWS", "100000"))
 
 
-def run_pipeline(df: pd.DataFrame, selections: list[dict]) -> dict:
+def run_pipeline(df: pd.DataFrame, selections: list[dict], checkpoints=None) -> dict:
     """
-    Kullanıcının seçtiği önerileri sırayla uygular.
+    Kullanıcının seçtiği önerileri uygular; sonuç sırayla uygulamakla aynıdır.
 
     selections listesi şu formatta olmalı:
     [
@@ -16,91 +33,391 @@ def run_pipeline(df: pd.DataFrame, selections: list[dict]) -> dict:
         {"category": "outlier",  "column": "gelir", "method": "cap"},
         {"category": "format",   "column": "tarih", "method": "to_datetime"},
     ]
-    """
-    logs = []
-    current_df = df.copy()
-    total_outliers_modified = 0
-    total_format_corrected = 0
-
-    for selection in selections:
-        category = selection.get("category")
-        column   = selection.get("column")
-        method   = selection.get("method")
 
-        if column not in current_df.columns:
-            logs.append({
-                "status":    "error",
-                "category":  category,
-                "column":    column,
-                "method":    method,
-                "detail":    f"'{column}' sütunu bulunamadı.",
-                "timestamp": _now(),
-            })
-            continue
+    Seçimler önce planner.plan_pipeline ile planlanır: ardışık satır silme
+    adımları tek süzmede birleşir, aynı sütunun adımları birlikte (ve metin
+    adımları tek eşlemede) çalışır, veriye dokunmayan adımlar atlanır. Art arda
+    seçilmiş MICE/KNN doldurmaları tek model uyumunda birleşir; bu aşamanın
+    sonucu sütunları ayrı modellerle doldurmaktan farklıdır (bkz. planner).
+    Çalıştırılan plan sonuçta "plan" olarak döner; loglar seçim sırasındadır
+    ve her kayıt "step" (seçim sırası) ile "stage" (plan aşaması) içerir.
 
-        try:
-            if category == "missing":
-                current_df, detail = apply_missing(current_df, column, method)
-
-            elif category == "outlier":
-                current_df, detail, count = apply_outlier(current_df, column, method)
-                total_outliers_modified += count
-
-            elif category == "format":
-                current_df, detail, count = apply_format(current_df, column, method)
-                total_format_corrected += count
-
-            elif category == "feature":
-                current_df, detail = apply_feature_engineering(current_df, column, method)
-
-            elif category == "duplicate":
-                before_len = len(current_df)
-                if method == "drop_duplicates":
-                    current_df = current_df.drop_duplicates()
-                    dropped = before_len - len(current_df)
-                    detail = f"{dropped} adet tekrar eden (duplicate) satır silindi."
-                elif method == "keep_duplicates":
-                    detail = "Duplicate satırlar korundu, değişiklik yapılmadı."
-                else:
-                    raise ValueError(f"Bilinmeyen duplicate yöntemi: {method}")
+    Adımlar DataFrame'in tamamını kopyalamaz: her adım yalnızca değiştirdiği
+    sütunları kopyalar (bkz. ownership.writable_copy), dokunulmayan sütunlar
+    girdiyle paylaşılır. Her log kaydı adım sırasında sürecin belleğinin
+    (RSS) başlangıca göre tepe artışını ("peak_memory_mb") içerir; ölçüm
+    yapılamıyorsa ya da adımla eşzamanlı başka bir adım (başka bir pipeline
+    veya iş parçacığı) çalıştıysa None'dır.
 
-            else:
-                raise ValueError(f"Bilinmeyen kategori: {category}")
+    checkpoints (checkpoint_cache.PipelineCheckpoints) verilirse seçimlerin
+    en uzun kayıtlı önekinden devam edilir; yalnızca kalan adımlar çalışır.
+    Bir imputation_batch aşamasını bölen önekler kullanılmaz. Önekin logları önbellekten gelir ve plandaki 0 numaralı "checkpoint"
+    aşamasına bağlanır. Tamamlanan adımlar tam olarak bir seçim öneki olduğunda
+    ve son kayıttan beri en az checkpoints.min_seconds hesaplama yapıldığında
+    ara sonuç kaydedilir.
 
+    Planda art arda gelen, farklı sütunlara ait "column_batch" aşamaları
+    birbirinden bağımsızdır; tabloda en az PIPELINE_PARALLEL_MIN_ROWS satır
+    varsa PIPELINE_WORKERS iş parçacığında eşzamanlı çalışır (bkz.
+    _run_batches_concurrently). Satır silen ve çok sütunlu adımlar (drop,
+    mice, knn, one_hot_encode, duplicate...) engeldir ve tek başına çalışır.
+    """
+    logs = []
+    current_df = df.copy(deep=False)
+    totals = {"outlier": 0, "format": 0}
+    plan = []
+    start = 0
+    fresh_plan = plan_pipeline(selections)
+    if checkpoints is not None:
+        # Ortak modelle doldurulan adımların arasından devam edilmez: kalan
+        # adımlar ayrı modelle doldurulur ve sonuç baştan çalıştırmayla aynı olmaz
+        splits = {
+            index
+            for stage in fresh_plan if stage["kind"] == "imputation_batch"
+            for index in stage["steps"][1:]
+        }
+        cached = checkpoints.load_latest(selections, excluded=splits)
+        if cached is not None:
+            start, current_df, logs, totals = cached
+            plan.append({"kind": "checkpoint", "column": None, "steps": list(range(start))})
+            for entry in logs:
+                entry["stage"] = 0
+    for stage in fresh_plan if start == 0 else plan_pipeline(selections[start:]):
+        plan.append({**stage, "steps": [start + index for index in stage["steps"]]})
 
-            logs.append({
-                "status":    "ok",
-                "category":  category,
-                "column":    column,
-                "method":    method,
-                "detail":    detail,
-                "timestamp": _now(),
-            })
+    completed = start
+    done = set()
+    last_checkpoint = time.perf_counter()
+    for wave in _concurrent_waves(plan):
+        batches = [stage_no for stage_no in wave if plan[stage_no]["kind"] == "column_batch"]
+        if len(batches) > 1 and PIPELINE_WORKERS > 1 and len(current_df) >= PIPELINE_PARALLEL_MIN_ROWS:
+            for stage_no in wave:
+                if plan[stage_no]["kind"] == "noop":
+                    current_df = _run_stage(current_df, stage_no, plan[stage_no], selections, logs, totals)
+            current_df = _run_batches_concurrently(
+                current_df, [(stage_no, plan[stage_no]) for stage_no in batches], selections, logs, totals
+            )
+        else:
+            for stage_no in wave:
+                current_df = _run_stage(current_df, stage_no, plan[stage_no], selections, logs, totals)
 
-        except Exception as e:
-            logs.append({
-                "status":    "error",
-                "category":  category,
-                "column":    column,
-                "method":    method,
-                "detail":    str(e),
-                "timestamp": _now(),
-            })
+        if checkpoints is not None:
+            for stage_no in wave:
+                done.update(plan[stage_no]["steps"])
+            while completed in done:
+                done.discard(completed)
+                completed += 1
+            # Öne alınmış sonraki adımlar varsa tablo hiçbir önekin durumu değildir
+            if not done and time.perf_counter() - last_checkpoint >= checkpoints.min_seconds:
+                logs.sort(key=lambda entry: entry["step"])
+                checkpoints.save(selections, completed, current_df, logs, totals)
+                last_checkpoint = time.perf_counter()
 
+    logs.sort(key=lambda entry: entry["step"])
     before_missing_pct = round(df.isnull().mean().mean() * 100, 2)
     after_missing_pct  = round(current_df.isnull().mean().mean() * 100, 2)
 
     return {
         "cleaned_df":         current_df,
         "logs":               logs,
+        "plan":               [{"stage": n, **stage} for n, stage in enumerate(plan)],
         "before_missing_pct": before_missing_pct,
         "after_missing_pct":  after_missing_pct,
         "applied_count":      len([l for l in logs if l["status"] == "ok"]),
         "error_count":        len([l for l in logs if l["status"] == "error"]),
-        "outlier_count":      total_outliers_modified,
-        "format_errors":      total_format_corrected,
+        "outlier_count":      totals["outlier"],
+        "format_errors":      totals["format"],
     }
 
 
+def _concurrent_waves(plan: list[dict]) -> list[list[int]]:
+    """
+    Aşama numaralarını sırayla yürütülecek dalgalara ayırır: art arda gelen
+    column_batch aşamaları (aralarındaki noop'larla birlikte) tek dalgadır,
+    diğer her aşama kendi dalgasıdır. Checkpoint aşaması atlanır.
+    """
+    waves = []
+    for stage_no, stage in enumerate(plan):
+        if stage["kind"] == "checkpoint":
+            continue
+        joins = stage["kind"] in ("column_batch", "noop") and waves and any(
+            plan[previous]["kind"] == "column_batch" for previous in waves[-1]
+        )
+        if joins:
+            waves[-1].append(stage_no)
+        else:
+            waves.append([stage_no])
+    return waves
+
+
+def _run_stage(current_df: pd.DataFrame, stage_no: int, stage: dict, selections: list[dict], logs: list, totals: dict) -> pd.DataFrame:
+    log = _stage_logger(logs, selections, stage_no)
+    if stage["kind"] == "row_filter":
+        return _run_row_filter(current_df, stage, selections, log, totals)
+    if stage["kind"] == "column_batch":
+        return _run_column_batch(current_df, stage, selections, log, totals)
+    if stage["kind"] == "imputation_batch":
+        return _run_imputation_batch(current_df, stage, selections, log)
+    index = stage["steps"][0]
+    if stage["kind"] == "noop" and selections[index].get("column") in current_df.columns:
+        # Sonuç veriden bağımsız: adım yalnızca log metni için boş tabloda çalışır
+        _run_step(current_df.iloc[:0], index, selections, log, {"outlier": 0, "format": 0})
+        return current_df
+    return _run_step(current_df, index, selections, log, totals)
+
+
+def _run_batches_concurrently(current_df: pd.DataFrame, stages: list, selections: list[dict], logs: list, totals: dict) -> pd.DataFrame:
+    """
+    Farklı sütunların column_batch aşamalarını iş parçacığı havuzunda çalıştırır.
+
+    Her aşama tablonun kendi sığ kopyasında çalışır (sütun-yerel adımlar
+    yalnızca kendi sütununu yeniden atar, paylaşılan veriye yazmaz); loglar ve
+    sayaçlar aşama başına toplanır. Sonunda her aşamanın sütunu plan sırasıyla
+    tabloya yazılır, loglar çağıranda seçim sırasına dizilir. NumPy/pandas/
+    sklearn ağır kısımlarda GIL'i bırakır; adım başına bellek ölçümü süreç
+    geneli olduğundan eşzamanlı adımlarda birbirini etkiler.
+    """
+    def run(stage_no, stage, frame):
+        stage_logs, stage_totals = [], {"outlier": 0, "format": 0}
+        log = _stage_logger(stage_logs, selections, stage_no)
+        return _run_column_batch(frame, stage, selections, log, stage_totals), stage_logs, stage_totals
+
+    frames = [current_df.copy(deep=False) for _ in stages]
+    workers = min(PIPELINE_WORKERS, len(stages))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pipeline") as pool:
+        futures = [pool.submit(run, stage_no, stage, frame) for (stage_no, stage), frame in zip(stages, frames)]
+        results = [future.result() for future in futures]
+
+    merged = current_df.copy(deep=False)
+    for (_, stage), frame, (out, stage_logs, stage_totals) in zip(stages, frames, results):
+        if out is not frame:
+            merged[stage["column"]] = out[stage["column"]]
+        logs.extend(stage_logs)
+        for key, value in stage_totals.items():
+            totals[key] += value
+    return merged
+
+
+def _stage_logger(logs: list, selections: list[dict], stage_no: int):
+    def log(index: int, status: str, detail: str, peak_memory_mb=None):
+        selection = selections[index]
+        logs.append({
+            "status":    status,
+            "category":  selection.get("category"),
+            "column":    selection.get("column"),
+            "method":    selection.get("method"),
+            "detail":    detail,
+            "timestamp": _now(),
+            "peak_memory_mb": peak_memory_mb,
+            "step":      index,
+            "stage":     stage_no,
+        })
+    return log
+
+
+def _run_step(current_df: pd.DataFrame, index: int, selections: list[dict], log, totals: dict) -> pd.DataFrame:
+    """Tek bir seçimi uygular ve loglar; hata olursa tablo değişmeden döner."""
+    selection = selections[index]
+    category = selection.get("category")
+    column   = selection.get("column")
+    method   = selection.get("method")
+
+    if column not in current_df.columns:
+        log(index, "error", f"'{column}' sütunu bulunamadı.")
+        return current_df
+
+    trace = _start_step_trace()
+    try:
+        if category == "missing":
+            current_df, detail = apply_missing(current_df, column, method)
+
+        elif category == "outlier":
+            current_df, detail, count = apply_outlier(current_df, column, method)
+            totals["outlier"] += count
+
+        elif category == "format":
+            current_df, detail, count = apply_format(current_df, column, method)
+            totals["format"] += count
+
+        elif category == "feature":
+            current_df, detail = apply_feature_engineering(current_df, column, method)
+
+        elif category == "duplicate":
+            before_len = len(current_df)
+            if method == "drop_duplicates":
+                current_df = current_df.drop_duplicates()
+                dropped = before_len - len(current_df)
+                detail = f"{dropped} adet tekrar eden (duplicate) satır silindi."
+            elif method == "keep_duplicates":
+                detail = "Duplicate satırlar korundu, değişiklik yapılmadı."
+            else:
+                raise ValueError(f"Bilinmeyen duplicate yöntemi: {method}")
+
+        else:
+            raise ValueError(f"Bilinmeyen kategori: {category}")
+
+        status = "ok"
+
+    except Exception as e:
+        status, detail = "error", str(e)
+
+    log(index, status, detail, _finish_step_trace(trace))
+    return current_df
+
+
+def _run_row_filter(current_df: pd.DataFrame, stage: dict, selections: list[dict], log, totals: dict) -> pd.DataFrame:
+    """
+    Ardışık satır silme adımları: her adım yalnızca kendi sütununun kalan
+    satırlarında çalışır ve kalan satır konumlarını daraltır; tablo en sonda
+    bir kez süzülür.
+    """
+    positions = np.arange(len(current_df))
+    for index in stage["steps"]:
+        selection = selections[index]
+        column = selection.get("column")
+        if column not in current_df.columns:
+            log(index, "error", f"'{column}' sütunu bulunamadı.")
+            continue
+
+        trace = _start_step_trace()
+        try:
+            remaining = current_df[column].iloc[positions].to_frame()
+            remaining.index = positions
+            if selection.get("category") == "missing":
+                kept, detail = apply_missing(remaining, column, selection.get("method"))
+            else:
+                kept, detail, count = apply_outlier(remaining, column, selection.get("method"))
+                totals["outlier"] += count
+            positions = kept.index.to_numpy()
+            status = "ok"
+        except Exception as e:
+            status, detail = "error", str(e)
+        log(index, status, detail, _finish_step_trace(trace))
+
+    if len(positions) < len(current_df):
+        current_df = current_df.iloc[positions]
+    return current_df
+
+
+def _run_column_batch(current_df: pd.DataFrame, stage: dict, selections: list[dict], log, totals: dict) -> pd.DataFrame:
+    """
+    Aynı sütunun adımlarını art arda çalıştırır; ardışık metin adımları tek
+    eşlemede birleşir.
+    """
+    column = stage["column"]
+    steps = stage["steps"]
+    if column not in current_df.columns:
+        for index in steps:
+            log(index, "error", f"'{column}' sütunu bulunamadı.")
+        return current_df
+
+    position = 0
+    while position < len(steps):
+        run = [steps[position]]
+        while (
+            selections[run[0]].get("method") in STRING_METHODS
+            and position + len(run) < len(steps)
+            and selections[steps[position + len(run)]].get("method") in STRING_METHODS
+        ):
+            run.append(steps[position + len(run)])
+
+        if len(run) > 1:
+            trace = _start_step_trace()
+            try:
+                current_df, results = apply_string_steps(current_df, column, [selections[i].get("method") for i in run])
+            except Exception:
+                _finish_step_trace(trace)  # adımlar tek tek uygulanır, hatalar adım bazında loglanır
+            else:
+                peak_memory_mb = _finish_step_trace(trace)
+                for index, (detail, count) in zip(run, results):
+                    totals["format"] += count
+                    log(index, "ok", detail, peak_memory_mb)
+                position += len(run)
+                continue
+
+        current_df = _run_step(current_df, steps[position], selections, log, totals)
+        position += 1
+
+    return current_df
+
+
+def _run_imputation_batch(current_df: pd.DataFrame, stage: dict, selections: list[dict], log) -> pd.DataFrame:
+    """Birden çok sütunun MICE/KNN doldurmasını tek model uyumuyla yapar; her sütun ayrı loglanır."""
+    steps = []
+    for index in stage["steps"]:
+        column = selections[index].get("column")
+        if column in current_df.columns:
+            steps.append(index)
+        else:
+            log(index, "error", f"'{column}' sütunu bulunamadı.")
+    if not steps:
+        return current_df
+
+    trace = _start_step_trace()
+    columns = [selections[index].get("column") for index in steps]
+    try:
+        current_df, outcomes = apply_model_imputation(current_df, columns, selections[steps[0]].get("method"))
+    except Exception as e:
+        outcomes = [("error", str(e))] * len(steps)
+    peak_memory_mb = _finish_step_trace(trace)
+    for index, (status, detail) in zip(steps, outcomes):
+        log(index, status, detail, peak_memory_mb)
+    return current_df
+
+
+# Süreçte çalışan izlenen adım sayısı ve ölçülen adımla çakışma olup olmadığı
+_trace_lock = threading.Lock()
+_trace_state = {"running": 0, "overlapped": False}
+
+
+def _start_step_trace():
+    """
+    Adım ölçümünü başlatır; ölçüm kapalıysa None döner.
+
+    Tepe RSS sayacı (VmHWM) süreç geneli olduğundan yalnızca süreçte başka
+    izlenen adım çalışmıyorsa sıfırlanır ve o anki RSS (KB) başlangıç alınır.
+    Aksi halde sayaç başkasının ölçümünü bozmamak için sıfırlanmaz ve çalışan
+    ölçüm çakışmış sayılır. Her çağrı _finish_step_trace ile kapatılmalıdır.
+    """
+    if not PIPELINE_TRACE_MEMORY:
+        return None
+    with _trace_lock:
+        _trace_state["running"] += 1
+        if _trace_state["running"] > 1:
+            _trace_state["overlapped"] = True
+            return {"baseline": None}
+        _trace_state["overlapped"] = False
+        try:
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+            return {"baseline": _proc_status_kb("VmRSS")}
+        except (OSError, ValueError):
+            return {"baseline": None}
+
+
+def _finish_step_trace(trace):
+    """Adım ölçümünü kapatır; tek başına çalışan adımın tepe bellek artışını (MB) döner."""
+    if trace is None:
+        return None
+    with _trace_lock:
+        _trace_state["running"] -= 1
+        overlapped = _trace_state["overlapped"]
+    if trace["baseline"] is None or overlapped:
+        return None
+    try:
+        peak = _proc_status_kb("VmHWM")
+    except (OSError, ValueError):
+        return None
+    return round(max(peak - trace["baseline"], 0) / 1024, 2)
+
+
+def _proc_status_kb(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise ValueError(field)
+
+
 def _now() -> str:
     return datetime.now().strftime("%H:%M:%S")
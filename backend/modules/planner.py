@@ -0,0 +1,89 @@
+from backend.modules.missing_value import MODEL_METHODS
+from backend.modules.string_transform import STRING_METHODS
+
+# Yalnızca kendi sütununu okuyup yazan, satır kümesini ve sütun listesini
+# değiştirmeyen adımlar. Farklı sütunlardaki bu adımlar sırası değişse de aynı
+# sonucu verir.
+COLUMN_LOCAL_METHODS = {
+    "missing": {"mean", "median", "mode", "constant"},
+    "outlier": {"cap", "median_replace", "percentile_cap", "keep"},
+    "format": {"to_numeric", "to_datetime", *STRING_METHODS},
+    "feature": {"label_encode", "log_transform", "standard_scale", "minmax_scale"},
+}
+# Satır silen ve yüklemi yalnızca kendi sütununa bakan adımlar (tek maskede birleşir)
+ROW_FILTER_METHODS = {("missing", "drop"), ("outlier", "drop_outliers")}
+# Veriye dokunmayan ve sütun durumuna bakmayan adımlar
+NOOP_METHODS = {("feature", "skip"), ("duplicate", "keep_duplicates")}
+
+
+def plan_pipeline(selections: list[dict]) -> list[dict]:
+    """
+    Seçimleri sırayla çalıştırmakla aynı sonucu veren bir yürütme planına çevirir.
+
+    Plan aşamalardan (stage) oluşur; her aşama {"kind", "column", "steps"}
+    sözlüğüdür ve "steps" selections içindeki sıra numaralarıdır:
+    - "column_batch": iki engel arasındaki, aynı sütuna ait sütun-yerel
+      adımlar (COLUMN_LOCAL_METHODS) ilk göründükleri yerde tek grupta toplanır.
+    - "row_filter": ardışık satır silme adımları (ROW_FILTER_METHODS); her yüklem
+      bir önceki adımdan kalan satırlarda hesaplanır, tablo bir kez süzülür.
+    - "noop": veriyi değiştirmeyen adımlar (NOOP_METHODS); yalnızca loglanır.
+    - "imputation_batch": art arda gelen, aynı yöntemli (MICE ya da KNN) ve
+      farklı sütunlu model tabanlı doldurmalar; model bir kez kurulur ve tüm
+      sütunlar ondan doldurulur (missing_value.apply_model_imputation).
+    - "single": diğer tüm adımlar (MICE/KNN, yeni sütun üretenler, duplicate
+      silme...). Bunlar ve satır filtreleri engeldir; hiçbir adım bir engelin
+      öbür tarafına taşınmaz.
+
+    Satır filtreleri MICE/KNN gibi model tabanlı doldurmaların önüne alınmaz:
+    modelin gördüğü satırlar değişeceği için sonuç sıralı yürütmeyle aynı olmaz.
+    Tek bilinçli istisna imputation_batch'tir: ortak modelin tahminleri,
+    sütunları sırayla ayrı modellerle doldurmanın sonucundan farklıdır.
+    """
+    plan = []
+    batches = {}
+    open_filter = None
+    open_imputation = None
+
+    for index, selection in enumerate(selections):
+        category = selection.get("category")
+        column = selection.get("column")
+        method = selection.get("method")
+
+        if category == "missing" and method in MODEL_METHODS:
+            batches = {}
+            open_filter = None
+            if open_imputation is not None and open_imputation[1] == method and column not in open_imputation[2]:
+                open_imputation[0]["kind"] = "imputation_batch"
+                open_imputation[0]["steps"].append(index)
+                open_imputation[2].add(column)
+            else:
+                stage = {"kind": "single", "column": column, "steps": [index]}
+                plan.append(stage)
+                open_imputation = (stage, method, {column})
+            continue
+        open_imputation = None
+
+        if (category, method) in NOOP_METHODS:
+            plan.append({"kind": "noop", "column": column, "steps": [index]})
+            continue
+
+        if method in COLUMN_LOCAL_METHODS.get(category, ()):
+            open_filter = None
+            if column in batches:
+                batches[column]["steps"].append(index)
+            else:
+                batches[column] = {"kind": "column_batch", "column": column, "steps": [index]}
+                plan.append(batches[column])
+            continue
+
+        batches = {}
+        if (category, method) in ROW_FILTER_METHODS:
+            if open_filter is None:
+                open_filter = {"kind": "row_filter", "column": None, "steps": []}
+                plan.append(open_filter)
+            open_filter["steps"].append(index)
+        else:
+            open_filter = None
+            plan.append({"kind": "single", "column": column, "steps": [index]})
+
+    return plan
@@ -0,0 +1,78 @@
+import pandas as pd
+import numpy as np
+
+
+def column_stats(df: pd.DataFrame) -> dict:
+    """
+    Tüm sütunların temel istatistiklerini birkaç vektörel geçişte hesaplar.
+
+    - Eksik sayıları tek bir df.isna().sum() ile,
+    - Benzersiz sayıları tek bir df.nunique() ile,
+    - Sayısal blok tek bir float64 matrise çevrilip sütun bazında bir kez
+      sıralanır; min/max/çeyrekler/medyan bu sıralı matristen okunur.
+
+    Her sütun için {"dtype", "is_numeric", "missing_count", "unique_count"}
+    ve sayısal sütunlarda ek olarak {"count", "mean", "median", "std",
+    "min", "max", "q1", "q3", "values"} döner. "values" sütunun sıralı,
+    eksiksiz değerleridir (histogram için).
+    """
+    missing = df.isna().sum()
+    unique = df.nunique(dropna=True)
+
+    stats = {}
+    numeric_cols = []
+    for position, col in enumerate(df.columns):
+        series = df.iloc[:, position]
+        is_numeric = pd.api.types.is_numeric_dtype(series)
+        stats[col] = {
+            "dtype": str(series.dtype),
+            "is_numeric": is_numeric,
+            "missing_count": int(missing.iloc[position]),
+            "unique_count": int(unique.iloc[position]),
+        }
+        if is_numeric:
+            numeric_cols.append((position, col))
+
+    if not numeric_cols:
+        return stats
+
+    positions = [position for position, _ in numeric_cols]
+    block = df.iloc[:, positions].to_numpy(dtype=np.float64, na_value=np.nan)
+    counts = (~np.isnan(block)).sum(axis=0)
+    ordered = np.sort(block, axis=0)  # NaN'lar sona gider
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sums = np.nansum(block, axis=0)
+        means = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+        sq_dev = np.nansum((block - means) ** 2, axis=0)
+        stds = np.where(counts > 1, np.sqrt(sq_dev / np.maximum(counts - 1, 1)), np.nan)
+
+    for j, (_, col) in enumerate(numeric_cols):
+        n = int(counts[j])
+        values = ordered[:n, j]
+        info = stats[col]
+        info["count"] = n
+        info["values"] = values
+        if n == 0:
+            info.update({"mean": None, "median": None, "std": None,
+                         "min": None, "max": None, "q1": None, "q3": None})
+            continue
+        info.update({
+            "mean": float(means[j]),
+            "median": _sorted_quantile(values, 0.5),
+            "std": float(stds[j]),
+            "min": float(values[0]),
+            "max": float(values[-1]),
+            "q1": _sorted_quantile(values, 0.25),
+            "q3": _sorted_quantile(values, 0.75),
+        })
+
+    return stats
+
+
+def _sorted_quantile(values: np.ndarray, q: float) -> float:
+    # pandas'ın varsayılanı olan doğrusal interpolasyon
+    pos = q * (len(values) - 1)
+    lo = int(np.floor(pos))
+    hi = min(lo + 1, len(values) - 1)
+    return float(values[lo] + (pos - lo) * (values[hi] - values[lo]))
@@ -1,20 +1,53 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 from backend.modules.missing_value import analyze_missing
 from backend.modules.outlier_detector import analyze_outliers
 from backend.modules.format_checker import analyze_format
 from backend.modules.feature_engineering import analyze_features
+from backend.modules.column_stats import ColumnStats
+
+# Analizörlerin eşzamanlı çalıştırılacağı iş parçacığı sayısı. 1 verilirse
+# analizler sırayla çalışır.
+ANALYSIS_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", str(min(5, os.cpu_count() or 1))))
+
+
+def _count_duplicates(df: pd.DataFrame, stats: ColumnStats) -> int:
+    return stats.duplicate_count()
+
+
+def _run_analyzers(df: pd.DataFrame, stats: ColumnStats) -> tuple:
+    """
+    Birbirinden bağımsız analizörleri aynı DataFrame üzerinde çalıştırır.
+    Analizörler veriyi değiştirmediği için DataFrame ve ortak ColumnStats
+    iş parçacıkları arasında kopyalanmadan paylaşılır; NumPy/pandas/sklearn
+    ağır kısımlarda GIL'i bırakır.
+    """
+    analyzers = (analyze_missing, analyze_outliers, analyze_format, analyze_features, _count_duplicates)
+    workers = min(ANALYSIS_WORKERS, len(analyzers))
+    if workers <= 1:
+        return tuple(analyzer(df, stats) for analyzer in analyzers)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis") as pool:
+        futures = [pool.submit(analyzer, df, stats) for analyzer in analyzers]
+        return tuple(future.result() for future in futures)
 
 
-def generate_recommendations(df: pd.DataFrame) -> dict:
+def generate_recommendations(df: pd.DataFrame, stats: ColumnStats | None = None) -> dict:
     """
     Tüm analiz modüllerini çalıştırır ve
-    birleşik öneri raporu üretir.
+    birleşik öneri raporu üretir. Tüm analizörler aynı ColumnStats'ı paylaşır.
     """
+    if stats is None:
+        stats = ColumnStats(df)
 
-    missing_analysis  = analyze_missing(df)
-    outlier_analysis  = analyze_outliers(df)
-    format_analysis   = analyze_format(df)
-    feature_analysis  = analyze_features(df)
+    (
+        missing_analysis,
+        outlier_analysis,
+        format_analysis,
+        feature_analysis,
+        duplicate_count,
+    ) = _run_analyzers(df, stats)
 
     recommendations = []
 
@@ -80,7 +113,6 @@ def generate_recommendations(df: pd.DataFrame) -> dict:
         })
 
     # ── Duplicate satır önerileri ──
-    duplicate_count = int(df.duplicated().sum())
     if duplicate_count > 0:
         recommendations.append({
             "id":       "duplicate_rows",
@@ -110,6 +142,8 @@ def generate_recommendations(df: pd.DataFrame) -> dict:
         "outlier_count":   len(outlier_analysis),
         "format_count":    len(format_analysis),
         "duplicate_count": duplicate_count,
+        # IsolationForest'in eğitildiği örneklem (tekrar üretilebilirlik için)
+        "iso_sample":      next((info["iso_sample"] for info in outlier_analysis.values()), None),
         "recommendations": recommendations,
     }
 
@@ -0,0 +1,523 @@
+import math
+import os
+import shutil
+import tempfile
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from backend.modules.file_reader import DEFAULT_CHUNKSIZE, merge_dtypes, read_file_chunks
+from backend.modules.format_checker import apply_format
+from backend.modules.missing_value import apply_missing
+
+# Akış modunda okunan parça boyutu (satır)
+STREAM_CHUNK_ROWS = int(os.environ.get("STREAM_CHUNK_ROWS", str(DEFAULT_CHUNKSIZE)))
+# Sıra istatistikleri seçilirken diske yazılmış değerlerin okunduğu blok (değer sayısı)
+STREAM_SPILL_BLOCK = 1 << 20
+
+# Parametresi olmayan, her satırı yalnızca kendi değerine göre işleyen yöntemler
+ROW_LOCAL_METHODS = {
+    ("missing", "constant"), ("missing", "drop"),
+    ("format", "to_numeric"), ("format", "strip_whitespace"), ("format", "normalize_case"),
+}
+# Veriye dokunmayan yöntemler
+NOOP_METHODS = {("feature", "skip"), ("duplicate", "keep_duplicates")}
+# Parametreleri sütunun akış istatistiklerinden hesaplanan yöntemler ve
+# gereken sıra istatistikleri (oranlar; "median" = ortanca)
+FITTED_METHODS = {
+    ("missing", "mean"): (),
+    ("missing", "median"): ("median",),
+    ("outlier", "cap"): (0.25, 0.75),
+    ("outlier", "drop_outliers"): (0.25, 0.75),
+    ("outlier", "median_replace"): (0.25, 0.75, "median"),
+    ("outlier", "percentile_cap"): (0.05, 0.95),
+    ("outlier", "keep"): (),  # değiştirmez; bellek içinde olduğu gibi sayısal sütun ister
+    ("feature", "log_transform"): (),
+    ("feature", "standard_scale"): (),
+    ("feature", "minmax_scale"): (),
+}
+# Çıktı dtype'ı veriye bağlı satır-yerel yöntemler (ör. sayısal sütunu sabitle
+# doldurmak, yalnızca eksik olan parçaları object yapar). Sonuç dtype'ı bir
+# istatistik geçişinde parça tiplerinin birleşimi olarak belirlenir.
+DTYPE_FITTED_METHODS = {("missing", "constant"), ("format", "to_numeric")}
+STREAMABLE_METHODS = ROW_LOCAL_METHODS | NOOP_METHODS | set(FITTED_METHODS)
+_ROW_FILTERS = {("missing", "drop"), ("outlier", "drop_outliers")}
+
+
+class _StepFailed(Exception):
+    """Bir adım geçiş ortasında hata verdi; geçiş o adım devre dışıyken baştan alınır."""
+
+
+def run_pipeline_streaming(
+    file_path: str,
+    selections: list[dict],
+    output_path: str,
+    chunksize: int = STREAM_CHUNK_ROWS,
+    dialect: dict | None = None,
+    sheet_name: str | None = None,
+) -> dict:
+    """
+    Seçimleri dosyayı belleğe almadan, parça parça uygular ve sonucu
+    output_path'e CSV olarak yazar. Bellek kullanımı parça boyutuyla sınırlıdır.
+
+    Yalnızca parametreleri bilindiğinde satır-yerel olan yöntemler desteklenir
+    (STREAMABLE_METHODS); MICE/KNN, DBSCAN, Isolation Forest, tekrar silme,
+    yeni sütun üreten ve tüm sütunun benzersiz değerlerine bakan yöntemler
+    tüm veriyi gerektirdiği için ValueError ile reddedilir.
+
+    İki aşamada çalışır:
+    1. İstatistik geçişleri: ilk geçiş sütun tiplerini dosya geneline göre
+       birleştirir (read_file ile aynı tipler). Sonraki her geçişte
+       parametresi bilinen adımlar uygulanır, parametresi eksik adımların
+       girdisi (ör. medyan doldurmadan sonra cap) akış istatistiklerine eklenir.
+       Bir sütunun zincirindeki her bağımlı adım bir geçiş daha gerektirir.
+       Sıra istatistikleri (çeyrekler, medyan) geçici dosyaya yazılan
+       değerlerden taban seçimiyle kesin olarak bulunur.
+    2. Yazma geçişi: tüm parçalar adımlardan geçirilip çıktıya eklenir.
+
+    Sonuç run_pipeline'daki sayaç ve log alanlarını (cleaned_df hariç), çıktı
+    satır sayısını ("row_count") ve dosya geçişi sayısını ("passes") içerir.
+    Loglardaki "stage", adımın parametrelerinin kesinleştiği geçiştir.
+    """
+    unsupported = [
+        f"{s.get('method')} ({s.get('column')})"
+        for s in selections
+        if (s.get("category"), s.get("method")) not in STREAMABLE_METHODS
+    ]
+    if unsupported:
+        raise ValueError(
+            "Akış modunda desteklenmeyen adımlar: " + ", ".join(unsupported)
+            + ". Bu adımlar tüm veriyi bellekte gerektirir."
+        )
+
+    read_options = {"dialect": dialect, "sheet_name": sheet_name}
+    columns, dtypes, text_columns, input_rows, input_nulls = _scan_schema(file_path, chunksize, read_options)
+    read_options["dtype"] = {col: str for col in text_columns} or None
+
+    ops = []
+    for index, selection in enumerate(selections):
+        key = (selection.get("category"), selection.get("method"))
+        op = {
+            "index": index, "selection": selection, "key": key, "column": selection.get("column"),
+            "params": None if key in FITTED_METHODS or key in DTYPE_FITTED_METHODS else {}, "acc": None,
+            "error": None, "stage": 0, "count": 0, "detail": None,
+        }
+        if op["column"] not in columns:
+            op["error"] = f"'{op['column']}' sütunu bulunamadı."
+        ops.append(op)
+
+    spill_dir = tempfile.mkdtemp(prefix="stream_", dir=os.path.dirname(os.path.abspath(output_path)))
+    passes = 1
+    try:
+        while any(op["params"] is None and op["error"] is None for op in ops):
+            passes += 1
+            _run_pass(file_path, chunksize, read_options, dtypes, ops, spill_dir, stage=passes - 1)
+        passes += 1
+        output_rows, output_nulls = _run_pass(
+            file_path, chunksize, read_options, dtypes, ops, spill_dir, stage=passes - 1, output_path=output_path
+        )
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    logs = [_log_entry(op) for op in ops]
+    totals = {"outlier": 0, "format": 0}
+    for op in ops:
+        if op["error"] is None and op["key"][0] in totals:
+            totals[op["key"][0]] += op["count"]
+
+    return {
+        "output_path":        output_path,
+        "logs":               logs,
+        "passes":             passes,
+        "row_count":          output_rows,
+        "before_missing_pct": _missing_pct(input_nulls, input_rows),
+        "after_missing_pct":  _missing_pct(output_nulls, output_rows),
+        "applied_count":      len([l for l in logs if l["status"] == "ok"]),
+        "error_count":        len([l for l in logs if l["status"] == "error"]),
+        "outlier_count":      totals["outlier"],
+        "format_errors":      totals["format"],
+    }
+
+
+def _scan_schema(file_path: str, chunksize: int, read_options: dict) -> tuple:
+    """
+    Dosya geneli sütun tipleri: parçaların tipleri merge_dtypes ile birleşir.
+    Bir parçada sayı, dosya genelinde metin olan sütunlar (text_columns) sonraki
+    geçişlerde metin olarak okunur; tüm dosya okunduğunda da öyle olurlar.
+    """
+    columns, dtypes, kinds, nulls, rows = [], {}, {}, {}, 0
+    for chunk in read_file_chunks(file_path, chunksize, **read_options):
+        if not columns:
+            columns = list(chunk.columns)
+        rows += len(chunk)
+        for col in chunk.columns:
+            series = chunk[col]
+            nulls[col] = nulls.get(col, 0) + int(series.isna().sum())
+            # Tamamen boş parça sütunu (float NaN) tipi belirlemez
+            if series.isna().all() and col in dtypes:
+                continue
+            dtype = str(series.dtype)
+            dtypes[col] = merge_dtypes(dtypes[col], dtype) if col in dtypes else dtype
+            kinds.setdefault(col, set()).add(series.dtype.kind)
+    text_columns = [col for col in columns if dtypes.get(col) == "object" and kinds[col] & set("iuf")]
+    return columns, dtypes, text_columns, rows, nulls
+
+
+def _run_pass(file_path, chunksize, read_options, dtypes, ops, spill_dir, stage, output_path=None):
+    """
+    Dosyanın bir geçişi. output_path verilmezse istatistik geçişidir; bir adım
+    hata verirse devre dışı bırakılır ve geçiş baştan alınır.
+    """
+    while True:
+        pending = [op for op in ops if op["params"] is None and op["error"] is None]
+        for op in pending:
+            op["acc"] = _ColumnAccumulator(spill_dir, FITTED_METHODS.get(op["key"], ()))
+        for op in ops:
+            op["count"] = 0
+        rows, nulls = 0, {}
+        try:
+            out = open(output_path, "w", newline="", encoding="utf-8") if output_path else None
+            try:
+                header = True
+                for chunk in read_file_chunks(file_path, chunksize, **read_options):
+                    chunk = _process_chunk(_conform(chunk, dtypes), ops)
+                    if out is not None:
+                        chunk.to_csv(out, index=False, header=header)
+                        header = False
+                        rows += len(chunk)
+                        for col in chunk.columns:
+                            nulls[col] = nulls.get(col, 0) + int(chunk[col].isna().sum())
+            finally:
+                if out is not None:
+                    out.close()
+        except _StepFailed:
+            continue
+        finally:
+            for op in pending:
+                if op["acc"] is not None:
+                    op["acc"].close()
+
+        for op in pending:
+            if op["acc"].reached and op["error"] is None:
+                try:
+                    op["params"] = _fit(op)
+                    op["stage"] = stage
+                except Exception as e:
+                    op["error"] = str(e)
+            op["acc"] = None
+        return rows, nulls
+
+
+def _conform(chunk: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
+    # Parça tipleri dosya geneli tiplere genişletilir (ör. int64 -> float64, bool -> object)
+    for col in chunk.columns:
+        dtype = dtypes.get(col)
+        if dtype is not None and str(chunk[col].dtype) != dtype:
+            chunk[col] = chunk[col].astype(dtype)
+    return chunk
+
+
+def _process_chunk(chunk: pd.DataFrame, ops: list) -> pd.DataFrame:
+    """
+    Parçayı adımlardan sırayla geçirir. Parametresi eksik bir adıma gelindiğinde
+    girdisi istatistiklere eklenir; o sütunun (satır filtresiyse tüm tablonun)
+    sonraki adımları bu geçişte bekletilir.
+    """
+    blocked, all_blocked = set(), False
+    for op in ops:
+        column = op["column"]
+        if op["error"] is not None:
+            continue
+        if all_blocked or column in blocked:
+            # Bekletilen satır filtresinden sonra hiçbir sütunun satırları bilinmez
+            all_blocked = all_blocked or op["key"] in _ROW_FILTERS
+            continue
+        try:
+            if op["params"] is None and op["key"] in DTYPE_FITTED_METHODS:
+                op["acc"].reached = True
+                chunk = _transform(chunk, {**op, "params": {}})
+                if len(chunk):
+                    dtype = str(chunk[column].dtype)
+                    op["acc"].dtype = dtype if op["acc"].dtype is None else merge_dtypes(op["acc"].dtype, dtype)
+                blocked.add(column)
+                continue
+            if op["params"] is None:
+                op["acc"].dtype = chunk[column].dtype
+                op["acc"].add(_numeric_values(chunk[column], column))
+                blocked.add(column)
+                all_blocked = op["key"] in _ROW_FILTERS
+                continue
+            chunk = _transform(chunk, op)
+        except Exception as e:
+            op["error"] = str(e)
+            raise _StepFailed() from e
+    return chunk
+
+
+def _numeric_values(series: pd.Series, column: str) -> np.ndarray:
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    if series.isna().all():
+        return np.full(len(series), np.nan)
+    raise ValueError(f"{column} sütunu sayısal değil; bu yöntem uygulanamaz.")
+
+
+def _fit(op: dict) -> dict:
+    """Adımın parametreleri ve sonuç dtype'ı; hesaplanamıyorsa ValueError."""
+    acc, method, column = op["acc"], op["key"][1], op["column"]
+    if method in ("mean", "median", "standard_scale", "minmax_scale") and acc.count == 0:
+        raise ValueError(f"'{column}' sütunu tamamen boş olduğu için {method} uygulanamaz.")
+
+    if op["key"] in DTYPE_FITTED_METHODS:
+        return {"dtype": acc.dtype} if acc.dtype is not None else {}
+    if method == "keep":
+        return {}
+    if method == "mean":
+        return {"value": acc.mean}
+    if method == "median":
+        return {"value": acc.median()}
+    if method == "log_transform":
+        shift = abs(acc.min) + 1 if acc.count and acc.min <= 0 else 0.0
+        return {"shift": shift}
+    if method == "standard_scale":
+        scale = math.sqrt(acc.m2 / acc.count)
+        return {"mean": acc.mean, "scale": scale if scale != 0 else 1.0}
+    if method == "minmax_scale":
+        data_range = acc.max - acc.min
+        scale = 1.0 / (data_range if data_range != 0 else 1.0)
+        return {"scale": scale, "min": -acc.min * scale}
+
+    if method == "percentile_cap":
+        lower, upper = acc.quantiles((0.05, 0.95))
+    else:
+        q1, q3 = acc.quantiles((0.25, 0.75))
+        lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    params = {"lower": lower, "upper": upper}
+    if method == "median_replace":
+        params["median"] = acc.median()
+    if method in ("cap", "percentile_cap", "median_replace"):
+        # Sonuç dtype'ı tüm sütunda olacağı gibi: uç değerlerden oluşan temsilci
+        # seride aynı işlem denenir (ör. int sütun kesirli sınıra kırpılırsa float)
+        sample = pd.Series([acc.min, acc.max] if acc.count else [], dtype=np.float64).astype(acc.dtype)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", FutureWarning)
+            params["dtype"] = _transform(sample.to_frame(column), {**op, "params": params, "count": 0})[column].dtype
+    return params
+
+
+def _transform(chunk: pd.DataFrame, op: dict) -> pd.DataFrame:
+    """Parametreleri bilinen adımı parçaya uygular; değişen hücre/satır sayısını op["count"]'a ekler."""
+    (category, method), column, params = op["key"], op["column"], op["params"]
+    if op["key"] in NOOP_METHODS or op["key"] == ("outlier", "keep"):
+        return chunk
+    if op["key"] in ROW_LOCAL_METHODS:
+        before = len(chunk)
+        if category == "missing":
+            chunk, detail = apply_missing(chunk, column, method)
+            op["count"] += before - len(chunk)
+            if method == "constant":
+                op["detail"] = detail
+        else:
+            chunk, op["detail"], count = apply_format(chunk, column, method)
+            op["count"] += count
+        if params.get("dtype") is not None and str(chunk[column].dtype) != params["dtype"]:
+            chunk[column] = chunk[column].astype(params["dtype"])
+        return chunk
+
+    series = chunk[column]
+    values = _numeric_values(series, column)
+    missing = np.isnan(values)
+    if method in ("mean", "median"):
+        chunk[column] = np.where(missing, params["value"], values)
+    elif method == "log_transform":
+        chunk[column] = np.log1p(values + params["shift"]) if params["shift"] else np.log1p(values)
+    elif method == "standard_scale":
+        chunk[column] = (values - params["mean"]) / params["scale"]
+    elif method == "minmax_scale":
+        chunk[column] = values * params["scale"] + params["min"]
+    else:
+        lower, upper = params["lower"], params["upper"]
+        outside = (values < lower) | (values > upper)
+        if method == "drop_outliers":
+            before = len(chunk)
+            chunk = chunk[((values >= lower) & (values <= upper)) | missing]
+            op["count"] += before - len(chunk)
+            return chunk
+        op["count"] += int(outside.sum())
+        result = series.astype(params["dtype"]) if "dtype" in params else series.copy()
+        if method == "median_replace":
+            result[outside] = params["median"]
+        else:
+            result = result.clip(lower=lower, upper=upper)
+        chunk[column] = result
+    return chunk
+
+
+def _log_entry(op: dict) -> dict:
+    selection = op["selection"]
+    if op["error"] is not None:
+        status, detail = "error", op["error"]
+    else:
+        status, detail = "ok", op["detail"] or _detail(op)
+    return {
+        "status":    status,
+        "category":  selection.get("category"),
+        "column":    selection.get("column"),
+        "method":    selection.get("method"),
+        "detail":    detail,
+        "step":      op["index"],
+        "stage":     op["stage"],
+    }
+
+
+def _detail(op: dict) -> str:
+    # Metinler bellek içi apply_* fonksiyonlarıyla aynıdır (NumPy skalerleri
+    # Python'dan farklı yuvarlar: round(np.float64(0.415), 2) == 0.42)
+    (category, method), column = op["key"], op["column"]
+    params = {key: np.float64(value) for key, value in op["params"].items() if key != "dtype"}
+    if method == "drop":
+        return f"{column} sütunundaki eksik {op['count']} satır silindi."
+    if method == "mean":
+        return f"{column} sütunu ortalama ({round(params['value'], 2)}) ile dolduruldu."
+    if method == "median":
+        return f"{column} sütunu medyan ({round(params['value'], 2)}) ile dolduruldu."
+    if method == "cap":
+        return f"{column} sütunu [{round(params['lower'],2)}, {round(params['upper'],2)}] aralığına sınırlandırıldı."
+    if method == "drop_outliers":
+        return f"{column} sütunundaki {op['count']} aykırı satır silindi."
+    if method == "median_replace":
+        return f"{column} sütunundaki aykırı değerler medyan ({round(params['median'],2)}) ile değiştirildi."
+    if method == "percentile_cap":
+        return (f"{column} sütunu %5 ve %95 oranlarıyla ([{round(params['lower'],2)}, "
+                f"{round(params['upper'],2)}]) aralığına yumuşak olarak sınırlandırıldı.")
+    if method == "keep":
+        return f"{column} sütunundaki aykırı değerler raporlandı, değiştirilmedi."
+    if method == "log_transform":
+        return f"{column} sütununa veri çarpıklığını (skewness) azaltmak için Logaritmik Dönüşüm uygulandı."
+    if method == "standard_scale":
+        return f"{column} sütunu Standart Ölçekleyici (Ort:0, Sapma:1) ile ölçeklendirildi."
+    if method == "minmax_scale":
+        return f"{column} sütunu Min-Max Ölçekleyici ile (0-1 arasında) sınırlandırıldı."
+    if method == "skip":
+        return f"{column} sütununa özellik mühendisliği uygulanmadı (atlandı)."
+    if method == "keep_duplicates":
+        return "Duplicate satırlar korundu, değişiklik yapılmadı."
+    # Hiç parça okunmadıysa (boş dosya) satır-yerel adımların metni
+    return f"{column} sütununa {method} uygulandı."
+
+
+def _missing_pct(nulls: dict, rows: int) -> float:
+    # df.isnull().mean().mean() ile aynı: sütun başına eksik oranlarının ortalaması
+    if not nulls or rows == 0:
+        return float("nan")
+    return round(sum(count / rows for count in nulls.values()) / len(nulls) * 100, 2)
+
+
+class _ColumnAccumulator:
+    """
+    Bir adımın girdi sütununun akış istatistikleri: sayı, ortalama ve kareler
+    toplamı (paralel Welford birleştirmesi), min/max ve gerekiyorsa sıra
+    istatistikleri için dolu değerlerin geçici dosyaya yazılmış kopyası.
+    """
+
+    def __init__(self, spill_dir: str, quantiles: tuple):
+        self.reached = False
+        self.dtype = None
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._spill_path = None
+        self._spill = None
+        if quantiles:
+            handle, self._spill_path = tempfile.mkstemp(suffix=".f64", dir=spill_dir)
+            self._spill = os.fdopen(handle, "wb")
+
+    def add(self, values: np.ndarray) -> None:
+        self.reached = True
+        values = values[~np.isnan(values)]
+        n = len(values)
+        if not n:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        if self._spill is not None:
+            values.astype(np.float64).tofile(self._spill)
+
+    def close(self) -> None:
+        if self._spill is not None and not self._spill.closed:
+            self._spill.close()
+
+    def quantiles(self, qs: tuple) -> list:
+        """pandas/numpy 'linear' yöntemiyle aynı kesin çeyrekler (boşsa NaN)."""
+        if self.count == 0:
+            return [float("nan")] * len(qs)
+        positions = []
+        for q in qs:
+            virtual = (self.count - 1) * q
+            previous = int(math.floor(virtual))
+            positions.append((previous, min(previous + 1, self.count - 1), virtual - previous))
+        values = self._order_statistics({rank for p in positions for rank in p[:2]})
+        result = []
+        for previous, following, gamma in positions:
+            a, b = values[previous], values[following]
+            diff = b - a
+            result.append(b - diff * (1 - gamma) if gamma >= 0.5 else a + diff * gamma)
+        return result
+
+    def median(self) -> float:
+        # np.median: çift sayıda değerde ortadaki iki değerin ortalaması
+        middle = (self.count - 1) // 2
+        ranks = {middle, self.count // 2}
+        values = self._order_statistics(ranks)
+        return float(np.mean([values[middle], values[self.count // 2]]))
+
+    def _order_statistics(self, ranks: set) -> dict:
+        """
+        Sıralı dizideki verilen sıralardaki değerler; dizi belleğe alınmaz.
+        float64 değerler sıralamayı koruyan uint64 anahtarlara çevrilir ve her
+        sıra için 16 bitlik basamaklarla (4 geçiş) taban seçimi yapılır.
+        """
+        self.close()
+        stored = np.memmap(self._spill_path, dtype=np.float64, mode="r")
+        ranks = sorted(ranks)
+        prefixes = dict.fromkeys(ranks, 0)
+        remaining = {rank: rank for rank in ranks}
+        for shift in (48, 32, 16, 0):
+            histograms = {rank: np.zeros(1 << 16, dtype=np.int64) for rank in ranks}
+            for start in range(0, len(stored), STREAM_SPILL_BLOCK):
+                keys = _sort_keys(np.asarray(stored[start:start + STREAM_SPILL_BLOCK]))
+                digits = ((keys >> np.uint64(shift)) & np.uint64(0xFFFF)).astype(np.int64)
+                high = keys >> np.uint64(shift + 16) if shift < 48 else None
+                for rank in ranks:
+                    selected = digits if high is None else digits[high == np.uint64(prefixes[rank] >> (shift + 16))]
+                    histograms[rank] += np.bincount(selected, minlength=1 << 16)
+            for rank in ranks:
+                cumulative = np.cumsum(histograms[rank])
+                digit = int(np.searchsorted(cumulative, remaining[rank], side="right"))
+                remaining[rank] -= int(cumulative[digit - 1]) if digit else 0
+                prefixes[rank] |= digit << shift
+        del stored
+        return {rank: _key_value(prefixes[rank]) for rank in ranks}
+
+
+def _sort_keys(values: np.ndarray) -> np.ndarray:
+    # IEEE 754: negatiflerin tüm bitleri, pozitiflerin işaret biti çevrilince
+    # işaretsiz tamsayı sırası sayı sırasıyla aynı olur
+    bits = values.view(np.uint64)
+    sign = bits >> np.uint64(63)
+    return np.where(sign == 1, ~bits, bits | np.uint64(1 << 63))
+
+
+def _key_value(key: int) -> float:
+    bits = key ^ (1 << 63) if key >> 63 else ~key & 0xFFFFFFFFFFFFFFFF
+    return float(np.array([bits], dtype=np.uint64).view(np.float64)[0])
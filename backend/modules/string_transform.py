@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+
+from backend.modules.file_reader import is_text_column
+from backend.modules.fuzzy_match import similar_pairs
+from backend.modules.ownership import writable_copy
+from backend.modules.type_inference import TYPE_SAMPLE_ROWS, infer_type_profile
+
+# Benzersiz değerler üzerinde çalışan (sözlük kodlamalı) metin dönüşümleri
+STRING_METHODS = ("strip_whitespace", "normalize_case", "semantic_merge")
+SEMANTIC_MERGE_RATIO = 0.85
+
+
+def apply_string_steps(df: pd.DataFrame, column: str, methods: list) -> tuple[pd.DataFrame, list]:
+    """
+    Bir sütuna ardışık metin dönüşümlerini (STRING_METHODS) uygular.
+
+    Yalnızca metin içeren sütunlar (tüm dolu değerleri str olan object,
+    string ve metin kategorili category sütunları) birleşik yoldan geçer:
+    sütun bir kez (hücre kodu, benzersiz değer) çiftine ayrılır, her adım
+    yalnızca benzersiz değerleri dönüştürür, değişen hücre sayısı değer
+    sayılarından okunur ve tüm adımlar tek bir eski→yeni eşlemesiyle sütuna
+    bir kez yazılır (category sütunlarında kategori kodları yeniden eşlenir).
+    Metin dışı ya da karışık tipli sütunlar adım adım, hücre bazında işlenir.
+    Her iki yolun sonucu adım adım apply_format ile aynıdır.
+
+    (DataFrame, [(detay, değişen hücre sayısı), ...]) döner.
+    """
+    series = df[column]
+    for method in methods:
+        if method not in STRING_METHODS:
+            raise ValueError(f"Bilinmeyen yöntem: {method}")
+        if method == "normalize_case" and not (is_text_column(series) or isinstance(series.dtype, pd.StringDtype)):
+            raise ValueError(f"{column} sütunu metin tipinde değil; küçük harfe dönüştürülemez.")
+
+    if not _is_pure_text(series):
+        results = []
+        for method in methods:
+            df, detail, count = _apply_step(df, column, method)
+            results.append((detail, count))
+        return df, results
+
+    codes, uniques, order = _encode(series)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    current = uniques.copy()
+    modified = np.zeros(len(uniques), dtype=bool)
+
+    results = []
+    for method in methods:
+        if method == "strip_whitespace":
+            current, changed = _strip(current)
+            detail = f"{column} sütunundaki baş/son boşluklar temizlendi."
+        elif method == "normalize_case":
+            current, changed = _lower(current)
+            detail = f"{column} sütunu küçük harfe dönüştürüldü."
+        else:
+            current, changed, detail = _semantic_merge(column, current, counts, codes, order)
+        modified |= changed
+        results.append((detail, int(counts[changed].sum())))
+
+    df = writable_copy(df)
+    if modified.any():
+        df[column] = _decode(series, codes, current, modified)
+    return df, results
+
+
+def _is_pure_text(series: pd.Series) -> bool:
+    """Dolu değerlerin tamamı metin mi? (birleşik yol yalnızca bu sütunlarda çalışır)"""
+    if isinstance(series.dtype, pd.StringDtype):
+        return True
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        return len(categories) == 0 or pd.api.types.infer_dtype(categories, skipna=True) == "string"
+    return series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) == "string"
+
+
+def _apply_step(df: pd.DataFrame, column: str, method: str) -> tuple[pd.DataFrame, str, int]:
+    """Tek bir metin adımını hücre bazında uygular (metin dışı ya da karışık tipli sütunlar)."""
+    df = writable_copy(df)
+    series = df[column]
+    if method == "strip_whitespace":
+        changed_count = int(series.apply(lambda x: x.strip() != x if isinstance(x, str) else False).sum())
+        df[column] = series.apply(lambda x: x.strip() if isinstance(x, str) else x)
+        return df, f"{column} sütunundaki baş/son boşluklar temizlendi.", changed_count
+
+    if method == "normalize_case":
+        changed_count = int(series.apply(lambda x: x.lower() != x if isinstance(x, str) else False).sum())
+        df[column] = series.str.lower()
+        return df, f"{column} sütunu küçük harfe dönüştürüldü.", changed_count
+
+    values = series.dropna()
+    if len(values) and infer_type_profile(values.head(TYPE_SAMPLE_ROWS))["sample_is_numeric_or_date"]:
+        return df, f"{column} sütunu tarih veya sayısal veri içerdiği için benzerlik birleştirmesi atlandı.", 0
+
+    value_counts = series.value_counts()
+    replace_map = {}
+    for val1, val2, _ in similar_pairs(values.unique(), SEMANTIC_MERGE_RATIO):
+        # Keep the one that is more frequent
+        if value_counts.get(val1, 0) >= value_counts.get(val2, 0):
+            replace_map[val2] = val1
+        else:
+            replace_map[val1] = val2
+    if not replace_map:
+        return df, f"{column} sütununda birleştirilecek kelime bulunamadı.", 0
+    changed_count = int(series.isin(replace_map.keys()).sum())
+    df[column] = series.replace(replace_map)
+    detail = f"{column} sütununda birbirine benzeyen (yazım hatalı) kelimeler {len(replace_map)} kez ana kategoriyle birleştirildi."
+    return df, detail, changed_count
+
+
+def _encode(series: pd.Series) -> tuple:
+    """(hücre kodları (-1 = eksik), benzersiz değerler, ilk görülme sırası)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy().astype(np.int64)
+        uniques = series.cat.categories.to_numpy(dtype=object)
+        present, first_seen = np.unique(codes, return_index=True)
+        order = present[np.argsort(first_seen)]
+        return codes, uniques, order[order >= 0]
+    codes, uniques = pd.factorize(series.to_numpy(dtype=object))
+    return codes, np.asarray(uniques, dtype=object), np.arange(len(uniques))
+
+
+def _decode(series: pd.Series, codes: np.ndarray, current: np.ndarray, modified: np.ndarray) -> pd.Series:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        category_codes, categories = pd.factorize(current)
+        new_codes = np.where(codes >= 0, category_codes[codes], -1)
+        return pd.Series(
+            pd.Categorical.from_codes(new_codes, categories=pd.Index(categories, dtype=object)),
+            index=series.index, name=series.name,
+        )
+    values = series.to_numpy(dtype=object, copy=True)
+    cells = np.flatnonzero(codes >= 0)
+    cells = cells[modified[codes[cells]]]
+    values[cells] = current[codes[cells]]
+    result = pd.Series(values, index=series.index, name=series.name)
+    if isinstance(series.dtype, pd.StringDtype):
+        result = result.astype(series.dtype)
+    return result
+
+
+def _strip(current: np.ndarray) -> tuple:
+    new = current.copy()
+    changed = np.zeros(len(current), dtype=bool)
+    for k, value in enumerate(current):
+        if isinstance(value, str):
+            stripped = value.strip()
+            if stripped != value:
+                new[k] = stripped
+                changed[k] = True
+    return new, changed
+
+
+def _lower(current: np.ndarray) -> tuple:
+    new = current.copy()
+    changed = np.zeros(len(current), dtype=bool)
+    for k, value in enumerate(current):
+        if isinstance(value, str):
+            lowered = value.lower()
+            if lowered != value:
+                new[k] = lowered
+                changed[k] = True
+    return new, changed
+
+
+def _semantic_merge(column, current: np.ndarray, counts: np.ndarray, codes: np.ndarray, order: np.ndarray) -> tuple:
+    """Benzer yazımları daha sık geçen değerde birleştirir (eşleme benzersiz değerlerde kurulur)."""
+    unchanged = np.zeros(len(current), dtype=bool)
+    alive = ~pd.isna(current)
+
+    # Sayı/tarih kontrolü: sütunun ilk TYPE_SAMPLE_ROWS dolu hücresi
+    sample_cells = np.flatnonzero(codes >= 0)
+    sample_cells = sample_cells[alive[codes[sample_cells]]][:TYPE_SAMPLE_ROWS]
+    sample = pd.Series(current[codes[sample_cells]], dtype=object)
+    if len(sample) and infer_type_profile(sample)["sample_is_numeric_or_date"]:
+        detail = f"{column} sütunu tarih veya sayısal veri içerdiği için benzerlik birleştirmesi atlandı."
+        return current, unchanged, detail
+
+    # En sık geçen kelimeye (mode) veya ilkine birleştirme yapacağız
+    visible = order[alive[order] & (counts[order] > 0)]
+    actual_vals = pd.unique(current[visible])
+    value_counts = {}
+    for value, count in zip(current[visible].tolist(), counts[visible].tolist()):
+        value_counts[value] = value_counts.get(value, 0) + count
+
+    replace_map = {}
+    for val1, val2, _ in similar_pairs(actual_vals, SEMANTIC_MERGE_RATIO):
+        # Keep the one that is more frequent
+        if value_counts.get(val1, 0) >= value_counts.get(val2, 0):
+            replace_map[val2] = val1
+        else:
+            replace_map[val1] = val2
+
+    if not replace_map:
+        return current, unchanged, f"{column} sütununda birleştirilecek kelime bulunamadı."
+
+    new = current.copy()
+    changed = np.zeros(len(current), dtype=bool)
+    for k in np.flatnonzero(alive).tolist():
+        value = current[k]
+        if value in replace_map:
+            new[k] = replace_map[value]
+            changed[k] = True
+    detail = f"{column} sütununda birbirine benzeyen (yazım hatalı) kelimeler {len(replace_map)} kez ana kategoriyle birleştirildi."
+    return new, changed, detail
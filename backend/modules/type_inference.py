@@ -0,0 +1,168 @@
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+
+DATE_PATTERNS = [
+    r'\d{4}-\d{2}-\d{2}',          # 2024-01-15
+    r'\d{2}/\d{2}/\d{4}',           # 15/01/2024
+    r'\d{2}\.\d{2}\.\d{4}',         # 15.01.2024
+    r'\d{4}/\d{2}/\d{2}',           # 2024/01/15
+]
+# Desenler birbirini dışladığı için tek geçişte eşleşen alternasyon yeterli
+DATE_REGEX = re.compile("|".join(f"(?:{pattern})" for pattern in DATE_PATTERNS))
+
+# Desenlere karşılık gelen açık biçimler (gün önce; apply_format'taki dayfirst=True ile uyumlu)
+DATE_FORMATS = {
+    "%Y-%m-%d": DATE_PATTERNS[0],
+    "%d/%m/%Y": DATE_PATTERNS[1],
+    "%d.%m.%Y": DATE_PATTERNS[2],
+    "%Y/%m/%d": DATE_PATTERNS[3],
+}
+
+# Fuzzy kontrolünü atlama kararının verildiği ilk satır sayısı
+TYPE_SAMPLE_ROWS = 100
+# Tarih biçimlerinin çıkarıldığı ilk satır sayısı
+DATE_SAMPLE_ROWS = 1000
+NUMERIC_LIKE_RATIO = 0.8
+DATE_LIKE_RATIO = 0.5
+
+
+def infer_type_profile(values: pd.Series) -> dict:
+    """
+    Eksiksiz (dropna) değerlerden sütunun tip profilini çıkarır.
+
+    Sayısal dönüşüm ve tarih deseni her benzersiz değer için bir kez
+    denenir, sonuç değerlerin tekrar sayısıyla ağırlıklandırılır. Fuzzy
+    kontrolünü atlama kararı ilk TYPE_SAMPLE_ROWS satırlık örneklemle verilir
+    (pd.to_datetime yalnızca bu örneklemin benzersiz değerlerinde çalışır).
+
+    Döner:
+        numeric_mask / date_mask: hücre bazında maskeler (values ile aynı index)
+        numeric_count / date_count, numeric_ratio / date_ratio
+        is_numeric_like / is_date_like: analiz eşiklerini geçiyor mu
+        sample_is_numeric_or_date: örneklem ağırlıklı olarak sayı/tarih mi
+        inferred_type ("numeric" | "date" | "text") ve confidence (0-1)
+    """
+    n_values = len(values)
+    codes, uniques = pd.factorize(values.to_numpy(dtype=object))
+    uniques = pd.Series(np.asarray(uniques, dtype=object))
+
+    numeric_unique = pd.to_numeric(uniques, errors="coerce").notna().to_numpy()
+    date_unique = uniques.astype(str).str.match(DATE_REGEX).to_numpy(dtype=bool)
+    numeric_mask = pd.Series(numeric_unique[codes], index=values.index)
+    date_mask = pd.Series(date_unique[codes], index=values.index)
+
+    numeric_count = int(numeric_mask.sum())
+    date_count = int(date_mask.sum())
+    numeric_ratio = numeric_count / n_values if n_values else 0.0
+    date_ratio = date_count / n_values if n_values else 0.0
+
+    sample_codes = codes[:TYPE_SAMPLE_ROWS]
+    sample_is_numeric_or_date = False
+    if len(sample_codes):
+        sample_unique_codes = pd.unique(sample_codes)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            parsed = pd.to_datetime(uniques.iloc[sample_unique_codes], errors="coerce", dayfirst=True)
+        datetime_unique = np.zeros(len(uniques), dtype=bool)
+        datetime_unique[sample_unique_codes] = parsed.notna().to_numpy()
+        sample_is_numeric_or_date = bool(
+            numeric_unique[sample_codes].mean() > NUMERIC_LIKE_RATIO
+            or date_unique[sample_codes].mean() > DATE_LIKE_RATIO
+            or datetime_unique[sample_codes].mean() > DATE_LIKE_RATIO
+        )
+
+    if numeric_ratio > NUMERIC_LIKE_RATIO:
+        inferred_type, confidence = "numeric", numeric_ratio
+    elif date_ratio > DATE_LIKE_RATIO:
+        inferred_type, confidence = "date", date_ratio
+    else:
+        inferred_type, confidence = "text", 1.0 - max(numeric_ratio, date_ratio)
+
+    return {
+        "numeric_mask": numeric_mask,
+        "date_mask": date_mask,
+        "numeric_count": numeric_count,
+        "date_count": date_count,
+        "numeric_ratio": numeric_ratio,
+        "date_ratio": date_ratio,
+        "is_numeric_like": numeric_ratio > NUMERIC_LIKE_RATIO,
+        "is_date_like": date_ratio > DATE_LIKE_RATIO,
+        "sample_is_numeric_or_date": sample_is_numeric_or_date,
+        "inferred_type": inferred_type,
+        "confidence": round(float(confidence), 4),
+    }
+
+
+def parse_dates(values: pd.Series) -> tuple[pd.Series, dict]:
+    """
+    Metin tarihleri açık biçimlerle, vektörel olarak datetime'a çevirir.
+
+    İlk DATE_SAMPLE_ROWS satırdan baskın biçimler (DATE_FORMATS) çıkarılır;
+    her biçim yalnızca tam eşleşen benzersiz değerlerde format= ile ayrıştırılır.
+    Hiçbir biçimle ayrıştırılamayan değerler eski davranışla
+    (pd.to_datetime(errors='coerce', dayfirst=True)) çevrilir.
+
+    Saat dilimi bilgisi taşıyan değerler varsa sütunun tamamı eski davranışla
+    çevrilir (ortak ofsette tz'li datetime, karışık ofsetlerde Timestamp
+    nesneleri); report["timezone"] True olur.
+
+    Döner: (datetime64[ns] seri, {"formats": {biçim: hücre}, "inferred": hücre,
+    "coerced": NaT'a dönen dolu hücre, "timezone": bool})
+    """
+    present = values.notna().to_numpy()
+    codes, uniques = pd.factorize(values.to_numpy(dtype=object)[present])
+    unique_text = pd.Series(np.asarray(uniques, dtype=object)).astype(str)
+    counts = np.bincount(codes, minlength=len(uniques))
+
+    sample_text = unique_text.iloc[pd.unique(codes[:DATE_SAMPLE_ROWS])]
+    sample_counts = np.bincount(codes[:DATE_SAMPLE_ROWS], minlength=len(uniques))
+    format_hits = {
+        fmt: int(sample_counts[sample_text.index[sample_text.str.fullmatch(pattern)]].sum())
+        for fmt, pattern in DATE_FORMATS.items()
+    }
+    formats = sorted((fmt for fmt, hits in format_hits.items() if hits), key=lambda fmt: -format_hits[fmt])
+
+    parsed = np.full(len(uniques), np.datetime64("NaT"), dtype="datetime64[ns]")
+    remaining = np.ones(len(uniques), dtype=bool)
+    report = {"formats": {}, "inferred": 0, "coerced": 0, "timezone": False}
+    for fmt in formats:
+        group = np.flatnonzero(remaining & unique_text.str.fullmatch(DATE_FORMATS[fmt]).to_numpy(dtype=bool))
+        result = pd.to_datetime(unique_text.iloc[group], format=fmt, errors="coerce").to_numpy(dtype="datetime64[ns]")
+        # Desene uyup biçime uymayanlar (ör. ay/gün yer değiştirmiş) sonraki geçişlere kalır
+        ok = ~np.isnat(result)
+        parsed[group[ok]] = result[ok]
+        remaining[group[ok]] = False
+        report["formats"][fmt] = int(counts[group[ok]].sum())
+
+    if remaining.any():
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            result = pd.to_datetime(pd.Series(uniques[remaining], dtype=object), errors="coerce", dayfirst=True)
+        if isinstance(result.dtype, pd.DatetimeTZDtype) or result.dtype == object:
+            return _parse_dates_with_timezone(values)
+        parsed[remaining] = result.to_numpy(dtype="datetime64[ns]")
+        report["inferred"] = int(counts[remaining].sum())
+
+    report["coerced"] = int(counts[np.isnat(parsed)].sum())
+    # Sonuçlar konuma göre yerleştirilir; tekrarlanan index etiketleri sorun olmaz
+    converted = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[ns]")
+    converted[present] = parsed[codes]
+    return pd.Series(converted, index=values.index, name=values.name), report
+
+
+def _parse_dates_with_timezone(values: pd.Series) -> tuple[pd.Series, dict]:
+    # Açık biçimler saat dilimini korumaz; tz'li sütunlar önceki gibi tek çağrıyla çevrilir
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        converted = pd.to_datetime(values, errors="coerce", dayfirst=True)
+    filled = int(values.notna().sum())
+    report = {
+        "formats": {},
+        "inferred": filled,
+        "coerced": filled - int(converted.notna().sum()),
+        "timezone": True,
+    }
+    return converted, report
@@ -19,6 +19,7 @@ from sqlalchemy.orm import Session
 
 from backend.auth import create_access_token, create_refresh_token, get_current_user, get_password_hash, verify_password
 from backend.database import Dataset, CleaningTemplate, PasswordResetToken, Project, SessionLocal, User, get_db
+from backend.core.constants import MAX_UPLOAD_MB
 from backend.core.helpers import cleaned_disk_path
 
 logger = logging.getLogger(__name__)
@@ -207,7 +208,7 @@ def account_summary(user: User = Depends(get_current_user), db: Session = Depend
             "status_counts": status_counts,
         },
         "limits": {
-            "max_upload_mb": 20,
+            "max_upload_mb": MAX_UPLOAD_MB,
             "supported_formats": ["CSV", "XLSX", "TXT"],
         },
     }
@@ -30,18 +30,20 @@ from sqlalchemy.orm import Session
 
 from backend.auth import get_current_user
 from backend.core.background_tasks import _apply_selections_to_dataset_async, _run_analysis_async
-from backend.core.constants import OUTPUT_DIR, UPLOAD_DIR
+from backend.core.constants import CHECKPOINT_DIR, IN_MEMORY_READ_MB, MAX_IN_MEMORY_MB, MAX_UPLOAD_MB, OUTPUT_DIR, UPLOAD_DIR
 from backend.core.helpers import (
     build_comparison,
     cleaned_disk_path,
     dataset_owned,
+    dataset_read_options,
     download_filename,
     profile_dataframe,
     project_owned,
     read_cleaned_csv,
 )
 from backend.database import CleaningLog, Dataset, Project, QualityReport, User, get_db
-from backend.modules.file_reader import read_file
+from backend.modules.checkpoint_cache import dataset_namespace, remove_checkpoints
+from backend.modules.file_reader import list_sheets, read_file, remove_columnar_cache, scan_file
 
 router = APIRouter()
 
@@ -75,6 +77,7 @@ class ApplyRequest(BaseModel):
 async def upload_file(
     file: UploadFile = File(...),
     project_id: int | None = Form(None),
+    sheet_name: str | None = Form(None),
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -91,7 +94,7 @@ async def upload_file(
 
     storage_name = f"{uuid.uuid4().hex}{ext}"
     file_path = os.path.join(UPLOAD_DIR, storage_name)
-    MAX_FILE_SIZE = 20 * 1024 * 1024  # 20 MB
+    MAX_FILE_SIZE = MAX_UPLOAD_MB * 1024 * 1024
     size = 0
     with open(file_path, "wb") as f:
         while True:
@@ -105,18 +108,48 @@ async def upload_file(
                     os.remove(file_path)
                 raise HTTPException(
                     status_code=400,
-                    detail="Dosya boyutu çok büyük. Maksimum limit 20MB'dir.",
+                    detail=f"Dosya boyutu çok büyük. Maksimum limit {MAX_UPLOAD_MB}MB'dir.",
                 )
             f.write(chunk)
 
+    if ext == ".xlsx" and sheet_name and sheet_name not in list_sheets(file_path):
+        _safe_remove(file_path)
+        raise HTTPException(status_code=400, detail=f"'{sheet_name}' adlı sayfa dosyada bulunamadı.")
+
     try:
-        df, meta = read_file(file_path)
+        xlsx_sheet = sheet_name if ext == ".xlsx" else None
+        if size > IN_MEMORY_READ_MB * 1024 * 1024:
+            # Büyük dosyalar belleğe alınmadan parça parça taranır; XLSX sayfası
+            # korumalı okuyucuyla sütunlu önbelleğe yazılır ve oradan taranır
+            meta = scan_file(file_path, sheet_name=xlsx_sheet)
+            memory_bytes = meta["memory_bytes"]
+        else:
+            df, meta = read_file(file_path, sheet_name=xlsx_sheet)
+            memory_bytes = int(df.memory_usage(index=False, deep=True).sum())
     except Exception:
+        remove_columnar_cache(file_path)
         _safe_remove(file_path)
         raise HTTPException(
             status_code=400,
             detail="Dosya okunamadı veya desteklenmeyen format. Lütfen geçerli bir CSV, XLSX veya TXT dosyası yükleyin.",
         )
+    # Analiz ve temizleme görevleri tabloyu belleğe alır; sığmayacak dosyalar şimdi reddedilir
+    if memory_bytes > MAX_IN_MEMORY_MB * 1024 * 1024:
+        remove_columnar_cache(file_path)
+        _safe_remove(file_path)
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Dosya bellekte yaklaşık {memory_bytes / (1024 * 1024):.0f}MB yer kaplıyor. "
+                f"İşlenebilecek en büyük tablo {MAX_IN_MEMORY_MB}MB'dir."
+            ),
+        )
+
+    read_options = {}
+    if meta.get("dialect"):
+        read_options["dialect"] = meta["dialect"]
+    if ext == ".xlsx" and sheet_name:
+        read_options["sheet_name"] = sheet_name
 
     dataset = Dataset(
         user_id=user.id,
@@ -127,6 +160,7 @@ async def upload_file(
         row_count=meta["row_count"],
         col_count=meta["col_count"],
         file_path=file_path,
+        read_options=json.dumps(read_options, ensure_ascii=False) if read_options else None,
     )
     try:
         db.add(dataset)
@@ -134,6 +168,7 @@ async def upload_file(
         db.refresh(dataset)
     except Exception:
         # DB kaydı başarısız — diskteki dosyayı temizle (orphan önleme)
+        remove_columnar_cache(file_path)
         _safe_remove(file_path)
         db.rollback()
         raise HTTPException(status_code=500, detail="Veri seti kaydedilemedi. Lütfen tekrar deneyin.")
@@ -288,7 +323,8 @@ def delete_dataset(
     if not dataset or dataset.user_id != user.id:
         raise HTTPException(status_code=404, detail="Veri seti bulunamadı.")
 
-    # 1. Ham upload dosyasını sil
+    # 1. Ham upload dosyasını ve sütunlu önbelleğini sil
+    remove_columnar_cache(dataset.file_path)
     _safe_remove(dataset.file_path)
 
     # 2. Temizlenmiş CSV çıktısını sil
@@ -302,6 +338,9 @@ def delete_dataset(
     for report_file in _glob.glob(os.path.join(OUTPUT_DIR, f"report_{dataset_id}_*")):
         _safe_remove(report_file)
 
+    # 5. Pipeline checkpoint'lerini sil (verinin ara kopyalarıdır)
+    remove_checkpoints(CHECKPOINT_DIR, dataset_namespace(dataset_id))
+
     db.delete(dataset)
     db.commit()
     return {"status": "success", "message": "Veri seti silindi."}
@@ -329,7 +368,7 @@ def dataset_workspace(
         raise HTTPException(status_code=404, detail="Veri seti bulunamadı.")
 
     try:
-        before, _ = read_file(dataset.file_path)
+        before, _ = read_file(dataset.file_path, **dataset_read_options(dataset))
     except Exception as exc:
         raise HTTPException(status_code=422, detail="Orijinal veri dosyası okunamadı. Dosya silinmiş veya bozulmuş olabilir.") from exc
 
@@ -223,6 +223,29 @@ class TestBug2DeleteCleansFiles:
         assert not os.path.exists(html_path), "BUG #2: HTML rapor hâlâ mevcut!"
         assert not os.path.exists(pdf_path), "BUG #2: PDF rapor hâlâ mevcut!"
 
+    def test_delete_removes_pipeline_checkpoints(self, shared_auth_headers):
+        import pandas as pd
+        from backend.core.constants import CHECKPOINT_DIR
+        from backend.modules.checkpoint_cache import PipelineCheckpoints, dataset_namespace
+
+        headers = {k: v for k, v in shared_auth_headers.items() if k != "email"}
+        ds_id, file_path = _make_dataset(shared_auth_headers["email"], "bug2_checkpoint.csv")
+
+        selections = [{"category": "missing", "column": "yas", "method": "mean"}]
+        df = pd.DataFrame({"yas": [25.0, 30.0]})
+        own = PipelineCheckpoints(CHECKPOINT_DIR, "kaynak", namespace=dataset_namespace(ds_id))
+        other = PipelineCheckpoints(CHECKPOINT_DIR, "kaynak", namespace=dataset_namespace(ds_id + 1000))
+        assert own.save(selections, 1, df, [], {}) and other.save(selections, 1, df, [], {})
+
+        resp = client.delete(f"/api/v1/datasets/{ds_id}", headers=headers)
+        assert resp.status_code == 200
+
+        # ✅ Yalnızca silinen veri setinin checkpoint'leri kaldırılmalı
+        assert own.load_latest(selections) is None, "Checkpoint dosyası hâlâ mevcut!"
+        assert other.load_latest(selections) is not None
+        other_path = other._paths(selections)[0]
+        os.remove(other_path)
+
     def test_delete_other_users_dataset_returns_404(self, shared_auth_headers):
         """Başka kullanıcının dataset'ini silmeye çalışmak 404 dönmeli."""
         # 1 test için yeni kullanıcı gerek, buna bypass ekleyeceğiz (farklı endpoint)
@@ -386,3 +409,42 @@ class TestBug4UploadOrphan:
         assert len(new_files) == 0, (
             f"BUG #4: read_file hatası sonrası upload dizininde yeni dosya(lar) kaldı: {new_files}"
         )
+
+
+class TestLargeUploadScan:
+    """IN_MEMORY_READ_MB üzerindeki yüklemeler parça parça taranır; belleğe sığmayanlar reddedilir."""
+
+    def test_large_upload_goes_through_chunked_scan(self, shared_auth_headers):
+        headers = {k: v for k, v in shared_auth_headers.items() if k != "email"}
+        import io
+
+        content = "yas,gelir\n" + "".join(f"{20 + i % 40},{1000 + i}\n" for i in range(3000))
+        with patch("backend.routers.dataset_router.IN_MEMORY_READ_MB", 0), \
+                patch("backend.routers.dataset_router.read_file", side_effect=AssertionError("tam okuma yapılmamalı")):
+            resp = client.post(
+                "/api/v1/upload",
+                files={"file": ("buyuk.csv", io.BytesIO(content.encode()), "text/csv")},
+                headers=headers,
+            )
+        assert resp.status_code == 200, resp.text
+        meta = resp.json()["meta"]
+        assert meta["row_count"] == 3000
+        assert meta["dtypes"] == {"yas": "int64", "gelir": "int64"}
+        assert meta["memory_bytes"] == 3000 * 2 * 8
+
+    def test_upload_too_large_for_memory_is_rejected(self, shared_auth_headers):
+        headers = {k: v for k, v in shared_auth_headers.items() if k != "email"}
+        import io
+
+        before_files = set(os.listdir(UPLOAD_DIR))
+        content = "metin\n" + "".join(f"satir-{i}\n" for i in range(5000))
+        with patch("backend.routers.dataset_router.IN_MEMORY_READ_MB", 0), \
+                patch("backend.routers.dataset_router.MAX_IN_MEMORY_MB", 0):
+            resp = client.post(
+                "/api/v1/upload",
+                files={"file": ("sigmaz.csv", io.BytesIO(content.encode()), "text/csv")},
+                headers=headers,
+            )
+        assert resp.status_code == 400
+        assert "bellekte" in resp.json()["detail"]
+        assert set(os.listdir(UPLOAD_DIR)) == before_files
@@ -35,3 +35,179 @@ def test_strip_whitespace_preserves_nan():
     assert df2['isim'].iloc[1] != 'nan'
     assert df2['isim'].iloc[2] == 'Fatma'
     assert count == 2
+
+
+def test_analyze_format_same_issues_on_category_columns():
+    df = pd.DataFrame({
+        'isim':     ['  Ali', 'Ayse  ', ' Mehmet', 'Fatma'] * 3,
+        'cinsiyet': ['Erkek', 'Kadın', 'erkek', 'KADIN'] * 3,
+    })
+    expected = analyze_format(df)
+    result = analyze_format(df.astype('category'))
+    for col in expected:
+        assert result[col]['issues'] == expected[col]['issues']
+
+
+def test_similar_pairs_matches_all_pairs_difflib():
+    import difflib
+    import random
+    from backend.modules.fuzzy_match import similar_pairs
+
+    random.seed(7)
+    base = ["Istanbul", "Ankara", "Izmir", "Bursa", "Antalya", "Eskisehir", "Ab", "A", "abc", "Kadıköy"]
+    values = list(base)
+    for word in base * 20:
+        chars = list(word)
+        chars[random.randrange(len(chars))] = random.choice("aeiklmnrst")
+        values.append("".join(chars))
+    values = list(dict.fromkeys(values))
+
+    for ratio in (0.85, 0.6):
+        expected = []
+        for i in range(len(values)):
+            for j in range(i + 1, len(values)):
+                score = difflib.SequenceMatcher(None, values[i].lower(), values[j].lower()).ratio()
+                if ratio <= score < 1.0:
+                    expected.append((values[i], values[j], score))
+        assert similar_pairs(values, ratio) == expected
+
+
+def test_similar_pairs_with_one_long_value_stays_bounded():
+    import tracemalloc
+    from backend.modules.fuzzy_match import similar_pairs
+
+    long_text = "lorem ipsum dolor sit amet " * 300
+    values = ["Ankara", "Ankra", "Izmir", long_text, long_text[:-3] + "xyz"]
+
+    tracemalloc.start()
+    pairs = similar_pairs(values)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert [(a[:6], b[:6]) for a, b, _ in pairs] == [("Ankara", "Ankra"), ("lorem ", "lorem ")]
+    assert peak < 50 * 1024 * 1024
+
+
+def test_similar_pairs_stops_at_pair_and_candidate_caps():
+    from backend.modules.fuzzy_match import similar_pairs
+
+    values = [f"kelime{chr(97 + i)}{chr(97 + j)}" for i in range(10) for j in range(10)]
+    full = similar_pairs(values)
+
+    assert len(similar_pairs(values, max_pairs=5)) == 5
+    assert set(similar_pairs(values, max_pairs=5)) <= set(full)
+    assert len(similar_pairs(values, max_candidates=3)) <= 3
+
+
+def test_fuzzy_check_skips_identifier_columns():
+    import time
+    from backend.core.helpers import calculate_dataframe_health
+
+    ids = pd.DataFrame({"musteri": [f"CUST-{i:06d}" for i in range(5000)]})
+    repeated = pd.DataFrame({"musteri": [f"CUST-{i % 500:06d}" for i in range(5000)]})
+
+    start = time.perf_counter()
+    for df in (ids, repeated):
+        assert "musteri" not in analyze_format(df)
+        assert calculate_dataframe_health(df)[0] == 100
+    assert time.perf_counter() - start < 10
+
+    typos = pd.DataFrame({"sehir": ["Istanbul"] * 5 + ["Istanbol", "Ankara", "Ankara", "Ankra"]})
+    assert any(issue["type"] == "fuzzy_duplicates" for issue in analyze_format(typos)["sehir"]["issues"])
+
+
+def test_semantic_merge_merges_typos_into_frequent_value():
+    df = pd.DataFrame({'sehir': ['Istanbul'] * 5 + ['Istanbol', 'Ankara', 'Ankara', 'Ankra']})
+    df2, _, count = apply_format(df, 'sehir', 'semantic_merge')
+    assert count == 2
+    assert set(df2['sehir']) == {'Istanbul', 'Ankara'}
+
+
+def test_type_profile_weights_unique_values_by_count(monkeypatch):
+    from backend.modules import type_inference
+
+    values = pd.Series(['15/01/2024'] * 300 + ['2024-01-15'] * 200 + ['abc'] * 100 + ['12'] * 50)
+    calls = []
+    real_to_numeric = type_inference.pd.to_numeric
+    def counting_to_numeric(data, *args, **kwargs):
+        calls.append(len(data))
+        return real_to_numeric(data, *args, **kwargs)
+    monkeypatch.setattr(type_inference.pd, "to_numeric", counting_to_numeric)
+
+    profile = type_inference.infer_type_profile(values)
+
+    assert calls == [4]
+    assert profile["date_count"] == 500
+    assert profile["numeric_count"] == 50
+    assert profile["date_mask"].equals(values.str.match(r'\d{4}-\d{2}-\d{2}|\d{2}/\d{2}/\d{4}'))
+    assert profile["inferred_type"] == "date"
+    assert profile["confidence"] == round(500 / 650, 4)
+    assert profile["sample_is_numeric_or_date"]
+
+
+def test_to_datetime_parses_each_format_group():
+    df = pd.DataFrame({'tarih': ['15.01.2024', '16.01.2024', '2024-02-01', None, 'yok']})
+    df2, detail, count = apply_format(df, 'tarih', 'to_datetime')
+    assert pd.api.types.is_datetime64_any_dtype(df2['tarih'])
+    assert df2['tarih'].tolist()[:3] == [pd.Timestamp('2024-01-15'), pd.Timestamp('2024-01-16'), pd.Timestamp('2024-02-01')]
+    assert df2['tarih'].isna().sum() == 2
+    assert count == 4
+    assert '%d.%m.%Y: 2' in detail and '%Y-%m-%d: 1' in detail
+    assert '1 hücre' in detail
+
+
+def test_to_datetime_falls_back_for_values_that_match_pattern_but_not_format():
+    df = pd.DataFrame({'tarih': ['15/01/2024', '16/01/2024', '01/25/2024', '31/02/2024']})
+    df2, detail, count = apply_format(df, 'tarih', 'to_datetime')
+    expected = pd.to_datetime(df['tarih'], errors='coerce', dayfirst=True, format='mixed')
+    assert df2['tarih'].tolist()[:3] == [pd.Timestamp('2024-01-15'), pd.Timestamp('2024-01-16'), pd.Timestamp('2024-01-25')]
+    assert df2['tarih'].isna().tolist() == expected.isna().tolist()
+    assert '%d/%m/%Y: 2' in detail
+
+
+def test_to_datetime_handles_duplicate_index_and_time_zones():
+    import warnings
+
+    df = pd.DataFrame({'tarih': ['15.01.2024', None, '2024-02-01', '16.01.2024']}, index=[0, 0, 1, 1])
+    df2, _, count = apply_format(df, 'tarih', 'to_datetime')
+    assert df2['tarih'].tolist()[2:] == [pd.Timestamp('2024-02-01'), pd.Timestamp('2024-01-16')]
+    assert df2['tarih'].isna().tolist() == [False, True, False, False]
+    assert count == 3
+
+    for values in (['2024-01-15T10:00:00+03:00', '2024-01-16T08:30:00+03:00', None],
+                   ['2024-01-15T10:00:00+03:00', '2024-01-16T10:00:00+01:00', 'yok']):
+        tz = pd.DataFrame({'t': values})
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            expected = pd.to_datetime(tz['t'], errors='coerce', dayfirst=True)
+        tz2, detail, _ = apply_format(tz, 't', 'to_datetime')
+        pd.testing.assert_series_equal(tz2['t'], expected)
+        assert 'saat dilimleri korundu' in detail
+
+
+def test_string_steps_fuse_only_pure_text_columns(monkeypatch):
+    from backend.modules import string_transform
+
+    mixed = pd.DataFrame({'c': pd.Series([' A', 1, None, 'b '], dtype=object)})
+    expected = mixed['c'].apply(lambda x: x.strip() if isinstance(x, str) else x).str.lower()
+
+    monkeypatch.setattr(string_transform, "_encode", lambda series: (_ for _ in ()).throw(AssertionError("birleşik yol")))
+    df2, results = string_transform.apply_string_steps(mixed, 'c', ['strip_whitespace', 'normalize_case'])
+    pd.testing.assert_series_equal(df2['c'], expected)
+    assert [count for _, count in results] == [2, 1]
+
+    monkeypatch.undo()
+    text = pd.DataFrame({'c': [' A', None, 'b ']})
+    df3, _ = string_transform.apply_string_steps(text, 'c', ['strip_whitespace', 'normalize_case'])
+    assert df3['c'].tolist() == ['a', None, 'b']
+
+
+def test_string_transforms_recode_category_columns():
+    df = pd.DataFrame({'c': pd.Series([' A', 'a', None, 'B '] * 3, dtype='category')})
+    df2, _, count = apply_format(df, 'c', 'strip_whitespace')
+    assert isinstance(df2['c'].dtype, pd.CategoricalDtype)
+    assert df2['c'].dropna().tolist() == ['A', 'a', 'B'] * 3
+    assert df2['c'].isna().sum() == 3
+    assert sorted(df2['c'].cat.categories) == ['A', 'B', 'a']
+    assert count == 6
+    assert df['c'].tolist()[0] == ' A'
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 from backend.modules.missing_value import analyze_missing, apply_missing
@@ -60,3 +61,131 @@ def test_mice_fills_only_missing_cells_across_distributions(target, predictor):
         original_observed,
     )
     assert "1 eksik değer" in detail
+
+
+def test_model_imputation_fills_several_columns_from_one_fit(monkeypatch):
+    import backend.modules.missing_value as missing_value
+    from backend.modules.missing_value import apply_model_imputation
+
+    rng = np.random.default_rng(3)
+    base = rng.normal(size=200)
+    df = pd.DataFrame({
+        "a": base + rng.normal(size=200) * 0.1,
+        "b": 2 * base + rng.normal(size=200) * 0.1,
+        "c": base - 1,
+        "metin": ["x"] * 200,
+    })
+    df.loc[::7, "a"] = np.nan
+    df.loc[3::11, "b"] = np.nan
+
+    fits = []
+    original = missing_value.IterativeImputer.fit_transform
+    monkeypatch.setattr(missing_value.IterativeImputer, "fit_transform", lambda self, X: fits.append(X.shape) or original(self, X))
+    cleaned, outcomes = apply_model_imputation(df, ["a", "metin", "b"], "mice")
+
+    assert fits == [(200, 3)]
+    assert [status for status, _ in outcomes] == ["ok", "error", "ok"]
+    assert "Ortak model: a, b" in outcomes[0][1]
+    assert cleaned[["a", "b"]].notna().all().all()
+    observed = df["a"].notna()
+    assert cleaned.loc[observed, "a"].equals(df.loc[observed, "a"])
+    assert df["a"].isna().sum() == 29
+
+
+def test_mice_limits_predictors_on_wide_tables_and_logs_settings(monkeypatch):
+    import backend.modules.missing_value as missing_value
+
+    monkeypatch.setattr(missing_value, "MICE_NEAREST_FEATURES", 3)
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame(rng.normal(size=(120, 8)), columns=[f"s{i}" for i in range(8)])
+    df.loc[::6, "s0"] = np.nan
+
+    seen = []
+    original = missing_value.IterativeImputer.fit_transform
+    monkeypatch.setattr(
+        missing_value.IterativeImputer, "fit_transform",
+        lambda self, X: seen.append(self.n_nearest_features) or original(self, X),
+    )
+    cleaned, detail = apply_missing(df, "s0", "mice")
+
+    assert seen == [3]
+    assert cleaned["s0"].notna().all()
+    assert "sütun başına 3/8 öznitelik" in detail
+    assert f"tol={missing_value.MICE_TOL:g}" in detail
+
+
+def test_knn_engine_matches_knn_imputer_on_complete_donors(monkeypatch):
+    from sklearn.impute import KNNImputer
+    import backend.modules.knn_imputation as knn_imputation
+
+    rng = np.random.default_rng(11)
+    X = rng.normal(size=(300, 4)) * [1.0, 50.0, 0.01, 3.0] + [0.0, 1000.0, 5.0, -2.0]
+    X[rng.random(X.shape) < 0.08] = np.nan
+    X[7] = np.nan
+
+    monkeypatch.setattr(knn_imputation, "KNN_CHUNK_ROWS", 7)
+    filled, info = knn_imputation.knn_impute(X, [0, 1, 2, 3])
+
+    means, scales = np.nanmean(X, axis=0), np.nanstd(X, axis=0)
+    Z = (X - means) / scales
+    complete = ~np.isnan(X).any(axis=1)
+    expected = KNNImputer(n_neighbors=5).fit(Z[complete]).transform(Z) * scales + means
+    expected[7] = means
+
+    assert info["mode"] == "tree" and info["patterns"] > 1
+    assert not np.isnan(filled).any()
+    np.testing.assert_allclose(filled, expected, rtol=1e-9, atol=1e-9)
+    np.testing.assert_array_equal(filled[~np.isnan(X)], X[~np.isnan(X)])
+
+    monkeypatch.setattr(knn_imputation, "KNN_APPROX_DONORS", 150)
+    approx, info = knn_imputation.knn_impute(X, [1])
+    assert info == {"mode": "approx", "donors": 150, "patterns": info["patterns"], "engine": "tree"}
+    assert not np.isnan(approx[:, 1]).any() and np.isnan(approx[:, 0]).any()
+
+
+def test_knn_engine_falls_back_to_knn_imputer_above_pattern_limit(monkeypatch):
+    import backend.modules.knn_imputation as knn_imputation
+
+    rng = np.random.default_rng(12)
+    X = rng.normal(size=(300, 5)) * [1.0, 20.0, 0.1, 3.0, 7.0]
+    X[rng.random(X.shape) < 0.1] = np.nan
+    X[9] = np.nan
+
+    monkeypatch.setattr(knn_imputation, "KNN_CHUNK_ROWS", 11)
+    trees, tree_info = knn_imputation.knn_impute(X, [0, 1, 3])
+    monkeypatch.setattr(knn_imputation, "KNN_MAX_PATTERNS", tree_info["patterns"] - 1)
+    fallback, info = knn_imputation.knn_impute(X, [0, 1, 3])
+
+    assert tree_info["engine"] == "tree" and info["engine"] == "knn_imputer"
+    np.testing.assert_allclose(fallback, trees, rtol=1e-9, atol=1e-9)
+    assert np.isnan(fallback[:, [2, 4]]).any()
+
+
+def test_mice_uses_all_predictors_by_default():
+    import backend.modules.missing_value as missing_value
+
+    rng = np.random.default_rng(6)
+    df = pd.DataFrame(rng.normal(size=(60, 20)), columns=[f"s{i}" for i in range(20)])
+    df.loc[::6, "s0"] = np.nan
+
+    _, detail = apply_missing(df, "s0", "mice")
+
+    assert missing_value.MICE_NEAREST_FEATURES == 0
+    assert "öznitelik sınırlaması kapalı (tüm 20 sayısal sütun)" in detail
+
+
+def test_mice_convergence_label_follows_tolerance_check(monkeypatch):
+    import backend.modules.missing_value as missing_value
+
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame(rng.normal(size=(120, 4)), columns=list("abcd"))
+    df.loc[::6, "a"] = np.nan
+
+    # Tek eksik sütunda ikinci tur ilkini birebir tekrarlar: son turda yakınsar
+    monkeypatch.setattr(missing_value, "MICE_MAX_ITER", 2)
+    _, detail = apply_missing(df, "a", "mice")
+    assert "2/2 tur (yakınsadı" in detail
+
+    monkeypatch.setattr(missing_value, "MICE_MAX_ITER", 1)
+    _, detail = apply_missing(df, "a", "mice")
+    assert "1/1 tur (yakınsamadı" in detail
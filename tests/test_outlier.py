@@ -33,3 +33,119 @@ def test_analyze_outliers_disjoint_index():
     assert 'yas' in result
     assert result['yas']['iqr_outlier_count'] == 1
     assert result['gelir']['iqr_outlier_count'] == 1
+
+
+def test_detector_counts_match_legacy_loop():
+    import numpy as np
+    from sklearn.ensemble import IsolationForest
+    from sklearn.neighbors import LocalOutlierFactor
+    from sklearn.cluster import DBSCAN
+    from sklearn.preprocessing import StandardScaler
+
+    rng = np.random.default_rng(3)
+    n = 600
+    df = pd.DataFrame({
+        'a': rng.normal(0, 1, n),
+        'b': np.where(rng.random(n) < 0.1, np.nan, rng.exponential(2, n)),
+        'c': rng.integers(0, 100, n).astype(float),
+    }, index=rng.permutation(n) * 3)
+    df.loc[df.index[:20], 'a'] = rng.normal(0, 15, 20)
+    df.loc[df.index[20:40], 'c'] = np.nan
+
+    # Eski uygulama: işaretlenen her indeks için skaler .loc kontrolü
+    df_numeric = df.dropna()
+    iso = IsolationForest(contamination="auto", random_state=42).fit(df_numeric)
+    iso_idx = df_numeric.index[iso.decision_function(df_numeric) < 0]
+    lof = LocalOutlierFactor(n_neighbors=5)
+    lof.fit_predict(df_numeric)
+    lof_idx = df_numeric.index[lof.negative_outlier_factor_ < -1.5]
+    labels = DBSCAN(eps=2.5, min_samples=max(3, len(df_numeric) // 100)).fit_predict(
+        StandardScaler().fit_transform(df_numeric))
+    dbscan_idx = df_numeric.index[labels == -1]
+
+    result = analyze_outliers(df)
+    for col in df.columns:
+        for key, flagged in (("iso", iso_idx), ("lof", lof_idx), ("dbscan", dbscan_idx)):
+            legacy = sum(1 for i in flagged if i in df.index and pd.notna(df.loc[i, col]))
+            assert result[col][f"{key}_outlier_count"] == legacy
+    assert result['a']["iso_outlier_count"] > 0
+
+
+def test_isolation_forest_sampling_and_batched_scoring(monkeypatch):
+    import numpy as np
+    import backend.modules.outlier_detector as outlier_detector
+
+    rng = np.random.default_rng(5)
+    df = pd.DataFrame({'a': rng.normal(0, 1, 3000), 'b': rng.normal(0, 1, 3000)})
+    df.loc[:9, 'a'] = 50
+
+    full_mask, full_info = outlier_detector.isolation_forest_outliers(df)
+    assert full_info == {"sample_size": 3000, "seed": 42}
+
+    monkeypatch.setattr(outlier_detector, "ISO_SAMPLE_ROWS", 512)
+    monkeypatch.setattr(outlier_detector, "ISO_SCORE_BATCH", 700)
+    sampled_mask, sampled_info = outlier_detector.isolation_forest_outliers(df)
+    assert sampled_info == {"sample_size": 512, "seed": 42}
+    assert len(sampled_mask) == len(df)
+    assert sampled_mask[:10].all()
+    # Aynı seed ile tekrar üretilebilir
+    again, _ = outlier_detector.isolation_forest_outliers(df)
+    assert (again == sampled_mask).all()
+
+    result = analyze_outliers(df)
+    assert result['a']["iso_sample"] == sampled_info
+
+
+def test_dbscan_noise_mask_matches_sklearn(monkeypatch):
+    import numpy as np
+    from sklearn.cluster import DBSCAN
+    import backend.modules.outlier_detector as outlier_detector
+
+    # Bellek bütçesini küçük parçalara zorla
+    monkeypatch.setattr(outlier_detector, "_dbscan_chunk_rows", lambda n_features, k: 7)
+    rng = np.random.default_rng(11)
+    for n_rows, n_features, eps, min_samples in [(300, 2, 0.3, 5), (500, 3, 0.6, 8), (200, 5, 2.5, 3), (50, 2, 0.01, 3)]:
+        data = np.vstack([
+            rng.normal(0, 1, (n_rows - 20, n_features)),
+            rng.uniform(-6, 6, (20, n_features)),
+        ])
+        expected = DBSCAN(eps=eps, min_samples=min_samples).fit_predict(data) == -1
+        got = outlier_detector.dbscan_noise_mask(data, eps, min_samples)
+        assert (got == expected).all()
+
+
+def test_contextual_outliers_sample_mode(monkeypatch):
+    import numpy as np
+    import backend.modules.outlier_detector as outlier_detector
+
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({'a': rng.normal(0, 1, 4000), 'b': rng.normal(0, 1, 4000)})
+    df.loc[:4, ['a', 'b']] = [[40, -40], [-40, 40], [35, 35], [-35, -35], [0, 45]]
+
+    exact = outlier_detector.contextual_outliers(df)
+    monkeypatch.setattr(outlier_detector, "DBSCAN_EXACT_ROWS", 1000)
+    sampled = outlier_detector.contextual_outliers(df)
+
+    assert sampled[:5].all() and exact[:5].all()
+    assert (sampled != exact).sum() <= 0.01 * len(df)
+
+
+def test_local_outlier_factor_matches_sklearn(monkeypatch):
+    import numpy as np
+    from sklearn.neighbors import LocalOutlierFactor
+    import backend.modules.outlier_detector as outlier_detector
+
+    monkeypatch.setattr(outlier_detector, "LOF_CHUNK_ROWS", 64)
+    rng = np.random.default_rng(4)
+    data = np.round(rng.normal(size=(700, 3)), 1)
+    data[:6] = data[6]  # tekrarlı satırlar
+    expected = LocalOutlierFactor(n_neighbors=5).fit(data).negative_outlier_factor_
+    got = outlier_detector.local_outlier_factor(pd.DataFrame(data), n_neighbors=5)
+    assert np.allclose(got, expected)
+
+    # Referans örneklem modu: uç noktalar yine yakalanır
+    data[-3:] = [[30, 30, 30], [-30, 0, 30], [0, -30, -30]]
+    monkeypatch.setattr(outlier_detector, "LOF_EXACT_ROWS", 300)
+    sampled = outlier_detector.local_outlier_factor(pd.DataFrame(data), n_neighbors=5)
+    assert sampled.shape == (700,)
+    assert (sampled[-3:] < outlier_detector.LOF_THRESHOLD).all()
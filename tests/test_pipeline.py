@@ -1,3 +1,4 @@
+import os
 import pandas as pd
 from backend.modules.pipeline import run_pipeline
 
@@ -26,3 +27,345 @@ def test_run_pipeline():
     assert cleaned_df['isim'].iloc[2] == 'Bilinmiyor'
     assert cleaned_df['cinsiyet'].iloc[2] == 'erkek'
     assert cleaned_df['yas'].iloc[3] < 999
+
+
+def test_consecutive_string_steps_match_step_by_step():
+    from backend.modules.format_checker import apply_format
+
+    sehir = [' Istanbul', 'istanbul', 'Istanbul', 'Istanbol', 'Ankara ', 'ankara', None, 'Ankra', 'Izmir']
+    methods = ["strip_whitespace", "normalize_case", "semantic_merge"]
+    for dtype in (object, "category"):
+        df = pd.DataFrame({'sehir': pd.Series(sehir, dtype=dtype), 'n': range(9)})
+
+        result = run_pipeline(df, [{"category": "format", "column": "sehir", "method": m} for m in methods])
+
+        expected, counts = df, []
+        for method in methods:
+            expected, _, count = apply_format(expected, 'sehir', method)
+            counts.append(count)
+        assert result['error_count'] == 0
+        assert result['format_errors'] == sum(counts)
+        assert result['cleaned_df']['sehir'].astype(object).tolist() == expected['sehir'].astype(object).tolist()
+        assert df['sehir'].tolist()[0] == ' Istanbul'
+
+
+def test_fused_string_steps_fall_back_per_step_on_error():
+    df = pd.DataFrame({'n': [1, 2, 3]})
+    result = run_pipeline(df, [
+        {"category": "format", "column": "n", "method": "strip_whitespace"},
+        {"category": "format", "column": "n", "method": "normalize_case"},
+    ])
+    assert [log['status'] for log in result['logs']] == ['ok', 'error']
+
+
+def test_string_steps_keep_step_by_step_types_after_label_encode_and_strip():
+    import numpy as np
+
+    df = pd.DataFrame({
+        'c': ['b', 'a', None, 'b'],
+        'd': pd.Series([0, 1, np.nan, 1], dtype=object),
+    })
+    result = run_pipeline(df, [
+        {"category": "feature", "column": "c", "method": "label_encode"},
+        {"category": "format", "column": "c", "method": "normalize_case"},
+        {"category": "format", "column": "d", "method": "strip_whitespace"},
+        {"category": "feature", "column": "d", "method": "one_hot_encode"},
+    ])
+    assert [log['status'] for log in result['logs']] == ['ok', 'error', 'ok', 'ok']
+    assert result['cleaned_df']['c'].tolist() == [1, 0, None, 1]
+    assert [col for col in result['cleaned_df'].columns if col.startswith('d_')] == ['d_0.0', 'd_1.0']
+
+
+def test_pipeline_copies_only_modified_columns():
+    import numpy as np
+
+    df = pd.DataFrame({
+        'a': [1.0, None, 3.0, 4.0, 100.0],
+        'b': [10.0, 11.0, 12.0, 13.0, 14.0],
+        'c': ['x', 'y', None, 'x', 'y'],
+    })
+    original = df.copy()
+
+    result = run_pipeline(df, [
+        {"category": "missing", "column": "a", "method": "mean"},
+        {"category": "outlier", "column": "a", "method": "median_replace"},
+        {"category": "missing", "column": "c", "method": "mode"},
+    ])
+
+    cleaned = result['cleaned_df']
+    pd.testing.assert_frame_equal(df, original)
+    assert cleaned['a'].notna().all() and cleaned['c'].notna().all()
+    assert np.shares_memory(cleaned['b'].to_numpy(), df['b'].to_numpy())
+    assert not np.shares_memory(cleaned['a'].to_numpy(), df['a'].to_numpy())
+    assert all('peak_memory_mb' in log for log in result['logs'])
+
+
+def test_step_memory_trace_is_skipped_for_overlapping_steps(monkeypatch):
+    from backend.modules import pipeline
+
+    monkeypatch.setattr(pipeline, "PIPELINE_TRACE_MEMORY", True)
+    resets = []
+    real_open = open
+
+    def tracking_open(path, *args, **kwargs):
+        if path == "/proc/self/clear_refs":
+            resets.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+    first = pipeline._start_step_trace()
+    second = pipeline._start_step_trace()
+    assert pipeline._finish_step_trace(second) is None
+    assert pipeline._finish_step_trace(first) is None
+    # Çakışan adım, çalışan ölçümün tepe sayacını sıfırlamaz
+    assert len(resets) <= 1
+    alone = pipeline._start_step_trace()
+    peak = pipeline._finish_step_trace(alone)
+    assert alone["baseline"] is None or peak is not None
+    assert pipeline._trace_state["running"] == 0
+
+
+def test_plan_fuses_row_filters_batches_columns_and_skips_noops():
+    from backend.modules.planner import plan_pipeline
+
+    selections = [
+        {"category": "missing", "column": "a", "method": "mean"},
+        {"category": "outlier", "column": "b", "method": "cap"},
+        {"category": "format",  "column": "a", "method": "to_numeric"},
+        {"category": "feature", "column": "b", "method": "skip"},
+        {"category": "missing", "column": "c", "method": "drop"},
+        {"category": "outlier", "column": "a", "method": "drop_outliers"},
+        {"category": "missing", "column": "a", "method": "mice"},
+        {"category": "outlier", "column": "b", "method": "median_replace"},
+    ]
+    plan = [(stage["kind"], stage["steps"]) for stage in plan_pipeline(selections)]
+    assert plan == [
+        ("column_batch", [0, 2]),
+        ("column_batch", [1]),
+        ("noop", [3]),
+        ("row_filter", [4, 5]),
+        ("single", [6]),
+        ("column_batch", [7]),
+    ]
+
+
+def test_planned_pipeline_matches_sequential_application():
+    import numpy as np
+    from backend.modules.missing_value import apply_missing
+    from backend.modules.outlier_detector import apply_outlier
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'a': rng.normal(size=200), 'b': rng.normal(size=200), 'c': rng.normal(size=200)})
+    df.loc[::9, 'c'] = np.nan
+    df.loc[[3, 50], 'a'] = [40.0, -35.0]
+    selections = [
+        {"category": "missing", "column": "c", "method": "drop"},
+        {"category": "outlier", "column": "a", "method": "drop_outliers"},
+        {"category": "outlier", "column": "b", "method": "drop_outliers"},
+        {"category": "outlier", "column": "a", "method": "keep"},
+    ]
+
+    result = run_pipeline(df, selections)
+
+    expected, _ = apply_missing(df, 'c', 'drop')
+    expected, _, dropped_a = apply_outlier(expected, 'a', 'drop_outliers')
+    expected, _, dropped_b = apply_outlier(expected, 'b', 'drop_outliers')
+    pd.testing.assert_frame_equal(result['cleaned_df'], expected)
+    assert result['outlier_count'] == dropped_a + dropped_b
+    assert [log['step'] for log in result['logs']] == [0, 1, 2, 3]
+    assert [stage['kind'] for stage in result['plan']] == ['row_filter', 'column_batch']
+
+
+def test_checkpoint_resumes_from_longest_cached_prefix(tmp_path, monkeypatch):
+    import backend.modules.pipeline as pipeline
+    from backend.modules.checkpoint_cache import PipelineCheckpoints
+
+    df = pd.DataFrame({
+        'yas':    [25, None, 30, 999, 28, 22, 27, 24],
+        'sehir':  [' Ankara', 'ankara', None, 'Izmir ', 'izmir', 'Ankara', 'IZMIR', 'Bursa'],
+        'tarih':  ['2024-01-15', '2024-02-01', None, '2024-03-10', '2024-04-11', '2024-05-12', '2024-06-13', '2024-07-14'],
+        'grup':   pd.Categorical(['a', 'b', 'a', None, 'b', 'a', 'b', 'a']),
+    })
+    head = [
+        {"category": "missing", "column": "yas",   "method": "median"},
+        {"category": "format",  "column": "sehir", "method": "strip_whitespace"},
+        {"category": "format",  "column": "tarih", "method": "to_datetime"},
+        {"category": "missing", "column": "sehir", "method": "drop"},
+    ]
+    store = PipelineCheckpoints(str(tmp_path), "kaynak", min_seconds=0)
+    first = run_pipeline(df, head + [{"category": "outlier", "column": "yas", "method": "cap"}], checkpoints=store)
+
+    executed = []
+    original = pipeline._run_step
+    monkeypatch.setattr(pipeline, "_run_step", lambda current_df, index, *args: executed.append(index) or original(current_df, index, *args))
+    tail = [{"category": "format", "column": "sehir", "method": "normalize_case"}]
+    resumed = run_pipeline(df, head + tail, checkpoints=store)
+    monkeypatch.undo()
+    expected = run_pipeline(df, head + tail)
+
+    assert executed == [4]
+    assert resumed["plan"][0] == {"stage": 0, "kind": "checkpoint", "column": None, "steps": [0, 1, 2, 3]}
+    assert [l["step"] for l in resumed["logs"]] == [0, 1, 2, 3, 4]
+    assert [l["detail"] for l in resumed["logs"][:4]] == [l["detail"] for l in first["logs"][:4]]
+    assert resumed["applied_count"] == expected["applied_count"]
+    pd.testing.assert_frame_equal(resumed["cleaned_df"], expected["cleaned_df"])
+
+
+def test_checkpoint_eviction_keeps_directory_under_budget(tmp_path):
+    from backend.modules.checkpoint_cache import PipelineCheckpoints
+
+    df = pd.DataFrame({'a': range(5000), 'b': [f"deger_{i}" for i in range(5000)]})
+    store = PipelineCheckpoints(str(tmp_path), "kaynak", max_bytes=1, min_seconds=0)
+    selections = [{"category": "feature", "column": "a", "method": "minmax_scale"}]
+    assert store.save(selections, 1, df, [], {"outlier": 0, "format": 0})
+    assert list(tmp_path.iterdir()) == []
+    assert store.load_latest(selections) is None
+
+    mixed = pd.DataFrame({'a': [1, 'x', 2.5]})
+    assert not PipelineCheckpoints(str(tmp_path), "kaynak").save(selections, 1, mixed, [], {})
+
+
+def test_independent_column_batches_run_concurrently_with_ordered_logs(monkeypatch):
+    import threading
+    import backend.modules.pipeline as pipeline
+
+    df = pd.DataFrame({
+        'a': [1.0, None, 3.0, 4.0, 100.0],
+        'b': [5.0, 6.0, 7.0, 800.0, 9.0],
+        'c': ['1', '2', 'x', '4', '5'],
+        'd': [0.5, 1.5, 2.5, 3.5, 4.5],
+    })
+    selections = [
+        {"category": "missing", "column": "a", "method": "median"},
+        {"category": "outlier", "column": "b", "method": "cap"},
+        {"category": "format",  "column": "c", "method": "to_numeric"},
+        {"category": "feature", "column": "d", "method": "minmax_scale"},
+        {"category": "outlier", "column": "a", "method": "cap"},
+        {"category": "missing", "column": "a", "method": "drop"},
+        {"category": "feature", "column": "d", "method": "skip"},
+        {"category": "feature", "column": "b", "method": "standard_scale"},
+    ]
+    monkeypatch.setattr(pipeline, "PIPELINE_WORKERS", 1)
+    expected = run_pipeline(df, selections)
+
+    threads = set()
+    original = pipeline._run_column_batch
+    monkeypatch.setattr(pipeline, "_run_column_batch", lambda *args: threads.add(threading.current_thread().name) or original(*args))
+    monkeypatch.setattr(pipeline, "PIPELINE_WORKERS", 4)
+    monkeypatch.setattr(pipeline, "PIPELINE_PARALLEL_MIN_ROWS", 0)
+    result = run_pipeline(df, selections)
+
+    assert any(name.startswith("pipeline") for name in threads)
+    assert [l["step"] for l in result["logs"]] == list(range(len(selections)))
+    assert [l["detail"] for l in result["logs"]] == [l["detail"] for l in expected["logs"]]
+    assert result["format_errors"] == expected["format_errors"]
+    assert result["outlier_count"] == expected["outlier_count"]
+    pd.testing.assert_frame_equal(result["cleaned_df"], expected["cleaned_df"])
+
+
+def test_streaming_pipeline_matches_in_memory_run(tmp_path):
+    import numpy as np
+    import pytest
+    from backend.modules.file_reader import read_file
+    from backend.modules.streaming import run_pipeline_streaming
+
+    rng = np.random.default_rng(0)
+    source = pd.DataFrame({
+        'yas':   rng.integers(18, 70, 300).astype(float),
+        'gelir': np.round(rng.lognormal(8, 1, 300), 2),
+        'sehir': rng.choice([' Ankara', 'izmir ', 'Bursa', None], 300),
+        'kod':   rng.choice(['1', '2.5', 'x', None], 300),
+    })
+    source.loc[rng.random(300) < 0.2, 'yas'] = np.nan
+    source.loc[:2, 'gelir'] = 1e7
+    path = os.path.join(tmp_path, "veri.csv")
+    source.to_csv(path, index=False)
+
+    selections = [
+        {"category": "missing", "column": "yas",   "method": "median"},
+        {"category": "outlier", "column": "yas",   "method": "cap"},
+        {"category": "outlier", "column": "gelir", "method": "drop_outliers"},
+        {"category": "format",  "column": "sehir", "method": "strip_whitespace"},
+        {"category": "format",  "column": "kod",   "method": "to_numeric"},
+        {"category": "feature", "column": "gelir", "method": "minmax_scale"},
+        {"category": "missing", "column": "sehir", "method": "constant"},
+    ]
+    df, _ = read_file(path, use_cache=False)
+    expected = run_pipeline(df, selections)
+    result = run_pipeline_streaming(path, selections, os.path.join(tmp_path, "temiz.csv"), chunksize=37)
+
+    assert result["passes"] == 4
+    assert [l["detail"] for l in result["logs"]] == [l["detail"] for l in expected["logs"]]
+    for key in ("outlier_count", "format_errors", "applied_count", "error_count", "before_missing_pct", "after_missing_pct"):
+        assert result[key] == expected[key]
+    cleaned = pd.read_csv(result["output_path"])
+    assert result["row_count"] == len(expected["cleaned_df"])
+    pd.testing.assert_frame_equal(cleaned, expected["cleaned_df"].reset_index(drop=True))
+
+    with pytest.raises(ValueError, match="mice"):
+        run_pipeline_streaming(path, [{"category": "missing", "column": "yas", "method": "mice"}], os.path.join(tmp_path, "x.csv"))
+
+
+def test_streaming_order_statistics_are_exact(tmp_path):
+    import numpy as np
+    from backend.modules.streaming import _ColumnAccumulator
+
+    values = np.concatenate([np.random.default_rng(1).normal(size=5001) * 1e3, [0.0, -0.0, 7.5, 7.5, -1e30]])
+    acc = _ColumnAccumulator(str(tmp_path), (0.25, 0.75))
+    for part in np.array_split(values, 7):
+        acc.add(np.append(part, np.nan))
+    assert acc.quantiles((0.05, 0.25, 0.75, 0.95)) == list(pd.Series(values).quantile([0.05, 0.25, 0.75, 0.95]))
+    assert acc.median() == np.median(values)
+
+
+def test_adjacent_model_imputations_share_one_stage():
+    import numpy as np
+    from backend.modules.planner import plan_pipeline
+
+    selections = [
+        {"category": "missing", "column": "a", "method": "knn"},
+        {"category": "missing", "column": "b", "method": "knn"},
+        {"category": "missing", "column": "b", "method": "knn"},
+        {"category": "missing", "column": "c", "method": "mice"},
+        {"category": "outlier", "column": "a", "method": "cap"},
+        {"category": "missing", "column": "zz", "method": "mice"},
+        {"category": "missing", "column": "d", "method": "mice"},
+    ]
+    plan = [(stage["kind"], stage["steps"]) for stage in plan_pipeline(selections)]
+    assert plan == [
+        ("imputation_batch", [0, 1]),
+        ("single", [2]),
+        ("single", [3]),
+        ("column_batch", [4]),
+        ("imputation_batch", [5, 6]),
+    ]
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(60, 4)), columns=list("abcd"))
+    df.loc[::5, ["a", "b", "c", "d"]] = np.nan
+    result = run_pipeline(df, selections)
+    assert [l["status"] for l in result["logs"]] == ["ok", "ok", "ok", "ok", "ok", "error", "ok"]
+    assert result["logs"][5]["detail"] == "'zz' sütunu bulunamadı."
+    assert result["cleaned_df"].notna().all().all()
+
+
+def test_checkpoint_resume_does_not_split_shared_model_imputation(tmp_path):
+    import numpy as np
+    from backend.modules.checkpoint_cache import PipelineCheckpoints
+
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame(rng.normal(size=(80, 3)), columns=["a", "b", "c"])
+    df.loc[::4, "a"] = np.nan
+    df.loc[1::5, "b"] = np.nan
+    head = [{"category": "missing", "column": "a", "method": "knn"}]
+    selections = head + [{"category": "missing", "column": "b", "method": "knn"}]
+
+    store = PipelineCheckpoints(str(tmp_path), "kaynak", min_seconds=0)
+    run_pipeline(df, head, checkpoints=store)
+    assert store.load_latest(selections) is not None
+
+    resumed = run_pipeline(df, selections, checkpoints=store)
+    fresh = run_pipeline(df, selections)
+    assert [stage["kind"] for stage in resumed["plan"]] == ["imputation_batch"]
+    pd.testing.assert_frame_equal(resumed["cleaned_df"], fresh["cleaned_df"])
+    assert [log["detail"] for log in resumed["logs"]] == [log["detail"] for log in fresh["logs"]]
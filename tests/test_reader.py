@@ -30,3 +30,218 @@ def test_bad_csv_lines(tmp_path):
     import pytest
     with pytest.raises(ValueError, match="geçersiz/bozuk satır"):
         read_file(bad_csv_path)
+
+
+def test_columnar_cache_reused_and_invalidated(tmp_path):
+    from backend.modules.file_reader import columnar_cache_path
+
+    test_path = os.path.join(tmp_path, "cached.csv")
+    pd.DataFrame({
+        'isim': ['Ali', None, 'Mehmet'],
+        'yas': [25, 30, None],
+    }).to_csv(test_path, index=False)
+
+    df_raw, meta_raw = read_file(test_path)
+    assert meta_raw["from_cache"] is False
+    assert os.path.exists(columnar_cache_path(test_path))
+
+    df_cached, meta_cached = read_file(test_path)
+    assert meta_cached["from_cache"] is True
+    assert meta_cached["dtypes"] == meta_raw["dtypes"]
+    pd.testing.assert_frame_equal(df_cached, df_raw)
+
+    # Ham dosya değişince önbellek eskimiş sayılmalı
+    with open(test_path, "a", encoding="utf-8") as f:
+        f.write("Can,40\n")
+    df_new, meta_new = read_file(test_path)
+    assert meta_new["from_cache"] is False
+    assert meta_new["row_count"] == 4
+
+
+def test_bad_csv_lines_report_line_numbers(tmp_path):
+    import pytest
+
+    bad_csv_path = os.path.join(tmp_path, "bad_lines.csv")
+    with open(bad_csv_path, "w", encoding="utf-8") as f:
+        f.write("col1,col2\nval1,val2\nval3,val4,val5\na,b\nc,d,e,f\n")
+
+    with pytest.raises(ValueError, match=r"2 adet geçersiz/bozuk satır.*Hatalı satırlar: 3, 5"):
+        read_file(bad_csv_path, use_cache=False)
+
+
+def test_cp1254_csv_detected_from_sample(tmp_path):
+    from backend.modules.file_reader import sniff_encoding
+
+    path = os.path.join(tmp_path, "tr.csv")
+    with open(path, "wb") as f:
+        f.write("şehir,nüfus\nİstanbul,15\nIğdır,2\n".encode("cp1254"))
+
+    assert sniff_encoding(path) == "cp1254"
+    df, _ = read_file(path, use_cache=False)
+    assert list(df.columns) == ["şehir", "nüfus"]
+    assert df["şehir"].tolist() == ["İstanbul", "Iğdır"]
+
+
+def test_txt_dialect_sniffed_and_reused(tmp_path):
+    from backend.modules.file_reader import sniff_dialect
+
+    path = os.path.join(tmp_path, "erp.txt")
+    with open(path, "w", encoding="cp1254") as f:
+        f.write('kod;ürün;fiyat\n1;Çay;1.234,50\n2;Şeker;12,75\n3;"Un; tam";7,00\n')
+
+    dialect = sniff_dialect(path)
+    assert dialect["sep"] == ";"
+    assert dialect["decimal"] == ","
+    assert dialect["thousands"] == "."
+    assert dialect["encoding"] == "cp1254"
+
+    df, meta = read_file(path, use_cache=False)
+    assert meta["dialect"] == dialect
+    assert df["fiyat"].tolist() == [1234.5, 12.75, 7.0]
+    assert df["ürün"].iloc[2] == "Un; tam"
+
+    df_again, _ = read_file(path, use_cache=False, dialect=meta["dialect"])
+    pd.testing.assert_frame_equal(df_again, df)
+
+
+def test_xlsx_sheets_listed_and_loaded_lazily(tmp_path):
+    from backend.modules.file_reader import list_sheets
+
+    path = os.path.join(tmp_path, "book.xlsx")
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}).to_excel(writer, sheet_name="Veri", index=False)
+        pd.DataFrame({"c": [3.5]}).to_excel(writer, sheet_name="Özet", index=False)
+
+    assert list_sheets(path) == ["Veri", "Özet"]
+
+    df, meta = read_file(path)
+    assert meta["sheet_name"] == "Veri"
+    assert list(df.columns) == ["a", "b"]
+
+    df2, meta2 = read_file(path, sheet_name="Özet")
+    assert meta2["sheet_name"] == "Özet"
+    assert df2["c"].tolist() == [3.5]
+
+    _, meta3 = read_file(path, sheet_name="Özet")
+    assert meta3["from_cache"] is True
+
+
+def test_xlsx_read_timeout_guard(tmp_path, monkeypatch):
+    import pytest
+    from backend.modules import file_reader
+
+    path = os.path.join(tmp_path, "slow.xlsx")
+    pd.DataFrame({"a": range(10)}).to_excel(path, index=False)
+
+    monkeypatch.setattr(file_reader, "XLSX_READ_TIMEOUT", 0.001)
+    with pytest.raises(ValueError, match="saniye içinde okunamadı"):
+        read_file(path, use_cache=False)
+
+
+def test_read_file_chunks_and_incremental_scan(tmp_path):
+    from backend.modules.file_reader import read_file_chunks, scan_file
+
+    path = os.path.join(tmp_path, "big.csv")
+    pd.DataFrame({
+        'a': [1, 2, None, 4, 5],
+        'b': ['x', 'y', 'z', 'w', 'v'],
+        'c': [1, 2, 3, 4, 5],
+    }).to_csv(path, index=False)
+
+    chunks = list(read_file_chunks(path, chunksize=2))
+    assert [len(c) for c in chunks] == [2, 2, 1]
+
+    meta = scan_file(path, chunksize=2)
+    _, full_meta = read_file(path, use_cache=False)
+    assert meta["row_count"] == 5
+    assert meta["columns"] == full_meta["columns"]
+    assert meta["dtypes"] == full_meta["dtypes"]
+
+
+def test_xlsx_scan_names_repeated_and_empty_headers_like_read_file(tmp_path):
+    from openpyxl import Workbook
+    from backend.modules.file_reader import read_file_chunks, scan_file
+
+    path = os.path.join(tmp_path, "headers.xlsx")
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["id", "id", None, "id.1", "ad", "id"])
+    for i in range(5):
+        ws.append([i, i * 2, f"n{i}", i, None if i % 2 else "x", 1.5])
+    wb.save(path)
+
+    df, full_meta = read_file(path, use_cache=False)
+    meta = scan_file(path, chunksize=2)
+    assert meta["columns"] == full_meta["columns"] == ["id", "id.2", "Unnamed: 2", "id.1", "ad", "id.3"]
+    assert meta["dtypes"] == full_meta["dtypes"]
+    pd.testing.assert_frame_equal(pd.concat(read_file_chunks(path, chunksize=2), ignore_index=True), df)
+    # Tarama sayfayı korumalı okuyucuyla bir kez ayrıştırıp sütunlu önbelleğe yazar
+    assert read_file(path)[1]["from_cache"] is True
+
+
+def test_xlsx_chunks_use_read_timeout_guard(tmp_path, monkeypatch):
+    import pytest
+    from backend.modules import file_reader
+
+    path = os.path.join(tmp_path, "slow.xlsx")
+    pd.DataFrame({"a": range(10)}).to_excel(path, index=False)
+
+    monkeypatch.setattr(file_reader, "XLSX_READ_TIMEOUT", 0.001)
+    with pytest.raises(ValueError, match="saniye içinde okunamadı"):
+        file_reader.scan_file(path)
+
+
+def test_optimize_dtypes_is_lossless_and_reports_savings(tmp_path):
+    from backend.modules.file_reader import optimize_dtypes
+
+    df = pd.DataFrame({
+        'sehir': ['Ankara', 'İzmir', 'Ankara', None] * 50,
+        'adet': list(range(200)),
+        'oran': [0.5, 0.25, None, 1.0] * 50,
+        'tutar': [0.1, 0.2, 0.3, 0.4] * 50,
+    })
+    optimized, report = optimize_dtypes(df)
+
+    assert str(optimized['sehir'].dtype) == 'category'
+    assert str(optimized['adet'].dtype) == 'int16'
+    assert str(optimized['oran'].dtype) == 'float32'
+    # 0.1 float32'de birebir temsil edilemez, dokunulmamalı
+    assert str(optimized['tutar'].dtype) == 'float64'
+    assert report['saved_bytes'] > 0
+    pd.testing.assert_frame_equal(optimized.astype(df.dtypes.to_dict()), df)
+
+    path = os.path.join(tmp_path, "opt.csv")
+    df.to_csv(path, index=False)
+    _, meta = read_file(path, optimize=True)
+    assert meta["memory"]["after_bytes"] < meta["memory"]["before_bytes"]
+
+
+def test_column_stats_matches_pandas():
+    import numpy as np
+    from backend.modules.profiler import column_stats
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'a': rng.normal(50, 10, 300),
+        'b': np.where(rng.random(300) < 0.2, np.nan, rng.integers(0, 9, 300)),
+        'c': rng.choice(['x', 'y', None], 300),
+        'd': [True, False, True] * 100,
+        'e': [np.nan] * 300,
+    })
+    stats = column_stats(df)
+
+    for col in ['a', 'b']:
+        s = df[col]
+        assert stats[col]["missing_count"] == int(s.isna().sum())
+        assert stats[col]["unique_count"] == int(s.nunique())
+        assert np.isclose(stats[col]["mean"], s.mean())
+        assert np.isclose(stats[col]["median"], s.median())
+        assert np.isclose(stats[col]["std"], s.std())
+        assert np.isclose(stats[col]["q1"], s.quantile(0.25))
+        assert np.isclose(stats[col]["q3"], s.quantile(0.75))
+        assert stats[col]["min"] == s.min() and stats[col]["max"] == s.max()
+
+    assert stats['c']["is_numeric"] is False
+    assert stats['c']["missing_count"] == int(df['c'].isna().sum())
+    assert np.isclose(stats['d']["mean"], 2 / 3)
+    assert stats['e']["count"] == 0 and stats['e']["mean"] is None
@@ -20,3 +20,51 @@ def test_generate_recommendations():
     assert 'missing' in categories
     assert 'outlier' in categories
     assert 'format' in categories
+
+
+def test_parallel_and_sequential_analysis_match(monkeypatch):
+    import backend.modules.recommendation as recommendation
+
+    df = pd.DataFrame({
+        'isim':  ['Ali', 'Ayse', None, 'Mehmet', '  Fatma', 'Ali'],
+        'yas':   [25, None, 30, 999, 27, 25],
+        'gelir': ['5000', '8000', None, '4500', '7000', '5000'],
+    })
+    df = pd.concat([df, df.iloc[[0]]], ignore_index=True)
+
+    monkeypatch.setattr(recommendation, "ANALYSIS_WORKERS", 1)
+    sequential = recommendation.generate_recommendations(df)
+    monkeypatch.setattr(recommendation, "ANALYSIS_WORKERS", 4)
+    parallel = recommendation.generate_recommendations(df)
+
+    assert parallel == sequential
+    assert parallel["duplicate_count"] == 2
+
+
+def test_shared_column_stats_computed_once(monkeypatch):
+    from backend.modules import column_stats as column_stats_module
+    from backend.modules.column_stats import ColumnStats
+    from backend.core.helpers import calculate_dataframe_health
+
+    df = pd.DataFrame({
+        'sehir': ['Istanbul', 'istanbul', 'Ankara', 'Ankra', ' Izmir', None],
+        'tutar': ['10', '20', '30', 'x', '50', '60'],
+        'yas':   [25, None, 30, 999, 27, 31],
+    })
+    calls = []
+    real_to_numeric = column_stats_module.pd.to_numeric
+    def counting_to_numeric(values, *args, **kwargs):
+        calls.append(len(values))
+        return real_to_numeric(values, *args, **kwargs)
+
+    stats = ColumnStats(df)
+    baseline = (generate_recommendations(df), calculate_dataframe_health(df))
+    monkeypatch.setattr(column_stats_module.pd, "to_numeric", counting_to_numeric)
+    shared = (generate_recommendations(df, stats), calculate_dataframe_health(df, stats=stats))
+    first_run_calls = len(calls)
+    calculate_dataframe_health(df, stats=stats)
+
+    assert shared == baseline
+    assert first_run_calls > 0
+    assert len(calls) == first_run_calls
+    assert stats.coerced_numeric('tutar') is stats.coerced_numeric('tutar')